@@ -0,0 +1,32 @@
+"""
+Benchmarks for DataTablesServer against a real SQLite database.
+
+Run every benchmark with ``python -m benchmarks``, some of them with for example
+``python -m benchmarks requests pagination`` or a single module with
+``python -m benchmarks.bench_pagination``. The database is created in
+benchmarks/.data and seeded with BENCHMARK_ROWS rows (default 100000) the first
+time it is needed. bench_requests compares its results with a baseline saved
+with BENCHMARK_SAVE=1.
+"""
+
+import os
+
+import django
+from django.conf import settings
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), ".data")
+
+if not settings.configured:
+    os.makedirs(DATA_DIR, exist_ok=True)
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": os.path.join(DATA_DIR, "benchmark.sqlite3"),
+            }
+        },
+        INSTALLED_APPS=["tests.testapp"],
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        USE_TZ=True,
+    )
+    django.setup()
@@ -0,0 +1,33 @@
+"""
+Runs every benchmark module, or those named on the command line, e.g.
+``python -m benchmarks requests pagination`` for bench_requests and
+bench_pagination. Set BENCHMARK_ROWS=1000000 for the 1M row fixture.
+"""
+
+import importlib
+import pkgutil
+import sys
+
+import benchmarks
+
+
+def get_benchmark_names() -> list[str]:
+    return sorted(
+        module.name[len("bench_") :]
+        for module in pkgutil.iter_modules(benchmarks.__path__)
+        if module.name.startswith("bench_")
+    )
+
+
+def main(names: list[str]) -> None:
+    available = get_benchmark_names()
+    for name in names:
+        if name not in available:
+            sys.exit(f"Unknown benchmark {name}. Choose from {', '.join(available)}.")
+    for name in names or available:
+        importlib.import_module(f"benchmarks.bench_{name}").main()
+        print()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,51 @@
+"""Compares the size and latency of dict rows with array rows."""
+
+from . import fixtures, utils
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+from tests.testapp.models import Person
+
+COLUMNS = [
+    "id",
+    "first_name",
+    "last_name",
+    "internal_id",
+    "uuid",
+    "active",
+    "salary",
+    "created",
+    "building__name",
+    "building__floor_count",
+]
+
+
+class PersonView(ServerSideDataTablesMixin):
+    model = Person
+    columns = COLUMNS
+
+
+def get_content(length: int, array_rows: bool) -> bytes:
+    data = [str(i) for i in range(len(COLUMNS))] if array_rows else COLUMNS
+    request = utils.get_request(data, {"length": str(length)})
+    view = PersonView(array_rows=array_rows)
+    view.setup(request)
+    return view.get(request).content
+
+
+def main():
+    fixtures.seed()
+    results = []
+    for length in (100, 500):
+        for array_rows in (False, True):
+            name = f"{'array' if array_rows else 'dict'} rows length={length}"
+            size = len(get_content(length, array_rows))
+            results.append(
+                (
+                    f"{name} {size / 1024:.1f} KiB",
+                    *utils.measure(lambda: get_content(length, array_rows)),
+                )
+            )
+    utils.report(f"Row format ({fixtures.ROWS} rows)", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares the single page query with the deferred join (ids first, rows second)
+on wide, joined rows. Run with BENCHMARK_ROWS=1000000 for the 1M row fixture.
+"""
+
+from . import fixtures, utils
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+from tests.testapp.models import Person
+
+COLUMNS = [
+    "id",
+    "first_name",
+    "last_name",
+    "internal_id",
+    "uuid",
+    "active",
+    "salary",
+    "created",
+    "building__name",
+    "building__floor_count",
+]
+
+
+def get_page(start: int, deferred_join: bool) -> list:
+    request = utils.get_request(
+        COLUMNS,
+        {"start": str(start), "order[0][column]": "2", "order[1][column]": "1"},
+    )
+    return DataTablesServer(
+        request, COLUMNS, Person.objects.all(), deferred_join=deferred_join
+    ).get_db_data()
+
+
+def main():
+    fixtures.seed()
+    results = []
+    for start in (0, fixtures.ROWS // 2):
+        results.append(
+            (
+                f"single query start={start}",
+                *utils.measure(lambda: get_page(start, False)),
+            )
+        )
+        results.append(
+            (
+                f"deferred join start={start}",
+                *utils.measure(lambda: get_page(start, True)),
+            )
+        )
+    utils.report(f"Deferred join ({fixtures.ROWS} rows)", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compares the JSON encoders on pages of representative rows."""
+
+import datetime
+import timeit
+import uuid
+from decimal import Decimal
+
+from . import utils
+from django_datatable_serverside_mixin.encoders import ENCODERS, orjson
+
+NUMBER = 200
+
+
+def get_rows(count: int) -> list[dict]:
+    created = datetime.datetime(2022, 9, 1, 12, 30, 15, 123456, datetime.timezone.utc)
+    return [
+        {
+            "id": i,
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "internal_id": i * 7,
+            "uuid": uuid.uuid4(),
+            "active": bool(i % 2),
+            "salary": Decimal(f"{i}.25"),
+            "created": created + datetime.timedelta(minutes=i),
+            "building__name": f"Building {i % 10}",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    results = []
+    for count in (100, 500):
+        data = {"draw": "1", "recordsTotal": count, "data": get_rows(count)}
+        for name, encoder_class in ENCODERS.items():
+            if name == "orjson" and orjson is None:
+                continue
+            encoder = encoder_class()
+            duration = timeit.timeit(lambda: encoder.encode(data), number=NUMBER)
+            results.append((f"{name} {count} rows", duration / NUMBER * 1000, 0))
+    utils.report("JSON encoding", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compares OFFSET and keyset pagination latency on the first and a deep page."""
+
+from . import fixtures, utils
+from django.core.cache import cache
+from django_datatable_serverside_mixin.cache import CursorCache
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+from tests.testapp.models import Person
+
+COLUMNS = ["id", "first_name", "last_name", "building__name"]
+LENGTH = 10
+
+
+def get_page(page: int, keyset: bool) -> list:
+    # Order by last_name, which has many duplicates, the pk is the tiebreaker
+    request = utils.get_request(
+        COLUMNS,
+        {
+            "start": str((page - 1) * LENGTH),
+            "length": str(LENGTH),
+            "order[0][column]": "2",
+        },
+    )
+    return DataTablesServer(
+        request,
+        COLUMNS,
+        Person.objects.all(),
+        cursor_cache=CursorCache() if keyset else None,
+    ).get_db_data()
+
+
+def main():
+    fixtures.seed()
+    cache.clear()
+    pages = [1, 1000, fixtures.ROWS // LENGTH]
+    results = []
+    for page in pages:
+        results.append(
+            (f"offset page {page}", *utils.measure(lambda: get_page(page, False)))
+        )
+        # Serve the previous page once so the cursor for this page is known
+        if page > 1:
+            get_page(page - 1, True)
+        results.append(
+            (f"keyset page {page}", *utils.measure(lambda: get_page(page, True)))
+        )
+    utils.report(f"Pagination ({fixtures.ROWS} rows)", results)
+
+
+if __name__ == "__main__":
+    main()
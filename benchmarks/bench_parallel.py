@@ -0,0 +1,96 @@
+"""
+Compares running the counts and the page query one after another with running
+them in parallel on separate connections. SQLite runs in process, so a network
+round trip to a database server is simulated by sleeping LATENCY_MS
+milliseconds before every query. Queries are counted with a Profile, which
+also counts those sent by the worker threads.
+"""
+
+import time
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from . import fixtures, utils
+from django_datatable_serverside_mixin.datatable import (
+    DataTablesServer,
+    ParallelDataTablesServer,
+)
+from django_datatable_serverside_mixin.profiling import Profile
+from tests.testapp.models import Person
+
+COLUMNS = ["id", "first_name", "last_name", "internal_id", "building__name"]
+
+REQUESTS = {
+    "first page": {},
+    "global search": {"search[value]": "Smith"},
+    # The filtered count and the sorted page both scan the table
+    "search ordered by name": {
+        "search[value]": "First1",
+        "order[0][column]": "2",
+        "order[1][column]": "1",
+    },
+}
+
+
+LATENCY_MS = (0, 5)
+
+
+def add_latency(latency_ms: int):
+    def simulate_round_trip(execute, sql, params, many, context):
+        time.sleep(latency_ms / 1000)
+        return execute(sql, params, many, context)
+
+    def on_connection_created(sender, connection, **kwargs):
+        # Fired again whenever a thread reconnects, possibly within an
+        # execute_wrapper block which removes the last wrapper on exit
+        if simulate_round_trip not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, simulate_round_trip)
+
+    # Worker threads open their own connections
+    connection_created.connect(on_connection_created, weak=False)
+    connection.ensure_connection()
+    connection.execute_wrappers.append(simulate_round_trip)
+    return on_connection_created, simulate_round_trip
+
+
+def remove_latency(on_connection_created, simulate_round_trip):
+    connection_created.disconnect(on_connection_created)
+    connection.execute_wrappers.remove(simulate_round_trip)
+
+
+def get_query_count(server_class, options: dict) -> int:
+    """Serves a request and returns the number of queries on every thread."""
+    request = utils.get_request(COLUMNS, options)
+    profile = Profile()
+    with profile.count_queries():
+        server_class(
+            request, COLUMNS, Person.objects.all(), profile=profile
+        ).get_output_result()
+    return profile.query_count
+
+
+def main():
+    fixtures.seed()
+    for latency_ms in LATENCY_MS:
+        handlers = add_latency(latency_ms)
+        results = []
+        for name, options in REQUESTS.items():
+            for server_class in (DataTablesServer, ParallelDataTablesServer):
+                # utils.measure only captures the calling thread's queries
+                query_counts = []
+                duration, _ = utils.measure(
+                    lambda: query_counts.append(get_query_count(server_class, options))
+                )
+                results.append(
+                    (f"{server_class.__name__} {name}", duration, query_counts[-1])
+                )
+        remove_latency(*handlers)
+        utils.report(
+            f"Parallel queries ({fixtures.ROWS} rows, {latency_ms} ms latency)",
+            results,
+        )
+
+
+if __name__ == "__main__":
+    main()
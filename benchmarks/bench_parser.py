@@ -0,0 +1,42 @@
+"""Compares querystring_parser with the native DataTablesRequest parser."""
+
+import timeit
+
+from . import utils
+from django_datatable_serverside_mixin.request import DataTablesRequest
+
+try:
+    from querystring_parser import parser
+except ImportError:
+    parser = None
+
+NUMBER = 2000
+
+
+def main():
+    results = []
+    for column_count in (5, 20):
+        columns = [f"column_{i}" for i in range(column_count)]
+        query = utils.get_request(columns, {"search[value]": "smith"}).GET
+        if parser is not None:
+            duration = timeit.timeit(
+                lambda: parser.parse(query.urlencode()), number=NUMBER
+            )
+            results.append(
+                (
+                    f"querystring_parser {column_count} columns",
+                    duration / NUMBER * 1000,
+                    0,
+                )
+            )
+        duration = timeit.timeit(
+            lambda: DataTablesRequest.from_query(query), number=NUMBER
+        )
+        results.append(
+            (f"DataTablesRequest {column_count} columns", duration / NUMBER * 1000, 0)
+        )
+    utils.report("Request parsing", results)
+
+
+if __name__ == "__main__":
+    main()
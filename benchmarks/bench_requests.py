@@ -0,0 +1,81 @@
+"""
+Measures the latency and the number of queries of typical DataTables requests
+served by ServerSideDataTablesMixin: the first page, a deep page, global,
+column and regex searches, multi-column ordering and every row (length=-1).
+
+Set BENCHMARK_SAVE=1 to store the results as the baseline for the fixture
+size. Later runs print the change from the baseline and flag requests whose
+number of queries differs.
+"""
+
+from . import fixtures, utils
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+from tests.testapp.models import Person
+
+COLUMNS = [
+    "id",
+    "first_name",
+    "last_name",
+    "internal_id",
+    "active",
+    "salary",
+    "building__name",
+]
+
+
+class PersonView(ServerSideDataTablesMixin):
+    model = Person
+    columns = COLUMNS
+
+
+def get_scenarios() -> list[tuple[str, dict, int]]:
+    """Returns (name, request parameters, repeat) for every measured request."""
+    return [
+        ("first page", {}, 5),
+        ("deep page", {"start": str(fixtures.ROWS - 10)}, 5),
+        ("global search", {"search[value]": "Smith"}, 5),
+        ("global search, no match", {"search[value]": "Nobody"}, 5),
+        ("column search", {"columns[6][search][value]": "Building 4"}, 5),
+        (
+            "regex search",
+            {"search[value]": "^First1[0-9]{3}$", "search[regex]": "true"},
+            3,
+        ),
+        (
+            "multi-column ordering",
+            {
+                "order[0][column]": "2",
+                "order[0][dir]": "desc",
+                "order[1][column]": "5",
+                "order[1][dir]": "asc",
+            },
+            5,
+        ),
+        ("every row (length=-1)", {"length": "-1"}, 1),
+    ]
+
+
+def get_response(options: dict):
+    request = utils.get_request(COLUMNS, options)
+    view = PersonView()
+    view.setup(request)
+    return view.get(request)
+
+
+def main():
+    fixtures.seed()
+    results = [
+        (name, *utils.measure(lambda: get_response(options), repeat))
+        for name, options, repeat in get_scenarios()
+    ]
+    utils.report(
+        f"Requests ({fixtures.ROWS} rows)",
+        results,
+        baseline=utils.load_baseline(f"requests-{fixtures.ROWS}"),
+    )
+    if utils.SAVE:
+        utils.save_baseline(f"requests-{fixtures.ROWS}", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import random
+
+from django.db import DatabaseError, connection, transaction
+from tests.testapp.models import Building, Person
+
+ROWS = int(os.environ.get("BENCHMARK_ROWS", "100000"))
+BATCH_SIZE = 10000
+LAST_NAMES = ["Smith", "Jones", "Brown", "Taylor", "Wilson", "Davies", "Evans"]
+MODELS = [Building, Person]
+
+
+def is_seeded(rows: int) -> bool:
+    try:
+        # Also fails when the models changed since the database was seeded
+        Person.objects.select_related("building").first()
+        return Person.objects.count() == rows
+    except DatabaseError:
+        return False
+
+
+def seed(rows: int = ROWS) -> None:
+    """(Re)creates the tables and seeds rows people across 100 buildings."""
+    if is_seeded(rows):
+        return
+
+    with connection.cursor() as cursor:
+        existing_tables = connection.introspection.table_names(cursor)
+    with connection.schema_editor() as editor:
+        for model in reversed(MODELS):
+            if model._meta.db_table in existing_tables:
+                editor.delete_model(model)
+        for model in MODELS:
+            editor.create_model(model)
+
+    randomizer = random.Random(0)
+    with transaction.atomic():
+        buildings = Building.objects.bulk_create(
+            [
+                Building(name=f"Building {i}", floor_count=randomizer.randint(1, 40))
+                for i in range(100)
+            ]
+        )
+        for offset in range(0, rows, BATCH_SIZE):
+            Person.objects.bulk_create(
+                [
+                    Person(
+                        first_name=f"First{randomizer.randrange(rows)}",
+                        last_name=randomizer.choice(LAST_NAMES),
+                        internal_id=i,
+                        active=randomizer.random() < 0.9,
+                        salary=randomizer.randint(20000, 200000),
+                        building=randomizer.choice(buildings),
+                    )
+                    for i in range(offset, min(offset + BATCH_SIZE, rows))
+                ]
+            )
@@ -0,0 +1,72 @@
+import json
+import os
+import statistics
+import time
+
+from . import DATA_DIR
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from tests.fixtures import get_request_params
+
+# Store the results of benchmarks supporting baselines
+SAVE = os.environ.get("BENCHMARK_SAVE") == "1"
+
+
+def get_request(columns: list[str], options: dict = {}):
+    return RequestFactory().get("/", get_request_params(columns, options))
+
+
+def measure(function, repeat: int = 5) -> tuple[float, int]:
+    """
+    Calls function repeat times and returns the median duration in
+    milliseconds and the number of queries of the last call.
+    """
+    durations = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            function()
+            durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), len(queries)
+
+
+def report(
+    title: str, results: list[tuple[str, float, int]], baseline: dict | None = None
+) -> None:
+    """
+    Prints the results. With a baseline from load_baseline, also prints the
+    change in duration and flags changes in the number of queries.
+    """
+    print(title)
+    for name, duration, queries in results:
+        line = f"  {name:<40} {duration:>10.2f} ms {queries:>4} queries"
+        if baseline and name in baseline:
+            base_duration, base_queries = baseline[name]
+            line += f" {(duration / base_duration - 1) * 100:>+8.1f}%"
+            if queries != base_queries:
+                line += f"  QUERIES CHANGED (was {base_queries})"
+        print(line)
+
+
+def get_baseline_path(name: str) -> str:
+    return os.path.join(DATA_DIR, f"baseline-{name}.json")
+
+
+def load_baseline(name: str) -> dict | None:
+    """Returns {result name: [duration, queries]} saved by save_baseline."""
+    try:
+        with open(get_baseline_path(name)) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(name: str, results: list[tuple[str, float, int]]) -> None:
+    with open(get_baseline_path(name), "w") as file:
+        json.dump(
+            {name: [duration, queries] for name, duration, queries in results},
+            file,
+            indent=2,
+        )
+    print(f"Saved baseline {get_baseline_path(name)}")
@@ -1,6 +1,53 @@
-from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
-from django_datatable_serverside_mixin.datatable import DataTablesServer
+from django_datatable_serverside_mixin.views import (
+    AsyncServerSideDataTablesMixin,
+    ServerSideDataTablesMixin,
+)
+from django_datatable_serverside_mixin.datatable import (
+    AsyncDataTablesServer,
+    DataTablesError,
+    DataTablesServer,
+    ParallelDataTablesServer,
+)
+from django_datatable_serverside_mixin.columns import Column
+from django_datatable_serverside_mixin.counting import (
+    CappedCount,
+    CallableCount,
+    CountStrategy,
+    EstimatedCount,
+    ExactCount,
+)
+from django_datatable_serverside_mixin.encoders import (
+    CallableEncoder,
+    DjangoEncoder,
+    Encoder,
+    OrjsonEncoder,
+)
+from django_datatable_serverside_mixin.search import (
+    PostgresFullTextSearch,
+    SearchBackend,
+    SQLiteFTS5Search,
+)
 from warnings import warn
 
 VERSION = "2.1.1"
-__all__ = ("ServerSideDataTablesMixin", "DataTablesServer")
+__all__ = (
+    "ServerSideDataTablesMixin",
+    "AsyncServerSideDataTablesMixin",
+    "DataTablesServer",
+    "AsyncDataTablesServer",
+    "ParallelDataTablesServer",
+    "DataTablesError",
+    "Column",
+    "CountStrategy",
+    "ExactCount",
+    "CappedCount",
+    "EstimatedCount",
+    "CallableCount",
+    "SearchBackend",
+    "PostgresFullTextSearch",
+    "SQLiteFTS5Search",
+    "Encoder",
+    "DjangoEncoder",
+    "OrjsonEncoder",
+    "CallableEncoder",
+)
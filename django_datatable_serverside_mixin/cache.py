@@ -0,0 +1,236 @@
+import hashlib
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db.models.signals import post_delete, post_save
+from .counting import RecordCount
+
+KEY_PREFIX = "datatables"
+
+# (cache alias, model) pairs whose change signals are already connected
+_connected_models = set()
+
+
+def make_key(namespace: str, *parts) -> str:
+    """Builds a fixed length cache key from arbitrary parts."""
+    digest = hashlib.md5(
+        "\x1f".join(str(part) for part in parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{namespace}:{digest}"
+
+
+def get_request_parameters(query) -> list[tuple[str, str]]:
+    """
+    Returns the sorted parameters of a DataTables request without draw and
+    jQuery's "_" cache buster, which change on every request.
+    """
+    return sorted(
+        (key, value)
+        for key, values in query.lists()
+        if key not in ("draw", "_")
+        for value in values
+    )
+
+
+def get_version_key(model) -> str:
+    return f"{KEY_PREFIX}:version:{model._meta.label_lower}"
+
+
+def get_model_version(cache, model) -> int:
+    """
+    Returns the current cache version of a model. Cache keys include this
+    version so bumping it invalidates every entry built from the model.
+    """
+    return cache.get_or_set(get_version_key(model), 1, timeout=None)
+
+
+def bump_model_version(cache, model) -> None:
+    key = get_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key is missing or expired, any new version invalidates old entries
+        cache.set(key, 2, timeout=None)
+
+
+def connect_invalidation(model, cache_alias: str = "default") -> None:
+    """
+    Bumps the model's cache version whenever an instance is saved or deleted.
+    Safe to call repeatedly.
+    """
+    if (cache_alias, model) in _connected_models:
+        return
+
+    def invalidate(sender, **kwargs):
+        bump_model_version(caches[cache_alias], sender)
+
+    dispatch_uid = f"{KEY_PREFIX}:{cache_alias}:{model._meta.label_lower}"
+    post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    _connected_models.add((cache_alias, model))
+
+
+class CountCache(object):
+    """
+    Caches the results of count strategies using Django's cache framework.
+    Entries are keyed on the SQL of the counted queryset, which covers both the
+    base queryset and the filter built from the request. When invalidate is
+    True entries are dropped when an instance of the queryset's model is saved
+    or deleted. Changes to related models are not tracked.
+    """
+
+    def __init__(
+        self, alias: str = "default", timeout: int = 60, invalidate: bool = True
+    ):
+        self.alias = alias
+        self.timeout = timeout
+        self.invalidate = invalidate
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_key(self, queryset, strategy) -> str | None:
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return None
+
+        version = None
+        if self.invalidate:
+            connect_invalidation(queryset.model, self.alias)
+            version = get_model_version(self.cache, queryset.model)
+        return make_key(
+            "count",
+            queryset.db,
+            queryset.model._meta.label_lower,
+            version,
+            strategy.name,
+            sql,
+        )
+
+    def count(self, queryset, strategy) -> RecordCount:
+        key = self.get_key(queryset, strategy)
+        if key is None:
+            return strategy.count(queryset)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return RecordCount(*cached)
+
+        result = strategy.count(queryset)
+        self.cache.set(key, tuple(result), self.timeout)
+        return result
+
+
+class CursorCache(object):
+    """
+    Stores the ordering values of the last row of each served page so the
+    following page can seek past it (keyset pagination) instead of using OFFSET.
+    Entries are keyed on the SQL of the ordered and filtered queryset and the
+    row position the cursor points to.
+    """
+
+    def __init__(self, alias: str = "default", timeout: int = 300):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_key(self, queryset, position: int) -> str | None:
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return None
+        return make_key("cursor", queryset.db, sql, position)
+
+    def get(self, queryset, position: int) -> tuple | None:
+        key = self.get_key(queryset, position)
+        if key is None:
+            return None
+        return self.cache.get(key)
+
+    def set(self, queryset, position: int, values: tuple) -> None:
+        key = self.get_key(queryset, position)
+        if key is not None:
+            self.cache.set(key, values, self.timeout)
+
+
+class ResponseCache(object):
+    """
+    Caches whole response bodies using Django's cache framework. Entries are
+    keyed on the request parameters (except draw and the "_" cache buster),
+    the SQL of the view's queryset and a vary key such as the user. Bodies
+    larger than max_size bytes are not cached. The draw value is stored apart
+    from the body and replaced with the draw of each request that hits it.
+    The ETag and last modification time of the body are stored with it so
+    hits can be revalidated.
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        timeout: int = 30,
+        max_size: int = 1000000,
+        invalidate: bool = True,
+    ):
+        self.alias = alias
+        self.timeout = timeout
+        self.max_size = max_size
+        self.invalidate = invalidate
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_key(self, query, queryset, vary="") -> str | None:
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return None
+
+        version = None
+        if self.invalidate:
+            connect_invalidation(queryset.model, self.alias)
+            version = get_model_version(self.cache, queryset.model)
+        return make_key(
+            "response",
+            queryset.db,
+            queryset.model._meta.label_lower,
+            version,
+            vary,
+            sql,
+            get_request_parameters(query),
+        )
+
+    def get(self, key: str, draw: bytes) -> tuple | None:
+        """
+        Returns (body, etag, last_modified) with the encoded draw value
+        inserted in the cached body, or None.
+        """
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        head, tail, etag, last_modified = cached
+        return head + draw + tail, etag, last_modified
+
+    def set(
+        self,
+        key: str,
+        content: bytes,
+        draw: bytes,
+        etag: str | None = None,
+        last_modified=None,
+    ) -> None:
+        """
+        Stores a body starting with {"draw": followed by the encoded draw value.
+        Other bodies are not cached.
+        """
+        if len(content) > self.max_size:
+            return
+        for head in (b'{"draw": ', b'{"draw":'):
+            if content.startswith(head + draw):
+                tail = content[len(head) + len(draw) :]
+                self.cache.set(key, (head, tail, etag, last_modified), self.timeout)
+                return
@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import Future
+from django.core.cache import caches
+from .cache import make_key
+
+
+class SingleFlight(object):
+    """
+    Runs a function once for concurrent calls with the same key. Calls made
+    while the first one runs wait for it and receive its result or exception.
+    Only calls within the same process are coalesced.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key: str, function):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+
+# Shared by every view so identical requests to the same view are coalesced
+single_flight = SingleFlight()
+
+
+class DrawTracker(object):
+    """
+    Remembers the draw counter of the latest request of each client in Django's
+    cache for timeout seconds. A request is superseded once a request with a
+    higher draw arrived from the same client.
+    """
+
+    def __init__(self, alias: str = "default", timeout: int = 10):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_key(self, client_key) -> str:
+        return make_key("draw", client_key)
+
+    def arrive(self, client_key, draw: int) -> None:
+        # The latest arrival wins, so a reloaded page starting at 1 is tracked
+        self.cache.set(self.get_key(client_key), draw, self.timeout)
+
+    def is_superseded(self, client_key, draw: int) -> bool:
+        latest = self.cache.get(self.get_key(client_key))
+        return latest is not None and latest > draw
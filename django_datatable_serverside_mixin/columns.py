@@ -0,0 +1,229 @@
+import copy
+import re
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+# Also match the parts of a number's text, such as "-" or "." in "-12.50",
+# since icontains matches substrings
+INTEGER_PATTERN = re.compile(r"-?\d*")
+NUMBER_PATTERN = re.compile(r"-?\d*\.?\d*")
+UUID_PATTERN = re.compile(r"[0-9a-fA-F-]+")
+TEMPORAL_PATTERN = re.compile(r"[\d\-:./ T+Z]+")
+
+
+def is_integer(value: str) -> bool:
+    return value != "" and INTEGER_PATTERN.fullmatch(value) is not None
+
+
+def is_number(value: str) -> bool:
+    return value != "" and NUMBER_PATTERN.fullmatch(value) is not None
+
+
+def is_uuid(value: str) -> bool:
+    return UUID_PATTERN.fullmatch(value) is not None
+
+
+def is_temporal(value: str) -> bool:
+    return TEMPORAL_PATTERN.fullmatch(value) is not None
+
+
+def is_boolean(value: str) -> bool:
+    # Booleans are stored as true/false on PostgreSQL and 1/0 elsewhere
+    value = value.lower()
+    return value in "true" or value in "false" or value in ("0", "1")
+
+
+# Checks whether a search term could match the text of a field of this type.
+# Order matters as BooleanField and AutoField are not subclasses of each other.
+VALUE_CHECKS = (
+    (models.BooleanField, is_boolean),
+    (models.AutoField, is_integer),
+    (models.BigAutoField, is_integer),
+    (models.SmallAutoField, is_integer),
+    (models.IntegerField, is_integer),
+    (models.DecimalField, is_number),
+    (models.FloatField, is_number),
+    (models.UUIDField, is_uuid),
+    (models.DateField, is_temporal),
+    (models.TimeField, is_temporal),
+)
+
+
+def resolve_field(model, path: tuple[str, ...]):
+    """
+    Returns the model field at the end of a field path such as
+    ("building", "name"), or None when it cannot be resolved (e.g. annotations).
+    Relations at the end of the path resolve to their target field.
+    """
+    field = None
+    for name in path:
+        if model is None:
+            return None
+        if name == "pk":
+            field = model._meta.pk
+        else:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+        model = field.related_model
+    if field is not None and field.is_relation:
+        field = getattr(field, "target_field", None)
+    return field
+
+
+def get_value_check(field):
+    for field_class, value_check in VALUE_CHECKS:
+        if isinstance(field, field_class):
+            return value_check
+    return None
+
+
+class Column(object):
+    """
+    A column of the view. Entries of a view's columns attribute can be plain
+    strings or Column objects which choose how the column is searched.
+
+    lookup: lookup used for column searches, e.g. "icontains", "exact",
+        "istartswith", "in", "range" or "trigram_similar".
+    global_lookup: lookup used for the global search, defaults to lookup.
+    regex_lookup: lookup used for regex searches. None skips the column.
+    coerce: callable converting the search term (e.g. int). The column is
+        skipped when it raises ValueError, TypeError or ValidationError.
+    separator: splits the search term for the "in" and "range" lookups.
+    searchable: False skips the column for every search.
+    always_send: True fetches the column even when the request does not
+        declare it, e.g. when data_callback needs it.
+    """
+
+    __slots__ = (
+        "data",
+        "path",
+        "relation_path",
+        "lookup",
+        "global_lookup",
+        "regex_lookup",
+        "coerce",
+        "separator",
+        "searchable",
+        "always_send",
+        "value_check",
+    )
+
+    def __init__(
+        self,
+        data: str,
+        lookup: str = "icontains",
+        global_lookup: str | None = None,
+        regex_lookup: str | None = "iregex",
+        coerce=None,
+        separator: str = ",",
+        searchable: bool = True,
+        always_send: bool = False,
+    ):
+        self.data = data
+        # Field path split on "__", ("building", "name") for "building__name"
+        self.path = tuple(data.split(LOOKUP_SEP))
+        # Relation joined to reach the field, "building" for "building__name"
+        self.relation_path = LOOKUP_SEP.join(self.path[:-1]) or None
+        self.lookup = lookup
+        self.global_lookup = global_lookup or lookup
+        self.regex_lookup = regex_lookup
+        self.coerce = coerce
+        self.separator = separator
+        self.searchable = searchable
+        self.always_send = always_send
+        # Set by bind() from the model field, rejects terms that cannot match
+        self.value_check = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.data}>"
+
+    def bind(self, model) -> "Column":
+        """
+        Returns a copy of this column which skips search terms that cannot
+        match the type of the model field it points to.
+        """
+        column = copy.copy(self)
+        column.value_check = get_value_check(resolve_field(model, self.path))
+        return column
+
+    def get_filter(
+        self, value: str, regex: bool = False, global_search: bool = False
+    ) -> Q | None:
+        """
+        Returns the filter for a search term
+        or None when the term cannot match this column.
+        """
+        if not self.searchable:
+            return None
+        if regex:
+            if self.regex_lookup is None:
+                return None
+            return Q(**{f"{self.data}{LOOKUP_SEP}{self.regex_lookup}": value})
+
+        lookup = self.global_lookup if global_search else self.lookup
+        if lookup == "in":
+            values = [item.strip() for item in value.split(self.separator)]
+            values = [self.coerce_value(item) for item in values if item]
+            if not values or None in values:
+                return None
+            return Q(**{f"{self.data}{LOOKUP_SEP}in": values})
+
+        if lookup == "range":
+            return self.get_range_filter(value)
+
+        value = self.coerce_value(value)
+        if value is None:
+            return None
+        return Q(**{f"{self.data}{LOOKUP_SEP}{lookup}": value})
+
+    def get_range_filter(self, value: str) -> Q | None:
+        # "10,20" is a range, "10," and ",20" are open ended
+        low, separator, high = (
+            item.strip() for item in value.partition(self.separator)
+        )
+        if not separator:
+            high = low
+        q_filter = {}
+        if low:
+            q_filter[f"{self.data}{LOOKUP_SEP}gte"] = self.coerce_value(low)
+        if high:
+            q_filter[f"{self.data}{LOOKUP_SEP}lte"] = self.coerce_value(high)
+        if not q_filter or None in q_filter.values():
+            return None
+        return Q(**q_filter)
+
+    def coerce_value(self, value):
+        if self.value_check is not None and not self.value_check(value):
+            return None
+        if self.coerce is None:
+            return value
+        try:
+            return self.coerce(value)
+        except (ValueError, TypeError, ValidationError):
+            return None
+
+
+@lru_cache(maxsize=None)
+def _compile_columns(columns: tuple, model=None) -> tuple[Column, ...]:
+    compiled = tuple(
+        column if isinstance(column, Column) else Column(column) for column in columns
+    )
+    if model is not None:
+        compiled = tuple(column.bind(model) for column in compiled)
+    return compiled
+
+
+def compile_columns(columns, model=None) -> tuple[Column, ...]:
+    """
+    Returns the compiled Column objects for a view's columns attribute.
+    When a model is provided the columns are bound to its field types.
+    Results are cached so each distinct columns attribute is compiled once.
+    """
+    if not (isinstance(model, type) and issubclass(model, models.Model)):
+        model = None
+    return _compile_columns(tuple(columns), model)
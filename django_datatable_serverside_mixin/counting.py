@@ -0,0 +1,141 @@
+import json
+from collections import namedtuple
+from django.db import connections
+
+# value is the number reported to DataTables, exact is False when the value
+# is an estimate or has been capped.
+RecordCount = namedtuple("RecordCount", ["value", "exact"])
+
+
+class CountStrategy(object):
+    """
+    Base class for the strategies used to compute recordsTotal.
+    Subclasses implement count() and return a RecordCount.
+    """
+
+    name = None
+
+    def count(self, queryset) -> RecordCount:
+        raise NotImplementedError
+
+
+class ExactCount(CountStrategy):
+    """Runs SELECT COUNT(*) against the queryset."""
+
+    name = "exact"
+
+    def count(self, queryset) -> RecordCount:
+        return RecordCount(queryset.count(), True)
+
+
+class CappedCount(CountStrategy):
+    """
+    Counts at most cap rows using COUNT(*) FROM (SELECT ... LIMIT cap + 1).
+    When more rows exist the cap is returned and marked as inexact so the
+    frontend can display something like "10,000+".
+    """
+
+    name = "capped"
+
+    def __init__(self, cap: int = 10000):
+        self.cap = cap
+
+    def count(self, queryset) -> RecordCount:
+        value = queryset[: self.cap + 1].count()
+        if value > self.cap:
+            return RecordCount(self.cap, False)
+        return RecordCount(value, True)
+
+
+class EstimatedCount(CountStrategy):
+    """
+    Uses the PostgreSQL planner statistics instead of counting rows.
+    pg_class.reltuples is used for unfiltered querysets and the EXPLAIN row
+    estimate otherwise. Falls back to an exact count on other backends,
+    when no statistics are available or when the estimate is below threshold.
+    """
+
+    name = "estimate"
+
+    def __init__(self, threshold: int = 100000):
+        self.threshold = threshold
+
+    def count(self, queryset) -> RecordCount:
+        estimate = self.estimate(queryset)
+        if estimate is None or estimate < self.threshold:
+            return RecordCount(queryset.count(), True)
+        return RecordCount(estimate, False)
+
+    def estimate(self, queryset) -> int | None:
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        query = queryset.query
+        with connection.cursor() as cursor:
+            if not query.where and not query.distinct and not query.is_sliced:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                estimate = row[0] if row else None
+            else:
+                sql, params = query.sql_with_params()
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                estimate = plan[0]["Plan"]["Plan Rows"]
+
+        # reltuples is -1 for tables that have never been analyzed
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+
+class CallableCount(CountStrategy):
+    """
+    Wraps a user supplied callable which receives the queryset and returns
+    either an int (treated as exact) or a RecordCount.
+    """
+
+    name = "callable"
+
+    def __init__(self, function):
+        self.function = function
+
+    def count(self, queryset) -> RecordCount:
+        value = self.function(queryset)
+        if isinstance(value, RecordCount):
+            return value
+        return RecordCount(value, True)
+
+
+COUNT_STRATEGIES = {
+    ExactCount.name: ExactCount,
+    CappedCount.name: CappedCount,
+    EstimatedCount.name: EstimatedCount,
+}
+
+
+def get_count_strategy(strategy=None) -> CountStrategy:
+    """
+    Returns a CountStrategy for the provided value. Accepts None (exact),
+    a strategy name, a CountStrategy instance or a callable.
+    """
+    if strategy is None:
+        return ExactCount()
+    if isinstance(strategy, CountStrategy):
+        return strategy
+    if isinstance(strategy, str):
+        try:
+            return COUNT_STRATEGIES[strategy]()
+        except KeyError:
+            raise ValueError(
+                f"Unknown count strategy '{strategy}'. "
+                f"Choose from {', '.join(COUNT_STRATEGIES)}."
+            )
+    if callable(strategy):
+        return CallableCount(strategy)
+    raise TypeError(f"Invalid count strategy {strategy!r}.")
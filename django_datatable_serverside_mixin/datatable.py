@@ -1,48 +1,264 @@
+import asyncio
 import operator
-from django.db.models import Q, F
-from functools import reduce, cached_property
-from querystring_parser import parser
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+from django.db.models import Count, Max, Q, F
+from functools import partial, reduce, cached_property
+from .columns import compile_columns
+from .counting import ExactCount, RecordCount, get_count_strategy
+from .exceptions import DataTablesError, SupersededDraw
+from .limits import check_search, query_timeout
+from .profiling import NO_PHASE
+from .request import DataTablesRequest
+from .search import NO_MATCH, SearchBackend
+
+# Whether each backend sorts NULL after every other value in ascending order
+NULLS_LARGEST = {
+    "postgresql": True,
+    "oracle": True,
+    "sqlite": False,
+    "mysql": False,
+}
 
 
 class DataTablesServer(object):
-    def __init__(self, request, columns, queryset):
+    def __init__(
+        self,
+        request,
+        columns,
+        queryset,
+        count_strategy=None,
+        count_cache=None,
+        cursor_cache=None,
+        ordering_tiebreaker="pk",
+        indexed_orderings=None,
+        unindexed_ordering="truncate",
+        search_backend=None,
+        deferred_join=False,
+        array_rows=False,
+        declared_columns_only=False,
+        is_superseded=None,
+        max_search_length=None,
+        max_regex_length=None,
+        max_regex_complexity=None,
+        profile=None,
+    ):
 
         self.columns = columns
+        self.column_specs = compile_columns(columns, getattr(queryset, "model", None))
+        self.column_names = [column.data for column in self.column_specs]
         self.queryset = queryset
-        self.total_records = len(self.queryset)
-        self.total_filtered_records = self.total_records
-
-        # Parse the request into a multidemintional dictionary
-        self.request_dict: dict = parser.parse(request.GET.urlencode())
+        self.initial_queryset = queryset
+        self.count_strategy = get_count_strategy(count_strategy)
+        self.count_cache = count_cache
+        # Keyset pagination is enabled when a CursorCache is provided
+        self.cursor_cache = cursor_cache
+        self.ordering_tiebreaker = ordering_tiebreaker
+        self.indexed_orderings = indexed_orderings
+        self.unindexed_ordering = unindexed_ordering
+        self.search_backend = search_backend or SearchBackend()
+        # Only fetch and send the columns the request declares
+        self.declared_columns_only = declared_columns_only
+        self.max_search_length = max_search_length
+        self.max_regex_length = max_regex_length
+        self.max_regex_complexity = max_regex_complexity
+        # Records the duration and queries of each phase when set
+        self.profile = profile
+        self.order_fields = []
+        self.unpaginated_queryset = None
+        self.filtered = False
+        self.total_filtered_records = None
+        # Callable returning True once the client sent a later draw
+        self.is_superseded = is_superseded
+        self.check_superseded()
+
+        # COUNT(*) in the database rather than fetching every row into memory
+        self.count_total()
+
+        # Read the DataTables parameters directly from the QueryDict
+        with self.phase("parse"):
+            self.datatables_request = DataTablesRequest.from_query(request.GET)
 
         # Set pagination variables.
-        # Use defaults for when the endpoint is used directly without get variables
-        self.start = int(self.request_dict.get("start", "0"))
-        self.length = int(self.request_dict.get("length", "10"))
+        self.start = self.datatables_request.start
+        self.length = self.datatables_request.length
+
+        # Select the page's primary keys first and fetch its rows afterwards.
+        # Not used when every row is requested.
+        self.deferred_join = deferred_join and self.length != -1
+
+        # Rows are sent as arrays with one item per column, DataTables then
+        # sends the column positions as columns[i][data]
+        self.array_rows = array_rows
+        if self.array_rows:
+            self.resolve_array_columns()
+
+    def resolve_array_columns(self) -> None:
+        """
+        Replaces numeric columns[i][data] values with the name of the column
+        at that position so searching and ordering work as with names.
+        """
+        for column_request in self.datatables_request.columns.values():
+            data = str(column_request.data)
+            if data.isdigit() and int(data) < len(self.column_specs):
+                column_request.data = self.column_specs[int(data)].data
+
+    @cached_property
+    def request_dict(self) -> dict:
+        """The request as a nested dictionary, kept for subclasses."""
+        return self.datatables_request.to_dict()
+
+    @cached_property
+    def column_requests_by_data(self) -> dict:
+        return {
+            column.data: column for column in self.datatables_request.columns.values()
+        }
+
+    @cached_property
+    def column_index_lookup_by_data(self) -> dict:
+        return {
+            data: column.index for data, column in self.column_requests_by_data.items()
+        }
+
+    @cached_property
+    def selected_columns(self) -> list:
+        """
+        Columns fetched from the database and sent to the client. Every column
+        unless declared_columns_only is True, then columns which the request
+        does not declare are skipped unless they are marked always_send, so
+        their relation tables are not joined. Every column is selected when
+        the request declares none.
+        """
+        if not self.declared_columns_only or not self.datatables_request.columns:
+            return list(self.column_specs)
+        return [
+            column
+            for column in self.column_specs
+            if column.always_send or column.data in self.column_requests_by_data
+        ]
+
+    @cached_property
+    def selected_column_names(self) -> list[str]:
+        return [column.data for column in self.selected_columns]
 
     @cached_property
-    def column_index_lookup_by_data(self):
-        column_index_lookup_by_data = {}
-        for i, v in self.request_dict["columns"].items():
-            column_index_lookup_by_data[v.get("data", i)] = i
-        return column_index_lookup_by_data
+    def array_row_positions(self) -> list[int]:
+        """Position in the row of each selected column when using array rows."""
+        positions = {column.data: i for i, column in enumerate(self.column_specs)}
+        return [positions[data] for data in self.selected_column_names]
+
+    def get_array_row(self, values) -> list:
+        """
+        Returns the array row for the values of the selected columns, columns
+        which were not selected are None. Trailing cursor values are dropped.
+        """
+        positions = self.array_row_positions
+        if len(positions) == len(self.column_specs):
+            return list(values[: len(positions)])
+        row = [None] * len(self.column_specs)
+        for position, value in zip(positions, values):
+            row[position] = value
+        return row
 
     def get_column_index_by_data(self, data: str) -> int:
         return self.column_index_lookup_by_data.get(data, None)
 
+    def phase(self, name: str):
+        """Records the enclosed code as a phase of the profile, if any."""
+        if self.profile is None:
+            return NO_PHASE
+        return self.profile.phase(name)
+
+    def check_superseded(self) -> None:
+        """Raises SupersededDraw when the client sent a later draw."""
+        if self.is_superseded is not None and self.is_superseded():
+            raise SupersededDraw()
+
+    def count_total(self) -> None:
+        with self.phase("count_total"):
+            self.set_total(self.count_queryset(self.queryset, self.count_strategy))
+
+    def set_total(self, total) -> None:
+        self.total_records = total.value
+        self.total_records_exact = total.exact
+        # Replaced by the filtered count once a filter is applied
+        if self.total_filtered_records is None:
+            self.total_filtered_records = self.total_records
+
+    def count_queryset(self, queryset, strategy):
+        if self.count_cache is None:
+            return strategy.count(queryset)
+        return self.count_cache.count(queryset, strategy)
+
     def get_output_result(self) -> dict:
         data = self.get_db_data()
-        return {
-            "draw": self.request_dict.get("draw"),
+        return {**self.get_output_metadata(), "data": data}
+
+    def get_output_metadata(self) -> dict:
+        """
+        Returns every field of the response except data.
+        recordsFiltered is only known once the queryset has been filtered.
+        """
+        result = {
+            "draw": self.datatables_request.draw,
             "recordsTotal": self.total_records,
             "recordsFiltered": self.total_filtered_records,
-            "data": data,
         }
+        # Report non default strategies so the frontend can display "10,000+"
+        if self.count_strategy.name != "exact":
+            result["countStrategy"] = self.count_strategy.name
+            result["recordsTotalExact"] = self.total_records_exact
+        return result
 
     def get_db_data(self) -> list[dict]:
+        self.prepare_queryset()
+        self.check_superseded()
+        with self.phase("page"):
+            return self.fetch_db_data()
+
+    def fetch_db_data(self) -> list[dict]:
+        """Reads the rows of the prepared queryset."""
+        data = list(self.queryset)
+        if self.cursor_cache is not None and self.order_fields:
+            self.store_cursor(data)
+        if self.deferred_join:
+            data = self.fetch_page_rows(data)
+        elif self.array_rows:
+            data = [self.get_array_row(values) for values in data]
+        return data
+
+    def iter_db_data(self, chunk_size: int = 2000):
+        """
+        Yields the rows of the prepared queryset in lists of at most chunk_size
+        rows. Rows are read with QuerySet.iterator so only one chunk is held
+        in memory at a time. Call prepare_queryset first.
+        """
+        chunk = []
+        for row in self.queryset.iterator(chunk_size=chunk_size):
+            if self.array_rows:
+                row = self.get_array_row(row)
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def prepare_queryset(self) -> None:
+        self.check_superseded()
+
         # Apply Filter
-        self.filter_queryset()
-        self.total_filtered_records = len(self.queryset)
+        # Only count again when a filter was actually applied
+        if not self.filtered:
+            unfiltered_queryset = self.queryset
+            self.filter_queryset()
+            if self.queryset is not unfiltered_queryset:
+                with self.phase("count_filtered"):
+                    self.total_filtered_records = self.count_queryset(
+                        self.queryset, ExactCount()
+                    ).value
 
         # Apply Order
         self.order_queryset()
@@ -53,59 +269,67 @@ class DataTablesServer(object):
         # Apply Paginations
         self.paginate_queryset()
 
-        return list(self.queryset)
-
     def filter_queryset(self) -> None:
-        q_filter = self.get_filter()
-
-        if q_filter:
-            self.queryset = self.queryset.filter(q_filter)
+        with self.phase("filter"):
+            q_filter = self.get_filter()
+
+            if q_filter:
+                self.queryset = self.queryset.filter(q_filter)
+        self.filtered = True
+
+    def get_last_modified(self, field: str) -> tuple:
+        """
+        Filters the queryset and returns the latest value of field and the
+        number of filtered rows using a single aggregate query. The number of
+        rows is used as recordsFiltered instead of counting again.
+        """
+        if not self.filtered:
+            self.filter_queryset()
+        result = self.queryset.aggregate(last_modified=Max(field), count=Count("pk"))
+        self.total_filtered_records = result["count"]
+        return result["last_modified"], result["count"]
 
     def get_filter(self):
-        global_search_value = self.request_dict.get("search", {}).get("value", "")
-        global_search_regex = (
-            self.request_dict.get("search", {}).get("regex", False) == "true"
-        )
-
-        global_lookup_type = "icontains" if not global_search_regex else "iregex"
         # Loop over designated columns and build query list
-        global_filter_list = []
+        searchable_columns = []
         column_filter_list = []
-        for column in self.columns:
-            # Get column id from request based on provided column name
-            column_index = self.get_column_index_by_data(column)
+        for column in self.column_specs:
             # Only search against fields provided in the request
-            if column_index is None:
+            column_request = self.column_requests_by_data.get(column.data)
+            if column_request is None:
                 continue
 
             # Verify that searchable is true for this field
-            field_info = self.request_dict.get("columns").get(column_index)
-            if field_info.get("searchable") == "false":
+            if not column_request.searchable or not column.searchable:
                 continue
-
-            # Build the global query
-            if global_search_value:
-                global_filter_list.append(
-                    Q(**{f"{column}__{global_lookup_type}": global_search_value})
-                )
-
-            # Get column values
-            column_search_value = field_info.get("search", {}).get("value", "")
-            column_search_regex = (
-                field_info.get("search", {}).get("regex", False) == "true"
-            )
-            column_lookup_type = "icontains" if not column_search_regex else "iregex"
+            searchable_columns.append(column)
 
             # Build the column query
-            if column_search_value:
-                column_filter_list.append(
-                    Q(**{f"{column}__{column_lookup_type}": column_search_value})
+            if column_request.search_value:
+                self.check_search(
+                    column_request.search_value, column_request.search_regex
                 )
+                q_filter = column.get_filter(
+                    column_request.search_value, column_request.search_regex
+                )
+                # The value cannot match this column so nothing can match
+                if q_filter is None:
+                    q_filter = NO_MATCH
+                column_filter_list.append(q_filter)
+
+        # Build the global query
+        self.check_search(
+            self.datatables_request.search_value, self.datatables_request.search_regex
+        )
+        global_filter = self.search_backend.get_filter(
+            searchable_columns,
+            self.datatables_request.search_value,
+            self.datatables_request.search_regex,
+        )
 
         q_filter = []
         # If q_list is empty return None
-        if len(global_filter_list) != 0:
-            global_filter = reduce(operator.or_, global_filter_list)
+        if global_filter is not None:
             q_filter.append(global_filter)
 
         if len(column_filter_list) != 0:
@@ -116,36 +340,464 @@ class DataTablesServer(object):
         if len(q_filter) != 0:
             return reduce(operator.and_, q_filter)
 
+    def check_search(self, value: str, regex: bool) -> None:
+        """
+        Raises DataTablesError when a search value is longer than
+        max_search_length, or for regular expressions max_regex_length,
+        or has a complexity above max_regex_complexity.
+        """
+        check_search(
+            value,
+            regex,
+            self.max_search_length,
+            self.max_regex_length,
+            self.max_regex_complexity,
+        )
+
     def order_queryset(self) -> None:
-        order_value = self.request_dict["order"].values()
+        columns = self.datatables_request.columns
 
         order_list = []
-        # Sample order_by: {0: {'column': '0','dir': 'asc'}, {2: {'column': '0','dir': 'asc'}
-        for order_request in order_value:
+        for order_request in self.datatables_request.order:
 
             # Lookup the field by the provided column index. Skip if cannot be found.
-            field_info = self.request_dict.get("columns").get(
-                int(order_request.get("column")), None
-            )
-            if field_info is None:
+            column_request = columns.get(order_request.column, None)
+            if column_request is None:
                 continue
 
             # If field is not orderable skip
-            if field_info.get("orderable") == "false":
+            if not column_request.orderable:
                 continue
 
             # Appended hiphen is used for descending order
             order_list.append(
-                f"{'-' if order_request.get('dir') == 'desc' else ''}{field_info['data']}"
+                f"{'-' if order_request.descending else ''}{column_request.data}"
             )
+
+        order_list = self.restrict_ordering(order_list)
+
+        # Append a unique tiebreaker so pages are deterministic
+        tiebreaker = self.ordering_tiebreaker
         if len(order_list) > 0:
+            if tiebreaker and not {tiebreaker, f"-{tiebreaker}"} & set(order_list):
+                order_list.append(tiebreaker)
+            self.order_fields = order_list
             self.queryset = self.queryset.order_by(*order_list)
+        elif tiebreaker and not self.queryset.ordered:
+            self.order_fields = [tiebreaker]
+            self.queryset = self.queryset.order_by(tiebreaker)
+        elif tiebreaker:
+            # The queryset's own ordering (or Meta.ordering) may not be unique
+            ordering = self.get_queryset_ordering()
+            if ordering and not {tiebreaker, f"-{tiebreaker}"} & set(ordering):
+                ordering.append(tiebreaker)
+                self.queryset = self.queryset.order_by(*ordering)
+                # Expressions cannot be used to build a keyset cursor
+                if all(isinstance(field, str) for field in ordering):
+                    self.order_fields = ordering
+
+    def get_queryset_ordering(self) -> list:
+        """
+        Returns the ordering of the queryset from order_by(), or else from
+        the model's Meta.ordering.
+        """
+        query = self.queryset.query
+        if query.order_by:
+            return list(query.order_by)
+        if query.default_ordering:
+            return list(query.get_meta().ordering)
+        return []
+
+    def restrict_ordering(self, order_list: list[str]) -> list[str]:
+        """
+        Keeps the longest leading part of the requested ordering that matches
+        one of indexed_orderings, whose fields may start with a hyphen for
+        descending order. The directions must all match the declared ones or
+        all be reversed, as an index can be scanned in either direction.
+        Raises DataTablesError instead when unindexed_ordering is "reject".
+        All orderings are allowed when indexed_orderings is None.
+        """
+        if self.indexed_orderings is None:
+            return order_list
+
+        fields = [field.lstrip("-") for field in order_list]
+        requested = [(field.lstrip("-"), field.startswith("-")) for field in order_list]
+        supported = 0
+        for indexed_ordering in self.indexed_orderings:
+            declared = [
+                (field.lstrip("-"), field.startswith("-")) for field in indexed_ordering
+            ]
+            for reverse in (False, True):
+                matched = 0
+                for (field, descending), (indexed_field, indexed_descending) in zip(
+                    requested, declared
+                ):
+                    if field != indexed_field or descending != (
+                        indexed_descending != reverse
+                    ):
+                        break
+                    matched += 1
+                supported = max(supported, matched)
+
+        if supported < len(order_list) and self.unindexed_ordering == "reject":
+            raise DataTablesError(f"Ordering by {', '.join(fields)} is not supported.")
+        return order_list[:supported]
+
+    @property
+    def cursor_fields(self) -> list[str]:
+        """
+        Ordering fields used to build the keyset cursor. Requests for every
+        row (length -1) have no next page, so none are selected for them.
+        """
+        if self.cursor_cache is None or self.length == -1:
+            return []
+        return [field.lstrip("-") for field in self.order_fields]
+
+    @property
+    def cursor_only_fields(self) -> list[str]:
+        """Ordering fields that are only selected to build the keyset cursor."""
+        return [
+            field
+            for field in self.cursor_fields
+            if field not in self.selected_column_names
+        ]
 
     def select_queryset(self):
-        self.queryset = self.queryset.values(*self.columns)
+        if self.deferred_join:
+            # Only select the primary keys (and cursor values) of the page,
+            # the rows themselves are fetched by fetch_page_rows
+            self.queryset = self.queryset.values(
+                *dict.fromkeys(["pk", *self.cursor_fields])
+            )
+            return
+
+        # Keyset pagination also needs the ordering values of the last row
+        fields = [*self.selected_column_names, *self.cursor_only_fields]
+        if self.array_rows:
+            self.queryset = self.queryset.values_list(*fields)
+        else:
+            self.queryset = self.queryset.values(*fields)
+
+    def fetch_page_rows(self, page: list[dict]) -> list[dict]:
+        """
+        Second query of the deferred join. Fetches the selected columns for the
+        primary keys of the page and restores the page order.
+        """
+        pks = [row["pk"] for row in page]
+        if not pks:
+            return []
+
+        queryset = self.initial_queryset.filter(pk__in=pks)
+        if self.array_rows:
+            rows = queryset.values_list("pk", *self.selected_column_names)
+            rows_by_pk = {row[0]: self.get_array_row(row[1:]) for row in rows}
+            return [rows_by_pk[pk] for pk in pks if pk in rows_by_pk]
+
+        fields = dict.fromkeys(["pk", *self.selected_column_names])
+        rows = queryset.values(*fields)
+        rows_by_pk = {row["pk"]: row for row in rows}
+
+        keep_pk = "pk" in self.selected_column_names
+        data = []
+        for pk in pks:
+            row = rows_by_pk.get(pk)
+            # Skip rows deleted between both queries
+            if row is None:
+                continue
+            if not keep_pk:
+                del row["pk"]
+            data.append(row)
+        return data
 
     def paginate_queryset(self) -> None:
         if self.length == -1:
             return
 
+        if self.cursor_cache is not None and self.order_fields:
+            self.unpaginated_queryset = self.queryset
+            keyset_filter = self.get_keyset_filter()
+            if keyset_filter is not None:
+                self.queryset = self.queryset.filter(keyset_filter)[: self.length]
+                return
+
         self.queryset = self.queryset[self.start : self.start + self.length]
+
+    def get_keyset_filter(self):
+        """
+        Returns a filter selecting the rows after the last row of the previous
+        page, or None when no cursor is known for the requested start.
+        Random jumps fall back to OFFSET pagination, as do backends whose
+        position of NULL values in the ordering is unknown.
+        """
+        if self.start == 0:
+            return None
+        nulls_largest = NULLS_LARGEST.get(connections[self.queryset.db].vendor)
+        if nulls_largest is None:
+            return None
+        cursor = self.cursor_cache.get(self.unpaginated_queryset, self.start)
+        if cursor is None:
+            return None
+
+        # (a, b, pk) > (x, y, z) expands to
+        # a > x OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)
+        # where NULL values follow the backend's ordering, since comparisons
+        # with NULL never match
+        keyset_filter_list = []
+        equal_filter = Q()
+        for field, value in zip(self.order_fields, cursor):
+            descending = field.startswith("-")
+            field = field.lstrip("-")
+            nulls_after = nulls_largest != descending
+            if value is None:
+                after = None if nulls_after else Q(**{f"{field}__isnull": False})
+                equal = Q(**{f"{field}__isnull": True})
+            else:
+                after = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+                if nulls_after:
+                    after |= Q(**{f"{field}__isnull": True})
+                equal = Q(**{field: value})
+            if after is not None:
+                keyset_filter_list.append(equal_filter & after)
+            equal_filter &= equal
+        if not keyset_filter_list:
+            return None
+        return reduce(operator.or_, keyset_filter_list)
+
+    def store_cursor(self, data: list[dict]) -> None:
+        """
+        Remembers the ordering values of the last row so the next page can seek
+        from it, then drops any field that was only selected for the cursor.
+        """
+        # Array rows are value tuples until get_array_row is applied
+        tuple_rows = self.array_rows and not self.deferred_join
+        if self.unpaginated_queryset is not None and len(data) == self.length:
+            if tuple_rows:
+                fields = [*self.selected_column_names, *self.cursor_only_fields]
+                cursor = tuple(
+                    data[-1][fields.index(field)] for field in self.cursor_fields
+                )
+            else:
+                cursor = tuple(data[-1][field] for field in self.cursor_fields)
+            self.cursor_cache.set(
+                self.unpaginated_queryset, self.start + self.length, cursor
+            )
+
+        # Deferred join pages are replaced by fetch_page_rows
+        cursor_only_fields = self.cursor_only_fields
+        if cursor_only_fields and not self.deferred_join and not tuple_rows:
+            for row in data:
+                for field in cursor_only_fields:
+                    del row[field]
+
+
+class AsyncDataTablesServer(DataTablesServer):
+    """
+    DataTablesServer for async views. Nothing is counted on initialization,
+    the counts and the page are read with the async ORM by aget_output_result.
+    """
+
+    def count_total(self) -> None:
+        self.total_records = None
+        self.total_records_exact = True
+        self.total_filtered_records = None
+
+    async def acount_total(self) -> None:
+        if self.total_records is None:
+            self.set_total(
+                await self.acount_queryset(self.initial_queryset, self.count_strategy)
+            )
+
+    async def acount_queryset(self, queryset, strategy):
+        if self.count_cache is None and isinstance(strategy, ExactCount):
+            return RecordCount(await queryset.acount(), True)
+        # Cached and custom counts use the sync API
+        return await sync_to_async(self.count_queryset)(queryset, strategy)
+
+    async def aget_last_modified(self, field: str) -> tuple:
+        """Async version of get_last_modified."""
+        if not self.filtered:
+            self.filter_queryset()
+        result = await self.queryset.aaggregate(
+            last_modified=Max(field), count=Count("pk")
+        )
+        self.total_filtered_records = result["count"]
+        return result["last_modified"], result["count"]
+
+    async def aget_output_result(self) -> dict:
+        """
+        Runs the total count, the filtered count and the page query with
+        asyncio.gather so the backend can run them concurrently.
+        """
+        if self.is_superseded is not None:
+            await sync_to_async(self.check_superseded)()
+
+        filtered_queryset = None
+        if not self.filtered:
+            self.filter_queryset()
+            if self.queryset is not self.initial_queryset:
+                filtered_queryset = self.queryset
+        self.order_queryset()
+        self.select_queryset()
+        if self.cursor_cache is None:
+            self.paginate_queryset()
+        else:
+            # Cursors are read from the cache with the sync API
+            await sync_to_async(self.paginate_queryset)()
+
+        # Coroutines are created here so none is left unawaited when the
+        # ordering is rejected
+        queries = [self.acount_total(), self.aget_db_data()]
+        if filtered_queryset is not None:
+            queries.append(self.acount_queryset(filtered_queryset, ExactCount()))
+        _, data, *filtered = await asyncio.gather(*queries)
+        if filtered:
+            self.total_filtered_records = filtered[0].value
+        return {**self.get_output_metadata(), "data": data}
+
+    async def aget_db_data(self) -> list:
+        """Async version of get_db_data, call after the queryset is prepared."""
+        data = [row async for row in self.queryset]
+        if self.cursor_cache is not None and self.order_fields:
+            await sync_to_async(self.store_cursor)(data)
+        if self.deferred_join:
+            data = await sync_to_async(self.fetch_page_rows)(data)
+        elif self.array_rows:
+            data = [self.get_array_row(values) for values in data]
+        return data
+
+
+# Shared by every ParallelDataTablesServer so threads keep their connections
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix="datatables")
+        return _executor
+
+
+def run_query(function, using=None, timeout=None):
+    """
+    Runs a query in a worker thread and releases its connections after.
+    The query is limited to timeout seconds on the database alias using.
+    """
+    try:
+        with query_timeout(using, timeout):
+            return function()
+    finally:
+        close_old_connections()
+
+
+class ParallelDataTablesServer(DataTablesServer):
+    """
+    DataTablesServer which runs the total count, the filtered count and the
+    page query at the same time on a thread pool, each thread using its own
+    database connection. query_aliases lists the database aliases the queries
+    are sent to in turn, such as read replicas. Defaults to the queryset's.
+    Each query is limited to statement_timeout seconds when it is set.
+    """
+
+    def __init__(self, *args, query_aliases=None, statement_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_aliases = query_aliases or [self.initial_queryset.db]
+        self.statement_timeout = statement_timeout
+
+    def count_total(self) -> None:
+        # Counted by run_queries
+        self.total_records = None
+        self.total_records_exact = True
+        self.total_filtered_records = None
+
+    def get_output_result(self) -> dict:
+        data = self.run_queries(page=True)
+        return {**self.get_output_metadata(), "data": data}
+
+    def prepare_queryset(self) -> None:
+        # Streamed responses read the page themselves, only count
+        self.run_queries(page=False)
+
+    def run_queries(self, page: bool) -> list | None:
+        """
+        Prepares the queryset, then runs the counts and (when page is True)
+        the page query in parallel. Returns the page.
+        """
+        self.check_superseded()
+        filtered_queryset = None
+        if not self.filtered:
+            self.filter_queryset()
+            if self.queryset is not self.initial_queryset:
+                filtered_queryset = self.queryset
+        self.order_queryset()
+        self.select_queryset()
+        self.paginate_queryset()
+
+        aliases = self.query_aliases
+        queries = {}
+        if self.total_records is None:
+            queries["count_total"] = (
+                aliases[0],
+                partial(
+                    self.count_queryset,
+                    self.initial_queryset.using(aliases[0]),
+                    self.count_strategy,
+                ),
+            )
+        if filtered_queryset is not None:
+            alias = aliases[len(queries) % len(aliases)]
+            queries["count_filtered"] = (
+                alias,
+                partial(
+                    self.count_queryset, filtered_queryset.using(alias), ExactCount()
+                ),
+            )
+        if page:
+            alias = aliases[len(queries) % len(aliases)]
+            self.queryset = self.queryset.using(alias)
+            # Deferred joins fetch the rows from the same database
+            self.initial_queryset = self.initial_queryset.using(alias)
+            queries["page"] = (alias, self.fetch_db_data)
+
+        futures = {
+            name: self.submit(name, alias, query)
+            for name, (alias, query) in queries.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+        if "count_filtered" in results:
+            self.total_filtered_records = results["count_filtered"].value
+        if "count_total" in results:
+            self.set_total(results["count_total"])
+        return results.get("page")
+
+    def get_last_modified(self, field: str) -> tuple:
+        """Also counts the total at the same time, the ETag includes it."""
+        total = None
+        if self.total_records is None:
+            alias = self.query_aliases[0]
+            total = self.submit(
+                "count_total",
+                alias,
+                partial(
+                    self.count_queryset,
+                    self.initial_queryset.using(alias),
+                    self.count_strategy,
+                ),
+            )
+        result = self.submit(
+            "last_modified", self.queryset.db, partial(super().get_last_modified, field)
+        ).result()
+        if total is not None:
+            self.set_total(total.result())
+        return result
+
+    def submit(self, name: str, using: str, function):
+        """
+        Runs function on the thread pool, limited to statement_timeout.
+        Recorded as the phase name when the request is profiled.
+        """
+        if self.profile is not None:
+            function = partial(self.profile.run, name, using, function)
+        return get_executor().submit(run_query, function, using, self.statement_timeout)
@@ -0,0 +1,108 @@
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class Encoder(object):
+    """
+    Base class for the encoders used to render responses to JSON.
+    Subclasses implement encode() and return bytes.
+    """
+
+    name = None
+    content_type = "application/json"
+    # Written between the rows of streamed responses
+    item_separator = b","
+
+    def encode(self, data) -> bytes:
+        raise NotImplementedError
+
+    def get_response(self, data) -> HttpResponse:
+        return HttpResponse(self.encode(data), content_type=self.content_type)
+
+
+class DjangoEncoder(Encoder):
+    """Encodes with the json module and DjangoJSONEncoder, like JsonResponse."""
+
+    name = "django"
+    item_separator = b", "
+
+    def encode(self, data) -> bytes:
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+    def get_response(self, data) -> JsonResponse:
+        return JsonResponse(data, safe=False)
+
+
+class OrjsonEncoder(Encoder):
+    """
+    Encodes with orjson. datetime, date and time values are passed to
+    DjangoJSONEncoder so they are formatted exactly like JsonResponse does,
+    as are Decimal, timedelta and lazy strings which orjson does not support.
+    The output has no whitespace between items.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonEncoder requires the orjson package.")
+        self.default = DjangoJSONEncoder().default
+
+    def encode(self, data) -> bytes:
+        return orjson.dumps(
+            data,
+            default=self.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+
+
+class CallableEncoder(Encoder):
+    """Wraps a callable accepting the data and returning bytes or str."""
+
+    name = "callable"
+
+    def __init__(self, function):
+        self.function = function
+
+    def encode(self, data) -> bytes:
+        encoded = self.function(data)
+        if isinstance(encoded, str):
+            return encoded.encode()
+        return encoded
+
+
+ENCODERS = {
+    DjangoEncoder.name: DjangoEncoder,
+    OrjsonEncoder.name: OrjsonEncoder,
+}
+
+
+def get_encoder(encoder=None) -> Encoder:
+    """
+    Returns an Encoder for the provided value. Accepts None (django),
+    an encoder name, "auto" (orjson when installed), an Encoder instance
+    or a callable.
+    """
+    if encoder is None:
+        return DjangoEncoder()
+    if isinstance(encoder, Encoder):
+        return encoder
+    if isinstance(encoder, str):
+        if encoder == "auto":
+            return OrjsonEncoder() if orjson is not None else DjangoEncoder()
+        try:
+            return ENCODERS[encoder]()
+        except KeyError:
+            raise ValueError(
+                f"Unknown JSON encoder '{encoder}'. "
+                f"Choose from {', '.join(ENCODERS)} or auto."
+            )
+    if callable(encoder):
+        return CallableEncoder(encoder)
+    raise TypeError(f"Invalid JSON encoder {encoder!r}.")
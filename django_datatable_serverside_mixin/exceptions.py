@@ -0,0 +1,12 @@
+class DataTablesError(Exception):
+    """
+    Raised when a request cannot be served.
+    The message is returned to DataTables in the error field of the response.
+    """
+
+
+class SupersededDraw(Exception):
+    """
+    Raised when the client sent a later draw while a request was being served.
+    DataTables ignores responses to older draws, so the queries are skipped.
+    """
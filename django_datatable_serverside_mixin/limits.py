@@ -0,0 +1,193 @@
+import math
+import re
+import time
+from contextlib import contextmanager
+from django.db import OperationalError, connections, transaction
+from .exceptions import DataTablesError
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+TIMEOUT_MESSAGE = "The search took too long. Try a more specific search."
+
+# Number of SQLite virtual machine instructions between two deadline checks
+SQLITE_PROGRESS_STEPS = 1000
+
+REPEATS = {
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+}
+
+
+def check_search(
+    value: str,
+    regex: bool = False,
+    max_length: int | None = None,
+    max_regex_length: int | None = None,
+    max_regex_complexity: int | None = None,
+) -> None:
+    """Raises DataTablesError when a search value exceeds one of the limits."""
+    if max_length is not None and len(value) > max_length:
+        raise DataTablesError(f"Searches are limited to {max_length} characters.")
+    if not regex:
+        return
+    if max_regex_length is not None and len(value) > max_regex_length:
+        raise DataTablesError(
+            f"Regular expressions are limited to {max_regex_length} characters."
+        )
+    if max_regex_complexity is not None:
+        try:
+            complexity = get_regex_complexity(value)
+        except (re.error, OverflowError, RecursionError):
+            raise DataTablesError("Invalid regular expression.")
+        if complexity > max_regex_complexity:
+            raise DataTablesError("The regular expression is too complex.")
+
+
+def get_regex_complexity(pattern: str) -> float:
+    """
+    Returns the number of quantifiers, groups and alternatives of a regular
+    expression as parsed by Python's re module. Returns infinity when an
+    unbounded quantifier is nested in another, like (a+)+, which can
+    backtrack exponentially.
+    """
+    return _get_complexity(sre_parse.parse(pattern), False)
+
+
+def _get_complexity(items, in_unbounded_repeat: bool) -> float:
+    complexity = 0
+    for op, value in items:
+        if op in REPEATS:
+            low, high, subpattern = value
+            unbounded = high == sre_parse.MAXREPEAT
+            if unbounded and in_unbounded_repeat:
+                return math.inf
+            complexity += 1 + _get_complexity(
+                subpattern, in_unbounded_repeat or unbounded
+            )
+        elif op == sre_parse.BRANCH:
+            branches = value[1]
+            complexity += len(branches) - 1
+            for branch in branches:
+                complexity += _get_complexity(branch, in_unbounded_repeat)
+        elif op == sre_parse.SUBPATTERN:
+            complexity += 1 + _get_complexity(value[-1], in_unbounded_repeat)
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            complexity += 1 + _get_complexity(value[1], in_unbounded_repeat)
+        elif op == sre_parse.GROUPREF_EXISTS:
+            for branch in value[1:]:
+                if branch is not None:
+                    complexity += 1 + _get_complexity(branch, in_unbounded_repeat)
+        elif op == getattr(sre_parse, "ATOMIC_GROUP", None):
+            complexity += 1 + _get_complexity(value, in_unbounded_repeat)
+    return complexity
+
+
+@contextmanager
+def query_timeout(using: str | None, timeout: float | None):
+    """
+    Limits every query run on the database alias using within the block to
+    timeout seconds and raises DataTablesError when one takes longer.
+    PostgreSQL sets statement_timeout for a transaction, MySQL and MariaDB
+    the session's execution time limit and SQLite interrupts queries from
+    a progress handler. Other backends are not limited.
+    """
+    if timeout is None or using is None:
+        yield
+        return
+    connection = connections[using]
+    limit = TIMEOUT_LIMITS.get(connection.vendor)
+    if limit is None:
+        yield
+        return
+    try:
+        with limit(connection, timeout):
+            yield
+    except OperationalError as e:
+        if not is_timeout_error(connection, e):
+            raise
+        raise DataTablesError(TIMEOUT_MESSAGE) from e
+
+
+def is_timeout_error(connection, error: OperationalError) -> bool:
+    if connection.vendor == "postgresql":
+        # query_canceled, psycopg2 names the code pgcode and psycopg 3 sqlstate
+        cause = error.__cause__
+        code = getattr(cause, "pgcode", None) or getattr(cause, "sqlstate", None)
+        return code == "57014"
+    if connection.vendor == "mysql":
+        # ER_QUERY_TIMEOUT (MySQL) and ER_STATEMENT_TIMEOUT (MariaDB)
+        return bool(error.args) and error.args[0] in (3024, 1969)
+    if connection.vendor == "sqlite":
+        return "interrupted" in str(error)
+    return False
+
+
+@contextmanager
+def _postgresql_timeout(connection, timeout: float):
+    # Inside an outer transaction the setting would outlive the block
+    previous = None
+    if connection.in_atomic_block:
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            previous = cursor.fetchone()[0]
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('statement_timeout', %s, true)",
+                [str(math.ceil(timeout * 1000))],
+            )
+        yield
+        if previous is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('statement_timeout', %s, true)", [previous]
+                )
+
+
+@contextmanager
+def _mysql_timeout(connection, timeout: float):
+    if connection.mysql_is_mariadb:
+        variable, value = "max_statement_time", timeout
+    else:
+        variable, value = "max_execution_time", math.ceil(timeout * 1000)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SET SESSION {variable} = %s", [value])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET SESSION {variable} = DEFAULT")
+
+
+@contextmanager
+def _sqlite_timeout(connection, timeout: float):
+    deadline = None
+
+    def start_timer(execute, sql, params, many, context):
+        nonlocal deadline
+        deadline = time.monotonic() + timeout
+        return execute(sql, params, many, context)
+
+    def progress_handler():
+        # Any true value interrupts the running query
+        return deadline is not None and time.monotonic() > deadline
+
+    connection.ensure_connection()
+    connection.connection.set_progress_handler(progress_handler, SQLITE_PROGRESS_STEPS)
+    try:
+        with connection.execute_wrapper(start_timer):
+            yield
+    finally:
+        connection.connection.set_progress_handler(None, 0)
+
+
+TIMEOUT_LIMITS = {
+    "postgresql": _postgresql_timeout,
+    "mysql": _mysql_timeout,
+    "sqlite": _sqlite_timeout,
+}
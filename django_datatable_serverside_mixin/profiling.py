@@ -0,0 +1,90 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from django.db import connections
+from django.dispatch import Signal
+
+# Sent with view, request, response and profile after a profiled request
+request_profiled = Signal()
+
+# Used instead of a phase when requests are not profiled
+NO_PHASE = nullcontext()
+
+
+class Profile(object):
+    """
+    Records the duration and the number of SQL queries of the phases of a
+    request, such as parsing, filtering, counting and reading the page.
+    Phases can be nested and run on several threads. Queries are counted in
+    every phase running on the thread that sent them, and in query_count.
+    """
+
+    def __init__(self):
+        # Phase name: [seconds, queries], in the order the phases started
+        self.phases = {}
+        self.query_count = 0
+        self.local = threading.local()
+
+    @property
+    def active_phases(self) -> list[str]:
+        """The phases running on the current thread."""
+        try:
+            return self.local.phases
+        except AttributeError:
+            self.local.phases = []
+            return self.local.phases
+
+    @contextmanager
+    def phase(self, name: str):
+        """Records the duration of the enclosed code as the phase name."""
+        timing = self.phases.setdefault(name, [0.0, 0])
+        active_phases = self.active_phases
+        active_phases.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing[0] += time.perf_counter() - start
+            active_phases.pop()
+
+    @contextmanager
+    def count_queries(self, using: str | None = None):
+        """
+        Counts the queries sent on this thread's connection to the database
+        alias using, or to every database when using is None.
+        """
+        aliases = [using] if using is not None else list(connections)
+        with ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(self.record_query)
+                )
+            yield
+
+    def record_query(self, execute, sql, params, many, context):
+        self.query_count += 1
+        for name in set(self.active_phases):
+            self.phases[name][1] += 1
+        return execute(sql, params, many, context)
+
+    def run(self, name: str, using: str, function):
+        """Calls function as the phase name, counting its queries on using."""
+        with self.phase(name), self.count_queries(using):
+            return function()
+
+    def as_dict(self) -> dict:
+        """Returns the query count and each phase's duration in milliseconds."""
+        return {
+            "queries": self.query_count,
+            "phases": {
+                name: {"duration": round(seconds * 1000, 3), "queries": queries}
+                for name, (seconds, queries) in self.phases.items()
+            },
+        }
+
+    def get_server_timing(self) -> str:
+        """Returns the phases as the value of a Server-Timing header."""
+        return ", ".join(
+            f'{name};dur={seconds * 1000:.3f};desc="{queries} queries"'
+            for name, (seconds, queries) in self.phases.items()
+        )
@@ -0,0 +1,166 @@
+import re
+from .exceptions import DataTablesError
+
+# Matches columns[0][data], columns[0][search][value], order[0][dir], ...
+PARAMETER_PATTERN = re.compile(r"(columns|order)\[(\d+)\]\[(\w+)\](?:\[(\w+)\])?")
+
+
+class ColumnRequest(object):
+    """A column sent by DataTables as columns[index][...]."""
+
+    __slots__ = (
+        "index",
+        "data",
+        "name",
+        "searchable",
+        "orderable",
+        "search_value",
+        "search_regex",
+    )
+
+    def __init__(self, index: int):
+        self.index = index
+        self.data = index
+        self.name = ""
+        self.searchable = True
+        self.orderable = True
+        self.search_value = ""
+        self.search_regex = False
+
+
+class OrderRequest(object):
+    """An ordering sent by DataTables as order[index][...]."""
+
+    __slots__ = ("column", "descending")
+
+    def __init__(self):
+        self.column = None
+        self.descending = False
+
+
+class DataTablesRequest(object):
+    """
+    The parameters of a DataTables server-side processing request.
+    Read directly from the request's QueryDict.
+    """
+
+    __slots__ = (
+        "draw",
+        "start",
+        "length",
+        "search_value",
+        "search_regex",
+        "columns",
+        "order",
+    )
+
+    def __init__(self):
+        self.draw = None
+        # Defaults for when the endpoint is used directly without get variables
+        self.start = 0
+        self.length = 10
+        self.search_value = ""
+        self.search_regex = False
+        # Column requests keyed by their index
+        self.columns: dict[int, ColumnRequest] = {}
+        self.order: list[OrderRequest] = []
+
+    @classmethod
+    def from_query(cls, query) -> "DataTablesRequest":
+        datatables_request = cls()
+        columns = datatables_request.columns
+        order = {}
+
+        for key, value in query.items():
+            if key == "draw":
+                datatables_request.draw = value
+            elif key == "start":
+                datatables_request.start = cls.parse_int(key, value)
+            elif key == "length":
+                datatables_request.length = cls.parse_int(key, value)
+            elif key == "search[value]":
+                datatables_request.search_value = value
+            elif key == "search[regex]":
+                datatables_request.search_regex = value == "true"
+            else:
+                match = PARAMETER_PATTERN.fullmatch(key)
+                if match is None:
+                    continue
+                group, index, attribute, sub_attribute = match.groups()
+                index = int(index)
+                if group == "columns":
+                    column = columns.get(index)
+                    if column is None:
+                        column = columns[index] = ColumnRequest(index)
+                    cls.set_column_attribute(column, attribute, sub_attribute, value)
+                else:
+                    order_request = order.get(index)
+                    if order_request is None:
+                        order_request = order[index] = OrderRequest()
+                    if attribute == "column":
+                        order_request.column = cls.parse_int(key, value)
+                    elif attribute == "dir":
+                        order_request.descending = value == "desc"
+
+        datatables_request.order = [
+            order[index] for index in sorted(order) if order[index].column is not None
+        ]
+        return datatables_request
+
+    @staticmethod
+    def set_column_attribute(column, attribute, sub_attribute, value) -> None:
+        if attribute == "search":
+            if sub_attribute == "value":
+                column.search_value = value
+            elif sub_attribute == "regex":
+                column.search_regex = value == "true"
+        elif attribute == "data":
+            column.data = value
+        elif attribute == "name":
+            column.name = value
+        elif attribute == "searchable":
+            column.searchable = value != "false"
+        elif attribute == "orderable":
+            column.orderable = value != "false"
+
+    @staticmethod
+    def parse_int(key: str, value: str) -> int:
+        try:
+            return int(value)
+        except ValueError:
+            raise DataTablesError(f"Invalid value for {key}.")
+
+    def to_dict(self) -> dict:
+        """
+        Returns the request as the nested dictionary
+        previously produced by querystring_parser.
+        """
+        return {
+            "draw": self.draw,
+            "start": str(self.start),
+            "length": str(self.length),
+            "search": {
+                "value": self.search_value,
+                "regex": "true" if self.search_regex else "false",
+            },
+            "columns": {
+                index: {
+                    "data": column.data,
+                    "name": column.name,
+                    "searchable": "true" if column.searchable else "false",
+                    "orderable": "true" if column.orderable else "false",
+                    "search": {
+                        "value": column.search_value,
+                        "regex": "true" if column.search_regex else "false",
+                    },
+                }
+                for index, column in self.columns.items()
+            },
+            "order": {
+                index: {
+                    "column": str(order_request.column),
+                    "dir": "desc" if order_request.descending else "asc",
+                }
+                for index, order_request in enumerate(self.order)
+            },
+        }
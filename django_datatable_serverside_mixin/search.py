@@ -0,0 +1,93 @@
+import operator
+from functools import reduce
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# A filter which matches no rows without querying the database
+NO_MATCH = Q(pk__in=[])
+
+
+class SearchBackend(object):
+    """
+    Builds the filter for the global search box.
+    The default implementation ORs the global lookup of every searchable
+    column (icontains or iregex unless the Column says otherwise).
+    """
+
+    def get_filter(self, columns, value: str, regex: bool = False) -> Q | None:
+        if not value:
+            return None
+        filter_list = []
+        for column in columns:
+            q_filter = column.get_filter(value, regex, global_search=True)
+            if q_filter is not None:
+                filter_list.append(q_filter)
+        if filter_list:
+            return reduce(operator.or_, filter_list)
+        # The value cannot match any of the columns
+        if columns:
+            return NO_MATCH
+
+
+class PostgresFullTextSearch(SearchBackend):
+    """
+    Routes the global search to a precomputed tsvector column
+    (django.contrib.postgres.search.SearchVectorField) with a SearchQuery.
+    Regex searches fall back to the default lookups.
+    """
+
+    def __init__(
+        self,
+        vector_field: str = "search_vector",
+        config: str | None = None,
+        search_type: str = "websearch",
+    ):
+        self.vector_field = vector_field
+        self.config = config
+        self.search_type = search_type
+
+    def get_filter(self, columns, value: str, regex: bool = False) -> Q | None:
+        if regex:
+            return super().get_filter(columns, value, regex)
+        if not value or not columns:
+            return None
+
+        from django.contrib.postgres.search import SearchQuery
+
+        return Q(
+            **{
+                self.vector_field: SearchQuery(
+                    value, config=self.config, search_type=self.search_type
+                )
+            }
+        )
+
+
+class SQLiteFTS5Search(SearchBackend):
+    """
+    Routes the global search to an SQLite FTS5 table whose rowid is the primary
+    key of the searched model. Every search term is matched as a prefix.
+    Regex searches fall back to the default lookups.
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+
+    def get_filter(self, columns, value: str, regex: bool = False) -> Q | None:
+        if regex:
+            return super().get_filter(columns, value, regex)
+        query = self.get_match_query(value)
+        if not query or not columns:
+            return None
+        return Q(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM "{self.table}" WHERE "{self.table}" MATCH %s',
+                [query],
+            )
+        )
+
+    @staticmethod
+    def get_match_query(value: str) -> str:
+        # Quote each term so user input cannot use the FTS5 query syntax
+        terms = value.split()
+        return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
@@ -1,8 +1,31 @@
+import inspect
+from asgiref.sync import sync_to_async
 from django.views import View
-from django.http import JsonResponse
-from django.core.exceptions import ImproperlyConfigured
+from functools import partial
+from django.http import (
+    HttpResponse,
+    HttpResponseNotModified,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.core.exceptions import EmptyResultSet, ImproperlyConfigured
 from django.db.models import QuerySet
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from . import datatable
+from .cache import (
+    CountCache,
+    CursorCache,
+    ResponseCache,
+    get_request_parameters,
+    make_key,
+)
+from .coalescing import DrawTracker, single_flight
+from .columns import compile_columns
+from .encoders import Encoder, get_encoder
+from .exceptions import SupersededDraw
+from .limits import query_timeout
+from .profiling import NO_PHASE, Profile, request_profiled
 from warnings import warn
 from deprecated import deprecated
 
@@ -11,17 +34,400 @@ class ServerSideDataTablesMixin(View):
     columns = None
     queryset = None
     model = None
+    count_strategy = None
+    cache_counts = False
+    count_cache_alias = "default"
+    count_cache_timeout = 60
+    count_cache_invalidate = True
+    keyset_pagination = False
+    keyset_cache_alias = "default"
+    keyset_cache_timeout = 300
+    ordering_tiebreaker = "pk"
+    indexed_orderings = None
+    unindexed_ordering = "truncate"
+    search_backend = None
+    deferred_join = False
+    stream_all_rows = False
+    stream_chunk_size = 2000
+    data_callback_batch_size = None
+    json_encoder = None
+    array_rows = False
+    send_declared_columns_only = False
+    cache_responses = False
+    response_cache_alias = "default"
+    response_cache_timeout = 30
+    response_cache_max_size = 1000000
+    response_cache_invalidate = True
+    last_modified_field = None
+    parallel_queries = False
+    query_aliases = None
+    coalesce_requests = False
+    skip_superseded_draws = False
+    draw_tracker_alias = "default"
+    draw_tracker_timeout = 10
+    draw_tracker_header = "X-DataTables-Table"
+    statement_timeout = None
+    max_search_length = None
+    max_regex_length = None
+    max_regex_complexity = None
+    profile_requests = False
+    server_timing_header = False
+    profile_in_response = False
+    # Profile of the request being served, set by get()
+    profile = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Compiles the column specification once per view class."""
+        super().__init_subclass__(**kwargs)
+        if cls.columns is not None:
+            model = cls.model or getattr(cls.queryset, "model", None)
+            compile_columns(cls.columns, model)
 
     def get(self, request, *args, **kwargs):
-        DataTablesServer = datatable.DataTablesServer(
-            request,
-            self.columns,
-            self.get_queryset(),
+        self.profile = self.get_profile()
+        if self.profile is None:
+            return self.get_datatables_response(request)
+        with self.profile.phase("total"), self.profile.count_queries():
+            response = self.get_datatables_response(request)
+        self.report_profile(request, response, self.profile)
+        return response
+
+    def get_datatables_response(self, request):
+        # Makes the requests this client sent before obsolete
+        self.track_draw(request)
+
+        queryset = self.get_queryset()
+        encoder = self.get_json_encoder()
+
+        # Identical requests are answered from the cache without any query
+        cache_key, response = self.get_response_from_cache(request, queryset, encoder)
+        if response is not None:
+            return response
+
+        try:
+            if self.coalesce_requests and not self.is_streamed(request):
+                result, etag, last_modified = self.get_coalesced_result(
+                    request, queryset
+                )
+            else:
+                result, etag, last_modified = self.get_result(request, queryset)
+        except (SupersededDraw, datatable.DataTablesError) as e:
+            return self.get_failed_response(request, e)
+
+        if result is None:
+            response = HttpResponseNotModified()
+        elif isinstance(result, StreamingHttpResponse):
+            response = result
+        else:
+            if self.profile_in_response and self.profile is not None:
+                # Encoding is not included, it has not happened yet
+                result = {**result, "profile": self.profile.as_dict()}
+                cache_key = None
+            return self.get_result_response(
+                result, encoder, cache_key, etag, last_modified
+            )
+        return self.set_validator_headers(response, etag, last_modified)
+
+    def get_response_from_cache(self, request, queryset, encoder: Encoder) -> tuple:
+        """
+        Returns (cache_key, response). response answers the request from the
+        response cache and is None on a miss. cache_key is None when the
+        response cache is disabled or the request cannot be cached.
+        """
+        response_cache = self.get_response_cache()
+        if response_cache is None:
+            return None, None
+        with self.phase("response_cache"):
+            cache_key = response_cache.get_key(
+                request.GET, queryset, self.get_response_cache_vary(request)
+            )
+            if cache_key is None:
+                return None, None
+            cached = response_cache.get(
+                cache_key, encoder.encode(request.GET.get("draw"))
+            )
+        if cached is None:
+            return cache_key, None
+        return cache_key, self.get_cached_response(request, cached, encoder)
+
+    def get_result_response(
+        self, result: dict, encoder: Encoder, cache_key, etag, last_modified
+    ):
+        """
+        Encodes the result, stores the body in the response cache when
+        cache_key is set and adds the validator headers.
+        """
+        with self.phase("encode"):
+            response = encoder.get_response(result)
+        if cache_key is not None:
+            self.get_response_cache().set(
+                cache_key,
+                response.content,
+                encoder.encode(result["draw"]),
+                etag,
+                last_modified,
+            )
+        return self.set_validator_headers(response, etag, last_modified)
+
+    def get_failed_response(self, request, error: Exception) -> JsonResponse:
+        """Returns the response for a superseded draw or a DataTablesError."""
+        if isinstance(error, SupersededDraw):
+            return self.get_superseded_response(request)
+        return self.get_error_response(request, str(error))
+
+    def get_cached_response(self, request, cached: tuple, encoder: Encoder):
+        """
+        Returns the response for a (body, etag, last_modified) tuple from the
+        response cache, or 304 Not Modified when the client's copy matches.
+        """
+        content, etag, last_modified = cached
+        response = None
+        if etag is not None:
+            response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=encoder.content_type)
+        return self.set_validator_headers(response, etag, last_modified)
+
+    def get_result(self, request, queryset) -> tuple:
+        """
+        Runs the queries of a request and returns (result, etag, last_modified).
+        result is None when the client's copy is still valid (304 Not Modified)
+        and a StreamingHttpResponse for streamed exports.
+        """
+        # Queries running longer than statement_timeout return an error
+        with query_timeout(getattr(queryset, "db", None), self.statement_timeout):
+            DataTablesServer = self.get_datatables_server_class()(
+                request,
+                self.columns,
+                queryset,
+                **self.get_datatables_server_kwargs(),
+            )
+
+            # Answer 304 Not Modified before ordering and fetching the page
+            with self.phase("validator"):
+                validator = self.get_validator(DataTablesServer)
+            etag, last_modified, not_modified = self.check_validator(
+                request, DataTablesServer, validator
+            )
+            if not_modified:
+                return None, etag, last_modified
+
+            if self.stream_all_rows and DataTablesServer.length == -1:
+                DataTablesServer.prepare_queryset()
+                return (
+                    self.get_streaming_response(DataTablesServer),
+                    etag,
+                    last_modified,
+                )
+
+            result = DataTablesServer.get_output_result()
+            with self.phase("callback"):
+                result["data"] = self.process_data(result["data"])
+            return result, etag, last_modified
+
+    def get_coalesced_result(self, request, queryset) -> tuple:
+        """
+        Returns get_result, sharing it with identical requests which are
+        served at the same time by this process.
+        """
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return self.get_result(request, queryset)
+        key = make_key(
+            "flight",
+            self.get_response_cache_vary(request),
+            sql,
+            get_request_parameters(request.GET),
+            request.META.get("HTTP_IF_NONE_MATCH"),
+        )
+        try:
+            result, etag, last_modified = single_flight.do(
+                key, partial(self.get_result, request, queryset)
+            )
+        except SupersededDraw:
+            # The draw of the request that ran the queries was superseded,
+            # which does not mean that this one was
+            result, etag, last_modified = self.get_result(request, queryset)
+        if result is not None:
+            # Shared with the other requests, which have their own draw
+            result = {**result, "draw": request.GET.get("draw")}
+        return result, etag, last_modified
+
+    def is_streamed(self, request) -> bool:
+        return self.stream_all_rows and request.GET.get("length") == "-1"
+
+    def get_client_key(self, request):
+        """
+        Returns the value identifying the client whose draws are tracked by
+        skip_superseded_draws: the session key, else the user's primary key,
+        else None.
+        """
+        session = getattr(request, "session", None)
+        if session is not None and session.session_key:
+            return f"session:{session.session_key}"
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return None
+
+    def get_draw_tracker(self) -> DrawTracker | None:
+        """
+        Returns the DrawTracker used to skip superseded draws
+        or None when skip_superseded_draws is False.
+        """
+        if not self.skip_superseded_draws:
+            return None
+        return DrawTracker(
+            alias=self.draw_tracker_alias, timeout=self.draw_tracker_timeout
         )
-        result = DataTablesServer.get_output_result()
-        result["data"] = self.data_callback(result["data"])
 
-        return JsonResponse(result, safe=False)
+    def get_table_id(self, request) -> str | None:
+        """
+        Returns the id of the DataTables instance which sent the request, read
+        from the draw_tracker_header header. Each instance counts its own
+        draws, so the id must differ between tables and browser tabs.
+        """
+        return request.headers.get(self.draw_tracker_header) or None
+
+    def get_draw_key(self, request) -> tuple | None:
+        """
+        Returns the tracked (table key, draw) of a request, or None for
+        requests without a table id.
+        """
+        table_id = self.get_table_id(request)
+        if table_id is None:
+            return None
+        try:
+            draw = int(request.GET.get("draw"))
+        except (TypeError, ValueError):
+            return None
+        cls = self.__class__
+        client_key = self.get_client_key(request)
+        return (
+            cls.__module__,
+            cls.__qualname__,
+            request.path,
+            client_key,
+            table_id,
+        ), draw
+
+    def track_draw(self, request) -> None:
+        draw_tracker = self.get_draw_tracker()
+        if draw_tracker is None:
+            return
+        draw_key = self.get_draw_key(request)
+        if draw_key is not None:
+            draw_tracker.arrive(*draw_key)
+
+    def get_superseded_check(self):
+        """
+        Returns a callable which DataTablesServer calls between queries to
+        find out whether the client sent a later draw, or None.
+        """
+        draw_tracker = self.get_draw_tracker()
+        if draw_tracker is None:
+            return None
+        draw_key = self.get_draw_key(self.request)
+        if draw_key is None:
+            return None
+        return partial(draw_tracker.is_superseded, *draw_key)
+
+    def get_superseded_response(self, request) -> JsonResponse:
+        """
+        Returns an empty response for a superseded draw.
+        DataTables discards it because a later draw has already been sent.
+        """
+        return JsonResponse(
+            {
+                "draw": request.GET.get("draw"),
+                "recordsTotal": 0,
+                "recordsFiltered": 0,
+                "data": [],
+            }
+        )
+
+    def get_streaming_response(self, DataTablesServer) -> StreamingHttpResponse:
+        """
+        Returns every row as a StreamingHttpResponse. Rows are read, passed to
+        data_callback and encoded one chunk of stream_chunk_size rows at a time.
+        """
+        encoder = self.get_json_encoder()
+        return StreamingHttpResponse(
+            self.stream_result(
+                DataTablesServer.get_output_metadata(),
+                self.iter_with_timeout(
+                    DataTablesServer.iter_db_data(self.stream_chunk_size),
+                    DataTablesServer.queryset.db,
+                ),
+                encoder,
+            ),
+            content_type=encoder.content_type,
+        )
+
+    def iter_with_timeout(self, chunks, using: str):
+        """
+        Yields the chunks of a streamed response, limiting the queries which
+        read them to statement_timeout. The rows are read after get_result
+        returned, so its limit no longer applies.
+        """
+        with query_timeout(using, self.statement_timeout):
+            yield from chunks
+
+    def stream_result(self, metadata: dict, chunks, encoder: Encoder = None):
+        # Produces the same bytes as encoding the whole result at once
+        encoder = encoder or self.get_json_encoder()
+        yield encoder.encode({**metadata, "data": []})[:-2]
+        separator = b""
+        for batch in self.iter_processed_batches(chunks):
+            if batch:
+                yield separator + encoder.encode(batch)[1:-1]
+                separator = encoder.item_separator
+        yield b"]}"
+
+    def process_data(self, data: list[dict]) -> list[dict]:
+        """
+        Applies data_callback and row_callback to the rows of a page.
+        """
+        if self.data_callback_batch_size is None and not self.has_row_callback():
+            return self.data_callback(data)
+        processed = []
+        for batch in self.iter_processed_batches([data]):
+            processed.extend(batch)
+        return processed
+
+    def iter_processed_batches(self, chunks):
+        """
+        Splits chunks of rows into batches of data_callback_batch_size rows
+        (the whole chunk when None), then yields each batch after passing it
+        to data_callback and every row to row_callback.
+        """
+        has_row_callback = self.has_row_callback()
+        for chunk in chunks:
+            batch_size = self.data_callback_batch_size or len(chunk) or 1
+            for start in range(0, len(chunk), batch_size):
+                batch = self.data_callback(chunk[start : start + batch_size])
+                if has_row_callback:
+                    batch = [self.row_callback(row) for row in batch]
+                yield batch
+
+    def has_row_callback(self) -> bool:
+        return type(self).row_callback is not ServerSideDataTablesMixin.row_callback
+
+    def get_error_response(self, request, message: str) -> JsonResponse:
+        """
+        Returns a response which DataTables displays as an error
+        instead of failing with a server error.
+        """
+        return JsonResponse(
+            {
+                "draw": request.GET.get("draw"),
+                "recordsTotal": 0,
+                "recordsFiltered": 0,
+                "data": [],
+                "error": message,
+            }
+        )
 
     def data_callback(self, data: list[dict]) -> list[dict]:
         """
@@ -29,9 +435,206 @@ class ServerSideDataTablesMixin(View):
         Can be used to manipulate the final data rows.
         Useful for adding additional fields or adding formatting
         to the already filtered and sorted data.
+        Receives batches of data_callback_batch_size rows when it is set.
         """
         return data
 
+    def row_callback(self, row: dict) -> dict:
+        """
+        Called on every row after data_callback. Only used when overridden.
+        """
+        return row
+
+    def get_profile(self) -> Profile | None:
+        """
+        Returns a Profile recording the phases of the request when
+        profile_requests, server_timing_header or profile_in_response is set.
+        """
+        if (
+            self.profile_requests
+            or self.server_timing_header
+            or self.profile_in_response
+        ):
+            return Profile()
+        return None
+
+    def phase(self, name: str):
+        """Records the enclosed code as a phase of the profile, if any."""
+        if self.profile is None:
+            return NO_PHASE
+        return self.profile.phase(name)
+
+    def report_profile(self, request, response, profile: Profile) -> None:
+        """
+        Called with the profile of each profiled request. Sets the
+        Server-Timing header when server_timing_header is True and sends
+        the request_profiled signal.
+        """
+        if self.server_timing_header:
+            response["Server-Timing"] = profile.get_server_timing()
+        request_profiled.send(
+            sender=self.__class__,
+            view=self,
+            request=request,
+            response=response,
+            profile=profile,
+        )
+
+    def get_json_encoder(self) -> Encoder:
+        """
+        Returns the Encoder used to render the response.
+        Can be None (django), "django", "orjson", "auto" (orjson when
+        installed), an Encoder instance or a callable returning bytes.
+        """
+        return get_encoder(self.json_encoder)
+
+    def get_datatables_server_class(self):
+        """
+        Returns ParallelDataTablesServer when parallel_queries is True,
+        otherwise DataTablesServer.
+        """
+        if self.parallel_queries:
+            return datatable.ParallelDataTablesServer
+        return datatable.DataTablesServer
+
+    def get_datatables_server_kwargs(self) -> dict:
+        """
+        Returns the keyword arguments used to instantiate DataTablesServer.
+        """
+        kwargs = {
+            "count_strategy": self.get_count_strategy(),
+            "count_cache": self.get_count_cache(),
+            "cursor_cache": self.get_cursor_cache(),
+            "ordering_tiebreaker": self.ordering_tiebreaker,
+            "indexed_orderings": self.indexed_orderings,
+            "unindexed_ordering": self.unindexed_ordering,
+            "search_backend": self.search_backend,
+            "deferred_join": self.deferred_join,
+            "array_rows": self.array_rows,
+            "declared_columns_only": self.send_declared_columns_only,
+            "is_superseded": self.get_superseded_check(),
+            "max_search_length": self.max_search_length,
+            "max_regex_length": self.max_regex_length,
+            "max_regex_complexity": self.max_regex_complexity,
+            "profile": self.profile,
+        }
+        if self.parallel_queries:
+            kwargs["query_aliases"] = self.query_aliases
+            kwargs["statement_timeout"] = self.statement_timeout
+        return kwargs
+
+    def get_count_strategy(self):
+        """
+        Returns the strategy used to compute recordsTotal.
+        Can be None (exact), "exact", "capped", "estimate",
+        a CountStrategy instance or a callable accepting the queryset.
+        """
+        return self.count_strategy
+
+    def get_count_cache(self) -> CountCache | None:
+        """
+        Returns the CountCache used to store recordsTotal and recordsFiltered
+        or None when cache_counts is False.
+        """
+        if not self.cache_counts:
+            return None
+        return CountCache(
+            alias=self.count_cache_alias,
+            timeout=self.count_cache_timeout,
+            invalidate=self.count_cache_invalidate,
+        )
+
+    def get_cursor_cache(self) -> CursorCache | None:
+        """
+        Returns the CursorCache used for keyset pagination
+        or None when keyset_pagination is False.
+        """
+        if not self.keyset_pagination:
+            return None
+        return CursorCache(
+            alias=self.keyset_cache_alias, timeout=self.keyset_cache_timeout
+        )
+
+    def get_validator(self, DataTablesServer) -> tuple | None:
+        """
+        Returns a (version, last_modified) tuple identifying the current state
+        of the filtered rows, or None to disable conditional requests.
+        version can be any value with a stable str(), last_modified is a
+        datetime or None. When last_modified_field is set the latest value of
+        that field and the number of filtered rows are read in one query.
+        """
+        if self.last_modified_field is None:
+            return None
+        last_modified, count = DataTablesServer.get_last_modified(
+            self.last_modified_field
+        )
+        return (last_modified, count), last_modified
+
+    def get_etag(self, request, DataTablesServer, version) -> str:
+        """
+        Returns a weak ETag for the response. Responses only differ by draw
+        when the request parameters, the user, recordsTotal and the version of
+        the filtered rows are the same.
+        """
+        key = make_key(
+            "etag",
+            self.get_response_cache_vary(request),
+            get_request_parameters(request.GET),
+            DataTablesServer.total_records,
+            version,
+        )
+        return f'W/"{key.rsplit(":", 1)[-1]}"'
+
+    def check_validator(self, request, DataTablesServer, validator) -> tuple:
+        """
+        Returns (etag, last_modified, not_modified) for the result of
+        get_validator. not_modified is True when the request's If-None-Match
+        header matches the ETag.
+        """
+        if validator is None:
+            return None, None, False
+        version, last_modified = validator
+        etag = self.get_etag(request, DataTablesServer, version)
+        not_modified = get_conditional_response(request, etag=etag) is not None
+        return etag, last_modified, not_modified
+
+    def set_validator_headers(self, response, etag, last_modified):
+        """
+        Adds the ETag and Last-Modified headers and makes clients revalidate
+        the response on every request.
+        """
+        if etag is None:
+            return response
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_response_cache(self) -> ResponseCache | None:
+        """
+        Returns the ResponseCache used to store whole responses
+        or None when cache_responses is False.
+        """
+        if not self.cache_responses:
+            return None
+        return ResponseCache(
+            alias=self.response_cache_alias,
+            timeout=self.response_cache_timeout,
+            max_size=self.response_cache_max_size,
+            invalidate=self.response_cache_invalidate,
+        )
+
+    def get_response_cache_vary(self, request) -> tuple:
+        """
+        Returns the values which cached responses are stored per, besides the
+        request parameters and the queryset. Defaults to the view class and the
+        user, override to share responses between users.
+        """
+        user = getattr(request, "user", None)
+        user_key = user.pk if user is not None and user.is_authenticated else None
+        return (self.__class__.__module__, self.__class__.__qualname__, user_key)
+
     def get_queryset(self):
         """
         Returns the `QuerySet`.
@@ -51,6 +654,122 @@ class ServerSideDataTablesMixin(View):
         )
 
 
+class AsyncServerSideDataTablesMixin(ServerSideDataTablesMixin):
+    """
+    ServerSideDataTablesMixin for async views. The counts and the page are
+    read with Django's async ORM and run with asyncio.gather. data_callback,
+    row_callback and get_validator can be defined with async def, sync
+    versions run in a thread.
+    stream_all_rows, parallel_queries, coalesce_requests, statement_timeout
+    and profiling are not supported.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        if (
+            self.stream_all_rows
+            or self.parallel_queries
+            or self.coalesce_requests
+            or self.statement_timeout is not None
+            or self.get_profile() is not None
+        ):
+            raise ImproperlyConfigured(
+                f"{self.__class__.__name__} does not support stream_all_rows, "
+                "parallel_queries, coalesce_requests, statement_timeout or profiling."
+            )
+        # Makes the requests this client sent before obsolete
+        await sync_to_async(self.track_draw)(request)
+
+        # Overrides may filter on request.user, which may query the session
+        queryset = await sync_to_async(self.get_queryset)()
+        encoder = self.get_json_encoder()
+
+        # Identical requests are answered from the cache without any query,
+        # reading request.user and the cache with the sync API
+        cache_key, response = await sync_to_async(self.get_response_from_cache)(
+            request, queryset, encoder
+        )
+        if response is not None:
+            return response
+
+        # Reads the session and the cache with the sync API
+        server_kwargs = await sync_to_async(self.get_datatables_server_kwargs)()
+        is_superseded = server_kwargs.pop("is_superseded")
+        try:
+            if is_superseded is not None and await sync_to_async(is_superseded)():
+                raise SupersededDraw
+            DataTablesServer = datatable.AsyncDataTablesServer(
+                request, self.columns, queryset, **server_kwargs
+            )
+            DataTablesServer.is_superseded = is_superseded
+
+            # Answer 304 Not Modified before ordering and fetching the page
+            validator = await call_callback(self.get_validator, DataTablesServer)
+            if validator is not None:
+                # The ETag includes the total count
+                await DataTablesServer.acount_total()
+            etag, last_modified, not_modified = await sync_to_async(
+                self.check_validator
+            )(request, DataTablesServer, validator)
+            if not_modified:
+                return self.set_validator_headers(
+                    HttpResponseNotModified(), etag, last_modified
+                )
+
+            result = await DataTablesServer.aget_output_result()
+        except (SupersededDraw, datatable.DataTablesError) as e:
+            return self.get_failed_response(request, e)
+        result["data"] = await self.process_data(result["data"])
+
+        # Encodes the body and writes the cache with the sync API
+        return await sync_to_async(self.get_result_response)(
+            result, encoder, cache_key, etag, last_modified
+        )
+
+    async def process_data(self, data: list[dict]) -> list[dict]:
+        """
+        Applies data_callback and row_callback to the rows of a page.
+        """
+        has_row_callback = self.has_row_callback()
+        if self.data_callback_batch_size is None and not has_row_callback:
+            return await call_callback(self.data_callback, data)
+
+        batch_size = self.data_callback_batch_size or len(data) or 1
+        processed = []
+        for start in range(0, len(data), batch_size):
+            batch = await call_callback(
+                self.data_callback, data[start : start + batch_size]
+            )
+            if has_row_callback:
+                batch = await self.apply_row_callback(batch)
+            processed.extend(batch)
+        return processed
+
+    async def apply_row_callback(self, batch: list[dict]) -> list[dict]:
+        """Applies row_callback to a batch, sync callbacks in one thread call."""
+        if inspect.iscoroutinefunction(self.row_callback):
+            return [await self.row_callback(row) for row in batch]
+        return await sync_to_async(lambda: [self.row_callback(row) for row in batch])()
+
+    async def get_validator(self, DataTablesServer) -> tuple | None:
+        """Async version of ServerSideDataTablesMixin.get_validator."""
+        if self.last_modified_field is None:
+            return None
+        last_modified, count = await DataTablesServer.aget_last_modified(
+            self.last_modified_field
+        )
+        return (last_modified, count), last_modified
+
+
+async def call_callback(callback, *args):
+    """
+    Awaits callbacks defined with async def. Other callbacks run in a thread
+    with sync_to_async so they can use the ORM without blocking the event loop.
+    """
+    if inspect.iscoroutinefunction(callback):
+        return await callback(*args)
+    return await sync_to_async(callback)(*args)
+
+
 class ServerSideDatatableMixin(ServerSideDataTablesMixin):
     def __init_subclass__(cls, **kwargs):
         """This throws a deprecation warning on subclassing."""
@@ -13,8 +13,8 @@ setuptools.setup(
     license="MIT",
     author="Matt Henry",
     author_email="matthttam@gmail.com",
-    install_requires=["Django>=3.0", "querystring-parser>=1.2.4"],
-    packages=setuptools.find_packages(),
+    install_requires=["Django>=4.1"],
+    packages=setuptools.find_packages(exclude=["tests*", "benchmarks*"]),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,27 @@
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+            },
+            # Shared between threads for the parallel query tests
+            "parallel": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": "file:parallel?mode=memory&cache=shared",
+                "OPTIONS": {"uri": True},
+            },
+        },
+        INSTALLED_APPS=["tests.testapp"],
+        DEFAULT_AUTO_FIELD="django.db.models.AutoField",
+        USE_TZ=True,
+    )
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    call_command("migrate", run_syncdb=True, verbosity=0, database="parallel")
@@ -1,7 +1,10 @@
 from unittest.mock import MagicMock, patch
+from django.core.cache import cache
 from django.db.models import Model, QuerySet
 from django.http.request import HttpRequest
 
+from .testapp.models import Building, Person
+
 
 def get_mock_model(options: dict = {}):
     return MagicMock(autospec=Model, create=True, **options)
@@ -13,3 +16,68 @@ def get_mock_queryset(options: dict = {}):
 
 def get_mock_request(options: dict = {}):
     return MagicMock(autospec=HttpRequest, create=True, **options)
+
+
+def get_request_params(columns: list[str], options: dict = {}) -> dict:
+    """Build DataTables server-side GET parameters for the given columns."""
+    params = {"draw": "1", "start": "0", "length": "10"}
+    for i, column in enumerate(columns):
+        params.update(
+            {
+                f"columns[{i}][data]": column,
+                f"columns[{i}][name]": "",
+                f"columns[{i}][searchable]": "true",
+                f"columns[{i}][orderable]": "true",
+                f"columns[{i}][search][value]": "",
+                f"columns[{i}][search][regex]": "false",
+            }
+        )
+    params.update(
+        {
+            "order[0][column]": "0",
+            "order[0][dir]": "asc",
+            "search[value]": "",
+            "search[regex]": "false",
+        }
+    )
+    params.update(options)
+    return params
+
+
+def create_people(
+    count: int,
+    last_names: tuple[str, ...] = ("Jones", "Smith"),
+    buildings: tuple[str, ...] = ("North",),
+    first_name: str = "First{}",
+    internal_ids: range | None = None,
+    using: str = "default",
+) -> list[Person]:
+    """
+    Creates a building per name in buildings and count people named
+    first_name.format(i) which cycle through last_names and buildings.
+    internal_ids defaults to range(count).
+    """
+    buildings = Building.objects.using(using).bulk_create(
+        [Building(name=name) for name in buildings]
+    )
+    if internal_ids is None:
+        internal_ids = range(count)
+    return Person.objects.using(using).bulk_create(
+        [
+            Person(
+                first_name=first_name.format(i),
+                last_name=last_names[i % len(last_names)],
+                internal_id=internal_ids[i],
+                building=buildings[i % len(buildings)],
+            )
+            for i in range(count)
+        ]
+    )
+
+
+class ClearCacheMixin:
+    """Starts every test with an empty default cache."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
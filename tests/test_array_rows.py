@@ -0,0 +1,106 @@
+import json
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django_datatable_serverside_mixin.cache import CursorCache
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import ClearCacheMixin, create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name", "building__name"]
+positions = [str(i) for i in range(len(columns))]
+
+
+class ArrayView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+    array_rows = True
+
+
+class ArrayRowsTestCase(ClearCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(25, ("Smith", "Jones", "Brown"), ("North", "South"), "First{:02}")
+
+    def get_result(self, data: list[str], options: dict = {}, **kwargs):
+        request = RequestFactory().get("/", get_request_params(data, options))
+        datatable = DataTablesServer(request, columns, Person.objects.all(), **kwargs)
+        return datatable.get_output_result()
+
+    def assertSameAsDictRows(self, options: dict = {}, **kwargs):
+        arrays = self.get_result(positions, options, array_rows=True, **kwargs)
+        dicts = self.get_result(columns, options, **kwargs)
+        self.assertEqual(
+            arrays["data"],
+            [[row[column] for column in columns] for row in dicts["data"]],
+        )
+        self.assertEqual(arrays["recordsFiltered"], dicts["recordsFiltered"])
+        return arrays
+
+    def test_rows_are_arrays(self):
+        result = self.assertSameAsDictRows()
+        person = Person.objects.select_related("building").get(first_name="First00")
+        self.assertEqual(
+            result["data"][0],
+            [person.pk, "First00", "Smith", "North"],
+        )
+
+    def test_values_list_query(self):
+        request = RequestFactory().get("/", get_request_params(positions))
+        datatable = DataTablesServer(
+            request, columns, Person.objects.all(), array_rows=True
+        )
+        with CaptureQueriesContext(connection) as queries:
+            datatable.get_output_result()
+        self.assertEqual(len(queries), 1)
+
+    def test_search_and_order(self):
+        self.assertSameAsDictRows(
+            {
+                "search[value]": "South",
+                "columns[2][search][value]": "Jones",
+                "order[0][column]": "2",
+                "order[0][dir]": "desc",
+                "order[1][column]": "1",
+            }
+        )
+
+    def test_keyset_pagination(self):
+        options = {"order[0][column]": "2", "length": "5"}
+        cursor_cache = CursorCache()
+        self.get_result(positions, options, array_rows=True, cursor_cache=cursor_cache)
+        self.assertSameAsDictRows({**options, "start": "5"}, cursor_cache=cursor_cache)
+
+    def test_deferred_join(self):
+        self.assertSameAsDictRows(
+            {"order[0][column]": "3", "start": "5"}, deferred_join=True
+        )
+
+    def test_unrequested_relation_column_is_none(self):
+        result = self.get_result(
+            positions[:3], array_rows=True, declared_columns_only=True
+        )
+        self.assertEqual(len(result["data"][0]), len(columns))
+        self.assertIsNone(result["data"][0][3])
+
+    def test_view(self):
+        request = RequestFactory().get(
+            "/", get_request_params(positions, {"length": "-1"})
+        )
+        view = ArrayView()
+        view.setup(request)
+        result = json.loads(view.get(request).content)
+        self.assertEqual(len(result["data"]), 25)
+        self.assertEqual(result["data"][1][1:], ["First01", "Jones", "South"])
+
+    def test_streamed_view(self):
+        request = RequestFactory().get(
+            "/", get_request_params(positions, {"length": "-1"})
+        )
+        view = ArrayView(stream_all_rows=True, stream_chunk_size=10)
+        view.setup(request)
+        result = json.loads(b"".join(view.get(request).streaming_content))
+        self.assertEqual(len(result["data"]), 25)
+        self.assertEqual(result["data"][1][1:], ["First01", "Jones", "South"])
@@ -0,0 +1,184 @@
+import gc
+import json
+import warnings
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django_datatable_serverside_mixin.views import (
+    AsyncServerSideDataTablesMixin,
+    ServerSideDataTablesMixin,
+)
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Building, Person
+from .testapp.views import AsyncConditionalPersonView, AsyncPersonView
+
+columns = AsyncPersonView.columns
+
+
+class SyncPersonView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+
+
+class SyncCallbackPersonView(AsyncPersonView):
+    """Sync overrides which use the ORM."""
+
+    def get_queryset(self):
+        return Person.objects.filter(building__in=list(Building.objects.all()))
+
+    def data_callback(self, data):
+        buildings = {building.name: building.pk for building in Building.objects.all()}
+        for row in data:
+            row["building_id"] = buildings[row["building__name"]]
+        return data
+
+    def row_callback(self, row):
+        row["floors"] = Building.objects.get(pk=row["building_id"]).floor_count
+        return row
+
+    def get_validator(self, DataTablesServer):
+        return Person.objects.count(), None
+
+
+@override_settings(ROOT_URLCONF="tests.testapp.urls")
+class AsyncViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(10, buildings=("North", "South"))
+
+    async def get_json(self, url: str, options: dict = {}, **headers):
+        response = await self.async_client.get(
+            url, get_request_params(columns, options), **headers
+        )
+        return response, response.json()
+
+    async def test_get(self):
+        response, result = await self.get_json("/people/", {"draw": "3"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(result["draw"], "3")
+        self.assertEqual(result["recordsTotal"], 10)
+        self.assertEqual(result["recordsFiltered"], 10)
+        self.assertEqual(len(result["data"]), 10)
+        self.assertEqual(result["data"][1]["building__name"], "South")
+
+    async def test_search(self):
+        _, result = await self.get_json(
+            "/people/",
+            {"search[value]": "Smith", "order[0][column]": "1", "length": "2"},
+        )
+        self.assertEqual(result["recordsTotal"], 10)
+        self.assertEqual(result["recordsFiltered"], 5)
+        self.assertEqual(
+            [row["first_name"] for row in result["data"]], ["First1", "First3"]
+        )
+
+    async def test_same_result_as_sync_view(self):
+        options = {"search[value]": "South", "start": "2", "length": "2"}
+        _, result = await self.get_json("/people/", options)
+        request = AsyncRequestFactory().get("/", get_request_params(columns, options))
+        view = SyncPersonView()
+        view.setup(request)
+        response = await sync_to_async(view.get)(request)
+        self.assertEqual(result, json.loads(response.content))
+
+    async def test_async_callbacks(self):
+        _, result = await self.get_json("/people/callback/", {"length": "5"})
+        self.assertEqual(result["data"][4]["name"], "First4 Jones")
+        self.assertEqual(result["data"][4]["upper"], "FIRST4")
+
+    async def test_sync_callbacks_can_use_the_orm(self):
+        view = SyncCallbackPersonView(data_callback_batch_size=4)
+        request = AsyncRequestFactory().get("/", get_request_params(columns))
+        view.setup(request)
+        response = await view.get(request)
+        result = json.loads(response.content)
+        self.assertIn("ETag", response)
+        self.assertEqual(len(result["data"]), 10)
+        self.assertIn("building_id", result["data"][0])
+        self.assertIn("floors", result["data"][0])
+
+    async def test_array_rows_and_deferred_join(self):
+        options = {f"columns[{i}][data]": str(i) for i in range(len(columns))}
+        _, result = await self.get_json(
+            "/people/array/", {**options, "order[0][column]": "3", "length": "3"}
+        )
+        self.assertEqual(
+            [row[1:] for row in result["data"]],
+            [
+                ["First0", "Jones", "North"],
+                ["First2", "Jones", "North"],
+                ["First4", "Jones", "North"],
+            ],
+        )
+
+    async def test_error(self):
+        _, result = await self.get_json("/people/", {"start": "x"})
+        self.assertIn("error", result)
+
+    async def test_rejected_ordering(self):
+        view = AsyncPersonView(indexed_orderings=[], unindexed_ordering="reject")
+        request = AsyncRequestFactory().get(
+            "/", get_request_params(columns, {"search[value]": "Smith"})
+        )
+        view.setup(request)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            response = await view.get(request)
+            # Unawaited coroutines warn once they are collected
+            gc.collect()
+        self.assertIn("error", json.loads(response.content))
+        self.assertEqual([str(warning.message) for warning in caught], [])
+
+    async def test_not_modified(self):
+        response, _ = await self.get_json("/people/conditional/")
+        request = AsyncRequestFactory().get(
+            "/", get_request_params(columns, {"draw": "2"})
+        )
+        request.META["HTTP_IF_NONE_MATCH"] = response["ETag"]
+        view = AsyncConditionalPersonView()
+        view.setup(request)
+        response = await view.get(request)
+        self.assertEqual(response.status_code, 304)
+
+    async def test_cached_response_is_revalidated(self):
+        await sync_to_async(cache.clear)()
+        request = AsyncRequestFactory().get("/", get_request_params(columns))
+        view = AsyncConditionalPersonView(cache_responses=True)
+        view.setup(request)
+        etag = (await view.get(request))["ETag"]
+        request = AsyncRequestFactory().get(
+            "/", get_request_params(columns, {"draw": "2"})
+        )
+        request.META["HTTP_IF_NONE_MATCH"] = etag
+        view.setup(request)
+        response = await view.get(request)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    async def test_conditional_filtered_count(self):
+        response, result = await self.get_json(
+            "/people/conditional/", {"search[value]": "Smith"}
+        )
+        self.assertIn("ETag", response)
+        self.assertEqual(result["recordsTotal"], 10)
+        self.assertEqual(result["recordsFiltered"], 5)
+
+    async def test_stream_all_rows_is_not_supported(self):
+        view = AsyncPersonView(stream_all_rows=True)
+        request = AsyncRequestFactory().get("/")
+        view.setup(request)
+        with self.assertRaises(ImproperlyConfigured):
+            await view.get(request)
+
+    async def test_parallel_queries_are_not_supported(self):
+        view = AsyncPersonView(parallel_queries=True)
+        request = AsyncRequestFactory().get("/")
+        view.setup(request)
+        with self.assertRaises(ImproperlyConfigured):
+            await view.get(request)
+
+    def test_view_is_async(self):
+        self.assertTrue(AsyncPersonView.view_is_async)
+        self.assertTrue(issubclass(AsyncPersonView, AsyncServerSideDataTablesMixin))
@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django_datatable_serverside_mixin.cache import CountCache, get_model_version
+from django_datatable_serverside_mixin.counting import ExactCount, RecordCount
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+
+from .fixtures import ClearCacheMixin, create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name"]
+
+
+class CountCacheTestCase(ClearCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.building = create_people(20)[0].building
+
+    def get_server(self, options: dict = {}, **kwargs) -> DataTablesServer:
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        return DataTablesServer(
+            request,
+            columns,
+            Person.objects.all(),
+            count_cache=CountCache(),
+            **kwargs,
+        )
+
+    def test_count_is_cached(self):
+        count_cache = CountCache()
+        with self.assertNumQueries(1):
+            first = count_cache.count(Person.objects.all(), ExactCount())
+            second = count_cache.count(Person.objects.all(), ExactCount())
+        self.assertEqual(first, RecordCount(20, True))
+        self.assertEqual(second, first)
+
+    def test_key_depends_on_filter(self):
+        count_cache = CountCache()
+        with self.assertNumQueries(2):
+            smith = count_cache.count(
+                Person.objects.filter(last_name="Smith"), ExactCount()
+            )
+            everyone = count_cache.count(Person.objects.all(), ExactCount())
+        self.assertEqual(smith.value, 10)
+        self.assertEqual(everyone.value, 20)
+
+    def test_paging_costs_one_query(self):
+        with self.assertNumQueries(3):
+            self.get_server({"search[value]": "Smith"}).get_output_result()
+        with self.assertNumQueries(1):
+            result = self.get_server(
+                {"search[value]": "Smith", "start": "5"}
+            ).get_output_result()
+        self.assertEqual(result["recordsTotal"], 20)
+        self.assertEqual(result["recordsFiltered"], 10)
+        self.assertEqual(len(result["data"]), 5)
+
+    def test_invalidated_on_save(self):
+        count_cache = CountCache()
+        count_cache.count(Person.objects.all(), ExactCount())
+        version = get_model_version(cache, Person)
+        Person.objects.create(
+            first_name="New", last_name="Smith", internal_id=99, building=self.building
+        )
+        self.assertEqual(get_model_version(cache, Person), version + 1)
+        with self.assertNumQueries(1):
+            result = count_cache.count(Person.objects.all(), ExactCount())
+        self.assertEqual(result.value, 21)
+
+    def test_invalidated_on_delete(self):
+        count_cache = CountCache()
+        count_cache.count(Person.objects.all(), ExactCount())
+        Person.objects.first().delete()
+        self.assertEqual(
+            count_cache.count(Person.objects.all(), ExactCount()).value, 19
+        )
+
+    def test_no_invalidation(self):
+        count_cache = CountCache(invalidate=False)
+        count_cache.count(Person.objects.all(), ExactCount())
+        Person.objects.first().delete()
+        with self.assertNumQueries(0):
+            result = count_cache.count(Person.objects.all(), ExactCount())
+        self.assertEqual(result.value, 20)
+
+    def test_empty_result_set_is_not_cached(self):
+        with self.assertNumQueries(0):
+            result = CountCache().count(Person.objects.filter(pk__in=[]), ExactCount())
+        self.assertEqual(result.value, 0)
@@ -0,0 +1,103 @@
+import json
+from django.test import RequestFactory, TestCase
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Building, Person
+
+columns = ["id", "first_name", "building_id"]
+
+
+class BatchedView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+
+    def data_callback(self, data):
+        self.batch_sizes.append(len(data))
+        buildings = Building.objects.in_bulk({row["building_id"] for row in data})
+        for row in data:
+            row["building"] = buildings[row["building_id"]].name
+        return data
+
+
+class RowView(BatchedView):
+    def row_callback(self, row):
+        row["upper"] = row["first_name"].upper()
+        return row
+
+
+class CallbackTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(10, ("Smith",), ("North", "South"))
+
+    def get_result(self, view_class, options: dict = {}, **attributes):
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        view = view_class(**attributes)
+        view.batch_sizes = []
+        view.setup(request)
+        response = view.get(request)
+        if hasattr(response, "streaming_content"):
+            content = b"".join(response.streaming_content)
+        else:
+            content = response.content
+        return view, json.loads(content)
+
+    def test_whole_page_by_default(self):
+        view, result = self.get_result(BatchedView, {"length": "8"})
+        self.assertEqual(view.batch_sizes, [8])
+        self.assertEqual(result["data"][1]["building"], "South")
+
+    def test_batches(self):
+        view, result = self.get_result(
+            BatchedView, {"length": "8"}, data_callback_batch_size=3
+        )
+        self.assertEqual(view.batch_sizes, [3, 3, 2])
+        self.assertEqual(len(result["data"]), 8)
+        self.assertEqual(result["data"][7]["building"], "South")
+
+    def test_one_query_per_batch(self):
+        # Two counts, the page and one in_bulk per batch
+        with self.assertNumQueries(2 + 1 + 4):
+            self.get_result(
+                BatchedView,
+                {"length": "-1", "search[value]": "First"},
+                data_callback_batch_size=3,
+            )
+
+    def test_streamed_batches(self):
+        view, result = self.get_result(
+            BatchedView,
+            {"length": "-1"},
+            stream_all_rows=True,
+            stream_chunk_size=4,
+            data_callback_batch_size=3,
+        )
+        self.assertEqual(view.batch_sizes, [3, 1, 3, 1, 2])
+        self.assertEqual(len(result["data"]), 10)
+
+    def test_row_callback(self):
+        view, result = self.get_result(RowView, {"length": "4"})
+        self.assertEqual(view.batch_sizes, [4])
+        self.assertEqual(result["data"][0]["upper"], "FIRST0")
+        self.assertEqual(result["data"][0]["building"], "North")
+
+    def test_row_callback_is_skipped_when_not_overridden(self):
+        self.assertFalse(BatchedView().has_row_callback())
+        self.assertTrue(RowView().has_row_callback())
+
+    def test_empty_page(self):
+        view, result = self.get_result(
+            RowView, {"search[value]": "Nobody"}, data_callback_batch_size=3
+        )
+        self.assertEqual(result["data"], [])
+        self.assertEqual(view.batch_sizes, [])
+
+    def test_undeclared_columns_reach_callback(self):
+        request = RequestFactory().get("/", get_request_params(["first_name"]))
+        view = BatchedView()
+        view.batch_sizes = []
+        view.setup(request)
+        result = json.loads(view.get(request).content)
+        self.assertEqual(result["data"][0]["building"], "North")
+        self.assertIn("id", result["data"][0])
@@ -0,0 +1,218 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django_datatable_serverside_mixin.coalescing import DrawTracker, SingleFlight
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import ClearCacheMixin, create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name"]
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    def run_concurrently(self, single_flight, key, function, count: int = 3):
+        results = []
+
+        def call():
+            try:
+                results.append(single_flight.do(key, function))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        return threads, results
+
+    def test_concurrent_calls_share_the_result(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        threads, results = self.run_concurrently(single_flight, "key", function)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["result"] * 3)
+        self.assertEqual(single_flight.calls, {})
+
+    def test_exception_is_shared(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def function():
+            release.wait(5)
+            raise ValueError("failed")
+
+        threads, results = self.run_concurrently(single_flight, "key", function)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_sequential_calls_are_not_shared(self):
+        single_flight = SingleFlight()
+        self.assertEqual(single_flight.do("key", lambda: 1), 1)
+        self.assertEqual(single_flight.do("key", lambda: 2), 2)
+
+
+class DrawTrackerTestCase(ClearCacheMixin, SimpleTestCase):
+    def test_superseded(self):
+        tracker = DrawTracker()
+        tracker.arrive("client", 3)
+        self.assertFalse(tracker.is_superseded("client", 3))
+        tracker.arrive("client", 4)
+        self.assertTrue(tracker.is_superseded("client", 3))
+        self.assertFalse(tracker.is_superseded("other", 3))
+
+    def test_reloaded_page(self):
+        tracker = DrawTracker()
+        tracker.arrive("client", 9)
+        tracker.arrive("client", 1)
+        self.assertFalse(tracker.is_superseded("client", 1))
+
+
+class CoalescedView(ServerSideDataTablesMixin):
+    queryset = Person.objects.using("parallel")
+    columns = columns
+    coalesce_requests = True
+
+    def data_callback(self, data):
+        self.calls.append(self.request.GET["draw"])
+        self.release.wait(5)
+        return data
+
+
+class CoalescingTestCase(TransactionTestCase):
+    databases = {"parallel"}
+
+    def setUp(self):
+        create_people(5, ("Smith",), using="parallel")
+
+    def test_identical_requests_are_coalesced(self):
+        calls = []
+        release = threading.Event()
+        responses = {}
+
+        def get(draw: str, search: str = ""):
+            request = RequestFactory().get(
+                "/",
+                get_request_params(
+                    columns, {"draw": draw, "_": draw, "search[value]": search}
+                ),
+            )
+            view = CoalescedView()
+            view.calls = calls
+            view.release = release
+            view.setup(request)
+            responses[draw] = json.loads(view.get(request).content)
+
+        threads = [
+            threading.Thread(target=get, args=("1",)),
+            threading.Thread(target=get, args=("2",)),
+            threading.Thread(target=get, args=("3",)),
+            threading.Thread(target=get, args=("4", "First1")),
+        ]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(calls), ["1", "4"])
+        for draw in ("1", "2", "3"):
+            self.assertEqual(responses[draw]["draw"], draw)
+            self.assertEqual(len(responses[draw]["data"]), 5)
+        self.assertEqual(responses["4"]["recordsFiltered"], 1)
+
+
+class SupersededView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+    skip_superseded_draws = True
+
+    def get_count_strategy(self):
+        def count(queryset):
+            # Another draw of the same client arrives during the total count
+            draw_key = self.get_draw_key(self.request)
+            if self.newer_draw is not None and draw_key is not None:
+                self.get_draw_tracker().arrive(draw_key[0], self.newer_draw)
+            return queryset.count()
+
+        return count
+
+
+class SupersededDrawTestCase(ClearCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(5, ("Smith",))
+
+    def get_response(self, newer_draw=None, session_key="abc", table_id="table-1"):
+        headers = {}
+        if table_id is not None:
+            headers["HTTP_X_DATATABLES_TABLE"] = table_id
+        request = RequestFactory().get(
+            "/",
+            get_request_params(columns, {"draw": "2", "search[value]": "First"}),
+            **headers,
+        )
+        request.session = SimpleNamespace(session_key=session_key)
+        view = SupersededView()
+        view.newer_draw = newer_draw
+        view.setup(request)
+        with CaptureQueriesContext(connection) as queries:
+            response = view.get(request)
+        return json.loads(response.content), len(queries)
+
+    def test_superseded_draw_skips_queries(self):
+        result, queries = self.get_response(newer_draw=3)
+        self.assertEqual(queries, 1)
+        self.assertEqual(
+            result, {"draw": "2", "recordsTotal": 0, "recordsFiltered": 0, "data": []}
+        )
+
+    def test_latest_draw_is_served(self):
+        result, queries = self.get_response()
+        self.assertEqual(queries, 3)
+        self.assertEqual(result["recordsFiltered"], 5)
+
+    def test_older_draw_does_not_supersede(self):
+        result, _ = self.get_response(newer_draw=1)
+        self.assertEqual(len(result["data"]), 5)
+
+    def test_requests_without_table_id_are_not_tracked(self):
+        result, _ = self.get_response(newer_draw=3, table_id=None)
+        self.assertEqual(len(result["data"]), 5)
+
+    def test_clients_without_session_are_tracked_by_table_id(self):
+        result, queries = self.get_response(newer_draw=3, session_key=None)
+        self.assertEqual(queries, 1)
+        self.assertEqual(result["data"], [])
+
+    def test_tables_do_not_supersede_each_other(self):
+        # A later draw of another table in the same session
+        request = RequestFactory().get(
+            "/", {"draw": "9"}, HTTP_X_DATATABLES_TABLE="table-2"
+        )
+        request.session = SimpleNamespace(session_key="abc")
+        view = SupersededView()
+        view.setup(request)
+        view.track_draw(request)
+
+        result, queries = self.get_response()
+        self.assertEqual(queries, 3)
+        self.assertEqual(len(result["data"]), 5)
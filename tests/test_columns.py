@@ -0,0 +1,227 @@
+import datetime
+import unittest
+from unittest.mock import patch
+from parameterized import parameterized
+from django.db.models import Q
+from django_datatable_serverside_mixin.columns import (
+    Column,
+    compile_columns,
+    is_boolean,
+    is_integer,
+    is_number,
+    is_temporal,
+    is_uuid,
+    resolve_field,
+)
+from .testapp.models import Building, Person
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+
+class ColumnTestCase(unittest.TestCase):
+    def test_column(self):
+        column = Column("building__name")
+        self.assertEqual(column.data, "building__name")
+        self.assertEqual(column.path, ("building", "name"))
+        self.assertEqual(column.relation_path, "building")
+        self.assertEqual(column.lookup, "icontains")
+        self.assertEqual(column.global_lookup, "icontains")
+        self.assertEqual(column.regex_lookup, "iregex")
+
+    def test_local_column(self):
+        column = Column("first_name")
+        self.assertEqual(column.path, ("first_name",))
+        self.assertIsNone(column.relation_path)
+
+    def test_default_filter(self):
+        column = Column("building__name")
+        self.assertEqual(
+            column.get_filter("north"), Q(building__name__icontains="north")
+        )
+        self.assertEqual(
+            column.get_filter("^n", regex=True), Q(building__name__iregex="^n")
+        )
+
+    @parameterized.expand(
+        [
+            ("exact", "5", Q(internal_id__exact=5)),
+            ("exact", "abc", None),
+            ("in", "1, 2,3", Q(internal_id__in=[1, 2, 3])),
+            ("in", "1,a", None),
+            ("in", ",", None),
+            ("range", "10,20", Q(internal_id__gte=10, internal_id__lte=20)),
+            ("range", "10,", Q(internal_id__gte=10)),
+            ("range", ",20", Q(internal_id__lte=20)),
+            ("range", "15", Q(internal_id__gte=15, internal_id__lte=15)),
+            ("range", "a,20", None),
+        ]
+    )
+    def test_coerced_lookups(self, lookup, value, q_filter):
+        column = Column("internal_id", lookup=lookup, coerce=int)
+        self.assertEqual(column.get_filter(value), q_filter)
+
+    def test_coerce_date(self):
+        column = Column("created", lookup="exact", coerce=datetime.date.fromisoformat)
+        self.assertEqual(
+            column.get_filter("2022-01-31"),
+            Q(created__exact=datetime.date(2022, 1, 31)),
+        )
+        self.assertIsNone(column.get_filter("smith"))
+
+    def test_global_lookup(self):
+        column = Column("last_name", lookup="exact", global_lookup="istartswith")
+        self.assertEqual(column.get_filter("Smith"), Q(last_name__exact="Smith"))
+        self.assertEqual(
+            column.get_filter("Smi", global_search=True),
+            Q(last_name__istartswith="Smi"),
+        )
+
+    def test_trigram(self):
+        column = Column("last_name", lookup="trigram_similar")
+        self.assertEqual(
+            column.get_filter("smyth"), Q(last_name__trigram_similar="smyth")
+        )
+
+    def test_regex_disabled(self):
+        column = Column("internal_id", lookup="exact", regex_lookup=None)
+        self.assertIsNone(column.get_filter("^1", regex=True))
+
+    def test_not_searchable(self):
+        self.assertIsNone(Column("first_name", searchable=False).get_filter("john"))
+
+    def test_compile_columns(self):
+        columns = compile_columns(["id", Column("first_name")])
+        self.assertEqual([column.data for column in columns], ["id", "first_name"])
+        self.assertTrue(all(isinstance(column, Column) for column in columns))
+
+    def test_compile_columns_is_cached(self):
+        self.assertIs(
+            compile_columns(["id", "first_name"]), compile_columns(("id", "first_name"))
+        )
+
+    def test_compiled_on_view_creation(self):
+        class PersonView(ServerSideDataTablesMixin):
+            columns = ["id", "unique_column_for_test"]
+
+        with patch(
+            "django_datatable_serverside_mixin.columns.Column.__init__"
+        ) as mock_init:
+            compile_columns(PersonView.columns)
+        mock_init.assert_not_called()
+
+
+class TypeAwareColumnTestCase(unittest.TestCase):
+    def test_resolve_field(self):
+        self.assertIs(
+            resolve_field(Person, ("first_name",)), Person._meta.get_field("first_name")
+        )
+        self.assertIs(resolve_field(Person, ("pk",)), Person._meta.pk)
+        self.assertIs(
+            resolve_field(Person, ("building", "name")),
+            Building._meta.get_field("name"),
+        )
+        # Relations resolve to their target field
+        self.assertIs(resolve_field(Person, ("building",)), Building._meta.pk)
+        self.assertIs(
+            resolve_field(Building, ("people", "internal_id")),
+            Person._meta.get_field("internal_id"),
+        )
+
+    def test_resolve_unknown_field(self):
+        self.assertIsNone(resolve_field(Person, ("annotated_name",)))
+        self.assertIsNone(resolve_field(Person, ("first_name", "upper")))
+
+    @parameterized.expand(
+        [
+            (is_integer, "123", True),
+            (is_integer, "-12", True),
+            (is_integer, "12a", False),
+            (is_integer, "Smith", False),
+            (is_integer, "-", True),
+            (is_integer, "1-", False),
+            (is_number, "12.5", True),
+            (is_number, ".5", True),
+            (is_number, ".", True),
+            (is_number, "-", True),
+            (is_number, "-.", True),
+            (is_number, "2.", True),
+            (is_number, "1.2.3", False),
+            (is_number, "1-2", False),
+            (is_uuid, "6f1c-2b", True),
+            (is_uuid, "Smith", False),
+            (is_temporal, "2022-01-31", True),
+            (is_temporal, "10:30", True),
+            (is_temporal, "January", False),
+            (is_boolean, "tru", True),
+            (is_boolean, "1", True),
+            (is_boolean, "yes", False),
+            (is_boolean, "FALS", True),
+            (is_boolean, "rue", True),
+            (is_boolean, "E", True),
+            (is_boolean, "alse", True),
+            (is_boolean, "truefalse", False),
+        ]
+    )
+    def test_value_checks(self, value_check, value, expected):
+        self.assertIs(value_check(value), expected)
+
+    def test_bound_columns_skip_values_that_cannot_match(self):
+        columns = compile_columns(
+            [
+                "first_name",
+                "internal_id",
+                "uuid",
+                "active",
+                "salary",
+                "created",
+                "building__floor_count",
+                "building__name",
+            ],
+            Person,
+        )
+        searchable = [
+            column.data for column in columns if column.get_filter("Smith") is not None
+        ]
+        self.assertEqual(searchable, ["first_name", "building__name"])
+        searchable = [
+            column.data for column in columns if column.get_filter("12") is not None
+        ]
+        self.assertEqual(
+            searchable,
+            [
+                "first_name",
+                "internal_id",
+                "uuid",
+                "salary",
+                "created",
+                "building__floor_count",
+                "building__name",
+            ],
+        )
+
+    def test_parts_of_numbers_are_searched(self):
+        internal_id, salary = compile_columns(["internal_id", "salary"], Person)
+        self.assertEqual(internal_id.get_filter("-"), Q(internal_id__icontains="-"))
+        self.assertEqual(salary.get_filter("-"), Q(salary__icontains="-"))
+        self.assertEqual(salary.get_filter("."), Q(salary__icontains="."))
+        self.assertIsNone(internal_id.get_filter("."))
+
+    def test_boolean_substrings_are_searched(self):
+        column = compile_columns(["active"], Person)[0]
+        self.assertEqual(column.get_filter("rue"), Q(active__icontains="rue"))
+
+    def test_bound_columns_keep_regex(self):
+        column = compile_columns(["internal_id"], Person)[0]
+        self.assertEqual(
+            column.get_filter("^1", regex=True), Q(internal_id__iregex="^1")
+        )
+
+    def test_bind_does_not_change_column(self):
+        column = Column("internal_id")
+        bound = compile_columns([column], Person)[0]
+        self.assertIsNot(bound, column)
+        self.assertIsNone(column.value_check)
+        self.assertIsNotNone(bound.value_check)
+
+    def test_unbound_columns_are_not_pruned(self):
+        column = compile_columns(["internal_id"])[0]
+        self.assertEqual(column.get_filter("Smith"), Q(internal_id__icontains="Smith"))
@@ -0,0 +1,92 @@
+import json
+from django.test import RequestFactory, TestCase
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name"]
+
+
+class ConditionalView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+    last_modified_field = "updated"
+
+
+class ConditionalTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(10)
+
+    def get_response(self, options: dict = {}, etag=None, **attributes):
+        headers = {} if etag is None else {"HTTP_IF_NONE_MATCH": etag}
+        request = RequestFactory().get(
+            "/", get_request_params(columns, options), **headers
+        )
+        view = ConditionalView(**attributes)
+        view.setup(request)
+        return view.get(request)
+
+    def test_headers(self):
+        response = self.get_response()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_not_modified(self):
+        etag = self.get_response({"draw": "1", "_": "1"})["ETag"]
+        # Total count and the aggregate, no ordering, page or filtered count
+        with self.assertNumQueries(2):
+            response = self.get_response({"draw": "2", "_": "2"}, etag=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_modified_row(self):
+        etag = self.get_response()["ETag"]
+        Person.objects.get(first_name="First3").save()
+        response = self.get_response(etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deleted_row(self):
+        etag = self.get_response({"search[value]": "Smith"})["ETag"]
+        Person.objects.filter(first_name="First0").delete()
+        response = self.get_response({"search[value]": "Smith"}, etag=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_different_page(self):
+        etag = self.get_response()["ETag"]
+        response = self.get_response({"start": "5"}, etag=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_filtered_count_is_reused(self):
+        with self.assertNumQueries(3):
+            response = self.get_response({"search[value]": "Smith"})
+        self.assertEqual(json.loads(response.content)["recordsFiltered"], 5)
+
+    def test_custom_validator(self):
+        class VersionView(ConditionalView):
+            last_modified_field = None
+
+            def get_validator(self, DataTablesServer):
+                return self.version, None
+
+        request = RequestFactory().get("/", get_request_params(columns))
+        view = VersionView()
+        view.version = 1
+        view.setup(request)
+        etag = view.get(request)["ETag"]
+        request = RequestFactory().get(
+            "/", get_request_params(columns), HTTP_IF_NONE_MATCH=etag
+        )
+        view.setup(request)
+        self.assertEqual(view.get(request).status_code, 304)
+        view.version = 2
+        self.assertEqual(view.get(request).status_code, 200)
+
+    def test_disabled(self):
+        response = self.get_response(last_modified_field=None)
+        self.assertNotIn("ETag", response)
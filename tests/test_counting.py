@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django_datatable_serverside_mixin.counting import (
+    CallableCount,
+    CappedCount,
+    EstimatedCount,
+    ExactCount,
+    RecordCount,
+    get_count_strategy,
+)
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name"]
+
+
+class GetCountStrategyTestCase(unittest.TestCase):
+    def test_default(self):
+        self.assertIsInstance(get_count_strategy(None), ExactCount)
+
+    def test_names(self):
+        self.assertIsInstance(get_count_strategy("exact"), ExactCount)
+        self.assertIsInstance(get_count_strategy("capped"), CappedCount)
+        self.assertIsInstance(get_count_strategy("estimate"), EstimatedCount)
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            get_count_strategy("guess")
+
+    def test_instance(self):
+        strategy = CappedCount(5)
+        self.assertIs(get_count_strategy(strategy), strategy)
+
+    def test_callable(self):
+        strategy = get_count_strategy(lambda queryset: 42)
+        self.assertIsInstance(strategy, CallableCount)
+        self.assertEqual(strategy.count(None), RecordCount(42, True))
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            get_count_strategy(42)
+
+
+class CountStrategyTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(25, ("Smith",))
+
+    def get_server(self, count_strategy) -> DataTablesServer:
+        request = RequestFactory().get("/", get_request_params(columns))
+        return DataTablesServer(
+            request, columns, Person.objects.all(), count_strategy=count_strategy
+        )
+
+    def test_capped_count_over_cap(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = CappedCount(10).count(Person.objects.all())
+        self.assertEqual(result, RecordCount(10, False))
+        self.assertEqual(len(queries), 1)
+        self.assertIn("COUNT(*)", queries[0]["sql"])
+        self.assertIn("LIMIT 11", queries[0]["sql"])
+
+    def test_capped_count_under_cap(self):
+        self.assertEqual(
+            CappedCount(100).count(Person.objects.all()), RecordCount(25, True)
+        )
+
+    def test_estimate_falls_back_to_exact(self):
+        # SQLite has no planner estimate
+        self.assertEqual(
+            EstimatedCount(threshold=0).count(Person.objects.all()),
+            RecordCount(25, True),
+        )
+
+    @patch.object(EstimatedCount, "estimate", return_value=1000000)
+    def test_estimate(self, mock_estimate):
+        with self.assertNumQueries(0):
+            result = EstimatedCount().count(Person.objects.all())
+        self.assertEqual(result, RecordCount(1000000, False))
+
+    @patch.object(EstimatedCount, "estimate", return_value=50)
+    def test_estimate_below_threshold(self, mock_estimate):
+        result = EstimatedCount(threshold=100).count(Person.objects.all())
+        self.assertEqual(result, RecordCount(25, True))
+
+    def test_output_reports_strategy(self):
+        result = self.get_server(CappedCount(10)).get_output_result()
+        self.assertEqual(result["recordsTotal"], 10)
+        self.assertEqual(result["countStrategy"], "capped")
+        self.assertFalse(result["recordsTotalExact"])
+
+    def test_output_exact_does_not_report_strategy(self):
+        result = self.get_server(None).get_output_result()
+        self.assertEqual(result["recordsTotal"], 25)
+        self.assertNotIn("countStrategy", result)
+
+    def test_set_total_keeps_known_filtered_count(self):
+        server = self.get_server(None)
+        self.assertEqual(server.total_filtered_records, 25)
+        # The validator counts the filtered rows before the total is known
+        server.total_records = None
+        server.total_filtered_records = 3
+        server.set_total(RecordCount(25, True))
+        self.assertEqual(server.total_records, 25)
+        self.assertEqual(server.total_filtered_records, 3)
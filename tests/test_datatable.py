@@ -4,8 +4,13 @@ import operator
 from parameterized import parameterized
 from unittest.mock import MagicMock, patch, Mock, DEFAULT
 from .fixtures import *
+from django.http import QueryDict
 from django.utils.http import urlencode
-from django_datatable_serverside_mixin.datatable import DataTablesServer
+from django_datatable_serverside_mixin.request import DataTablesRequest
+from django_datatable_serverside_mixin.datatable import (
+    DataTablesError,
+    DataTablesServer,
+)
 from django.db.models import Q, F
 from functools import reduce
 from itertools import combinations, product, chain
@@ -102,9 +107,9 @@ class DataTablesServerTestCase(unittest.TestCase):
     )
     def test_get_output_result(self, mock_filter_queryset):
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
 
         def update_total_filtered_records():
@@ -138,9 +143,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         filter_value = ""
         self.request_params["search[value]"] = filter_value
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -157,9 +162,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         filter_value = "2"
         self.request_params["search[value]"] = filter_value
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -185,9 +190,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["search[value]"] = filter_value
         self.request_params["search[regex]"] = "true"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -216,9 +221,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["search[value]"] = filter_value
         self.request_params["columns[4][searchable]"] = "false"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -252,9 +257,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["columns[4][searchable]"] = "false"
 
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -272,9 +277,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         A blank value for the column searches should not trigger a filter at all
         """
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -292,9 +297,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["columns[2][search][value]"] = "John"
         self.request_params["columns[4][search][value]"] = filter_value
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -318,9 +323,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["columns[2][search][value]"] = "John"
         self.request_params["columns[2][search][regex]"] = "false"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -344,9 +349,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["columns[4][search][value]"] = "1111"
         self.request_params["columns[4][searchable]"] = "false"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -374,9 +379,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["columns[4][searchable]"] = "false"
 
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -395,9 +400,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.set_search_params(list(args))
 
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_filtered_queryset = get_mock_queryset()
         mock_queryset.filter.return_value = mock_filtered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -415,16 +420,16 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["order[1][column]"] = 1
         self.request_params["order[1][dir]"] = "desc"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_ordered_queryset = get_mock_queryset()
         mock_queryset.order_by.return_value = mock_ordered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
 
         datatable.order_queryset()
 
-        correct_order_list = ["id", "-data"]
+        correct_order_list = ["id", "-data", "pk"]
 
         mock_queryset.order_by.assert_called_once_with(*correct_order_list)
         self.assertEqual(
@@ -440,16 +445,16 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["order[1][dir]"] = "desc"
         self.request_params["columns[1][orderable]"] = "false"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_ordered_queryset = get_mock_queryset()
         mock_queryset.order_by.return_value = mock_ordered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
 
         datatable.order_queryset()
 
-        correct_order_list = ["id"]
+        correct_order_list = ["id", "pk"]
 
         mock_queryset.order_by.assert_called_once_with(*correct_order_list)
         self.assertEqual(
@@ -458,6 +463,116 @@ class DataTablesServerTestCase(unittest.TestCase):
             msg="Ordered queryset not assigned to self.queryset!",
         )
 
+    def test_order_custom_tiebreaker(self):
+        mock_request = get_mock_request(
+            {"GET": QueryDict(urlencode(self.request_params))}
+        )
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
+        datatable = DataTablesServer(
+            mock_request, self.columns, mock_queryset, ordering_tiebreaker="internal_id"
+        )
+
+        datatable.order_queryset()
+
+        mock_queryset.order_by.assert_called_once_with("id", "internal_id")
+
+    def test_order_tiebreaker_already_ordered(self):
+        self.request_params["order[0][column]"] = 0
+        self.request_params["order[0][dir]"] = "desc"
+        mock_request = get_mock_request(
+            {"GET": QueryDict(urlencode(self.request_params))}
+        )
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
+        datatable = DataTablesServer(
+            mock_request, self.columns, mock_queryset, ordering_tiebreaker="id"
+        )
+
+        datatable.order_queryset()
+
+        mock_queryset.order_by.assert_called_once_with("-id")
+
+    def test_order_no_tiebreaker(self):
+        mock_request = get_mock_request(
+            {"GET": QueryDict(urlencode(self.request_params))}
+        )
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
+        datatable = DataTablesServer(
+            mock_request, self.columns, mock_queryset, ordering_tiebreaker=None
+        )
+
+        datatable.order_queryset()
+
+        mock_queryset.order_by.assert_called_once_with("id")
+
+    @parameterized.expand(
+        [
+            ([("id",)], ["id", "pk"]),
+            ([("id", "-data", "first_name")], ["id", "-data", "pk"]),
+            ([("id", "first_name")], ["id", "pk"]),
+            ([("first_name",), ("id", "-data")], ["id", "-data", "pk"]),
+            # Scanned backwards
+            ([("-id", "data")], ["id", "-data", "pk"]),
+            ([("-id",)], ["id", "pk"]),
+            # Mixed directions only match the leading field
+            ([("id", "data")], ["id", "pk"]),
+            ([("-id", "-data")], ["id", "pk"]),
+        ]
+    )
+    def test_order_indexed_orderings_truncate(self, indexed_orderings, order_list):
+        self.request_params["order[1][column]"] = 1
+        self.request_params["order[1][dir]"] = "desc"
+        mock_request = get_mock_request(
+            {"GET": QueryDict(urlencode(self.request_params))}
+        )
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
+        datatable = DataTablesServer(
+            mock_request,
+            self.columns,
+            mock_queryset,
+            indexed_orderings=indexed_orderings,
+        )
+
+        datatable.order_queryset()
+
+        mock_queryset.order_by.assert_called_once_with(*order_list)
+
+    def test_order_indexed_orderings_unsupported_first_column(self):
+        mock_request = get_mock_request(
+            {"GET": QueryDict(urlencode(self.request_params))}
+        )
+        mock_queryset = get_mock_queryset(
+            {"count.return_value": len(self.dataset), "ordered": True}
+        )
+        datatable = DataTablesServer(
+            mock_request,
+            self.columns,
+            mock_queryset,
+            indexed_orderings=[("first_name",)],
+        )
+
+        datatable.order_queryset()
+
+        mock_queryset.order_by.assert_not_called()
+
+    def test_order_indexed_orderings_reject(self):
+        self.request_params["order[1][column]"] = 1
+        self.request_params["order[1][dir]"] = "desc"
+        mock_request = get_mock_request(
+            {"GET": QueryDict(urlencode(self.request_params))}
+        )
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
+        datatable = DataTablesServer(
+            mock_request,
+            self.columns,
+            mock_queryset,
+            indexed_orderings=[("id",)],
+            unindexed_ordering="reject",
+        )
+
+        with self.assertRaises(DataTablesError):
+            datatable.order_queryset()
+        mock_queryset.order_by.assert_not_called()
+
     def test_order_no_orderable_fields(self):
         self.request_params["order[0][column]"] = 0
         self.request_params["order[0][dir]"] = "asc"
@@ -466,9 +581,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["order[1][dir]"] = "desc"
         self.request_params["columns[1][orderable]"] = "false"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_ordered_queryset = get_mock_queryset()
         mock_queryset.order_by.return_value = mock_ordered_queryset
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
@@ -487,9 +602,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["length"] = "-1"
 
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_paginated_queryset = get_mock_queryset()
         mock_queryset.__getitem__.return_value = mock_paginated_queryset
 
@@ -507,9 +622,9 @@ class DataTablesServerTestCase(unittest.TestCase):
         self.request_params["start"] = start
         self.request_params["length"] = length
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_paginated_queryset = get_mock_queryset()
         mock_queryset.__getitem__.return_value = mock_paginated_queryset
 
@@ -524,9 +639,9 @@ class DataTablesServerTestCase(unittest.TestCase):
 
     def test_select_queryset(self):
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         mock_select_queryset = Mock()
         mock_queryset.values.return_value = mock_select_queryset
 
@@ -537,31 +652,51 @@ class DataTablesServerTestCase(unittest.TestCase):
 
     def test_get_column_index_by_data(self):
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
 
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
         self.assertEqual(datatable.get_column_index_by_data("id"), 0)
         self.assertEqual(datatable.get_column_index_by_data("data"), 1)
         self.assertIsNone(datatable.get_column_index_by_data("blah123"))
 
-    @patch("django_datatable_serverside_mixin.datatable.parser")
-    def test_init(self, mock_parser):
+    def test_init(self):
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
-        mock_queryset = get_mock_queryset({"__len__.return_value": len(self.dataset)})
-        mock_parser.parse.return_value = {"test": "test"}
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
         self.assertEqual(datatable.start, 0)
         self.assertEqual(datatable.length, 10)
         self.assertEqual(datatable.columns, self.columns)
+        self.assertEqual(datatable.column_names, list(self.columns))
         self.assertEqual(datatable.queryset, mock_queryset)
-        self.assertEqual(datatable.total_records, len(mock_queryset))
-        self.assertIsInstance(datatable.request_dict, dict)
-        mock_parser.parse.assert_called_with(urlencode(self.request_params))
-        self.assertEqual(datatable.request_dict, {"test": "test"})
+        self.assertEqual(datatable.total_records, len(self.dataset))
+        mock_queryset.count.assert_called_once_with()
+        self.assertIsInstance(datatable.datatables_request, DataTablesRequest)
+        self.assertEqual(datatable.datatables_request.draw, "1")
+
+    def test_request_dict(self):
+        mock_request = get_mock_request(
+            {"GET": QueryDict(urlencode(self.request_params))}
+        )
+        mock_queryset = get_mock_queryset({"count.return_value": len(self.dataset)})
+        datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
+        self.assertEqual(datatable.request_dict["draw"], "1")
+        self.assertEqual(
+            datatable.request_dict["columns"][0],
+            {
+                "data": "id",
+                "name": "name_of_id",
+                "searchable": "true",
+                "orderable": "true",
+                "search": {"value": "", "regex": "false"},
+            },
+        )
+        self.assertEqual(
+            datatable.request_dict["order"], {0: {"column": "0", "dir": "asc"}}
+        )
 
     @patch(
         "django_datatable_serverside_mixin.datatable.DataTablesServer.paginate_queryset"
@@ -588,7 +723,7 @@ class DataTablesServerTestCase(unittest.TestCase):
         # Set filter to ensure the queryset is updated
         self.request_params["search[value]"] = "2"
         mock_request = get_mock_request(
-            {"GET.urlencode.return_value": urlencode(self.request_params)}
+            {"GET": QueryDict(urlencode(self.request_params))}
         )
         mock_queryset = get_mock_queryset({"__iter__.return_value": [1, 2, 3]})
         datatable = DataTablesServer(mock_request, self.columns, mock_queryset)
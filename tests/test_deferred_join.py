@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django_datatable_serverside_mixin.cache import CursorCache
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+
+from .fixtures import ClearCacheMixin, create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["first_name", "last_name", "internal_id", "building__name"]
+
+
+class DeferredJoinTestCase(ClearCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(
+            35,
+            ("Smith", "Jones", "Brown"),
+            ("North", "South", "East"),
+            "First{:02}",
+            internal_ids=range(100, 65, -1),
+        )
+
+    def get_result(self, options: dict = {}, **kwargs):
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        datatable = DataTablesServer(request, columns, Person.objects.all(), **kwargs)
+        with CaptureQueriesContext(connection) as queries:
+            result = datatable.get_output_result()
+        return result, [query["sql"] for query in queries]
+
+    def assertSameAsSingleQuery(self, options: dict):
+        deferred, _ = self.get_result(options, deferred_join=True)
+        single, _ = self.get_result(options)
+        self.assertEqual(deferred, single)
+
+    def test_two_queries(self):
+        result, queries = self.get_result(
+            {"order[0][column]": "3", "start": "10"}, deferred_join=True
+        )
+        ids_query, rows_query = queries
+        self.assertTrue(
+            ids_query.startswith('SELECT "testapp_person"."id" FROM "testapp_person"')
+        )
+        self.assertIn("LIMIT 10 OFFSET 10", ids_query)
+        self.assertIn('"testapp_building"."name" ASC', ids_query)
+        self.assertIn('WHERE "testapp_person"."id" IN (', rows_query)
+        self.assertNotIn("ORDER BY", rows_query)
+        self.assertNotIn("LIMIT", rows_query)
+        self.assertEqual(list(result["data"][0]), columns)
+
+    def test_same_result(self):
+        self.assertSameAsSingleQuery({"order[0][column]": "2"})
+        self.assertSameAsSingleQuery(
+            {"order[0][column]": "1", "order[0][dir]": "desc", "start": "20"}
+        )
+        self.assertSameAsSingleQuery(
+            {"search[value]": "Smith", "order[0][column]": "3", "start": "5"}
+        )
+
+    def test_selected_pk_is_kept(self):
+        request = RequestFactory().get(
+            "/", get_request_params(["pk", "first_name"], {"length": "3"})
+        )
+        result = DataTablesServer(
+            request, ["pk", "first_name"], Person.objects.all(), deferred_join=True
+        ).get_output_result()
+        self.assertEqual(list(result["data"][0]), ["pk", "first_name"])
+
+    def test_empty_page(self):
+        result, queries = self.get_result({"start": "100"}, deferred_join=True)
+        self.assertEqual(result["data"], [])
+        self.assertEqual(len(queries), 1)
+
+    def test_not_used_for_all_rows(self):
+        result, queries = self.get_result({"length": "-1"}, deferred_join=True)
+        self.assertEqual(len(result["data"]), 35)
+        self.assertEqual(len(queries), 1)
+
+    def test_keyset_pagination(self):
+        options = {"order[0][column]": "1"}
+        for start in range(0, 40, 10):
+            page_options = {**options, "start": str(start)}
+            result, queries = self.get_result(
+                page_options, deferred_join=True, cursor_cache=CursorCache()
+            )
+            expected, _ = self.get_result(page_options)
+            self.assertEqual(result, expected)
+            if start:
+                self.assertNotIn("OFFSET", queries[0])
@@ -0,0 +1,143 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from unittest import skipUnless
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+from django.utils.functional import lazy
+from django_datatable_serverside_mixin.encoders import (
+    CallableEncoder,
+    DjangoEncoder,
+    OrjsonEncoder,
+    get_encoder,
+    orjson,
+)
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import get_request_params
+from .testapp.models import Building, Person
+
+lazy_str = lazy(lambda: "lazy", str)
+
+row = {
+    "datetime": datetime.datetime(
+        2022, 9, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "naive": datetime.datetime(2022, 9, 1, 12, 30, 15),
+    "date": datetime.date(2022, 9, 1),
+    "time": datetime.time(12, 30, 15, 500),
+    "timedelta": datetime.timedelta(days=1, seconds=5),
+    "decimal": Decimal("10.50"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": lazy_str(),
+    "int": 3,
+    "float": 1.5,
+    "none": None,
+    "bool": True,
+    "text": 'Straße "quoted"',
+}
+
+
+class GetEncoderTestCase(SimpleTestCase):
+    def test_default(self):
+        self.assertIsInstance(get_encoder(), DjangoEncoder)
+        self.assertIsInstance(get_encoder("django"), DjangoEncoder)
+
+    def test_instance(self):
+        encoder = DjangoEncoder()
+        self.assertIs(get_encoder(encoder), encoder)
+
+    def test_callable(self):
+        encoder = get_encoder(json.dumps)
+        self.assertIsInstance(encoder, CallableEncoder)
+        self.assertEqual(encoder.encode({"a": 1}), b'{"a": 1}')
+
+    def test_auto(self):
+        encoder = get_encoder("auto")
+        self.assertIsInstance(
+            encoder, OrjsonEncoder if orjson is not None else DjangoEncoder
+        )
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_encoder("yaml")
+        with self.assertRaises(TypeError):
+            get_encoder(1)
+
+
+@skipUnless(orjson, "orjson is not installed")
+class OrjsonEncoderTestCase(SimpleTestCase):
+    def test_same_values_as_django(self):
+        self.assertEqual(
+            json.loads(OrjsonEncoder().encode([row])),
+            json.loads(DjangoEncoder().encode([row])),
+        )
+
+    def test_datetime_format(self):
+        self.assertEqual(
+            OrjsonEncoder().encode(row["datetime"]), b'"2022-09-01T12:30:15.123Z"'
+        )
+
+
+class EncoderView(ServerSideDataTablesMixin):
+    model = Person
+    columns = ["id", "first_name", "salary", "uuid", "created"]
+
+
+class EncoderViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        building = Building.objects.create(name="North")
+        Person.objects.bulk_create(
+            [
+                Person(
+                    first_name=f"First{i}",
+                    last_name="Smith",
+                    internal_id=i,
+                    salary=Decimal(f"{i}.25"),
+                    building=building,
+                )
+                for i in range(5)
+            ]
+        )
+        Person.objects.update(created=timezone.now())
+
+    def get_response(self, options: dict = {}, **attributes):
+        request = RequestFactory().get(
+            "/", get_request_params(EncoderView.columns, options)
+        )
+        view = EncoderView(**attributes)
+        view.setup(request)
+        response = view.get(request)
+        if hasattr(response, "streaming_content"):
+            return response, b"".join(response.streaming_content)
+        return response, response.content
+
+    def test_default_is_json_response(self):
+        response, _ = self.get_response()
+        self.assertIsInstance(response, JsonResponse)
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_orjson_response(self):
+        _, expected = self.get_response()
+        response, content = self.get_response(json_encoder="orjson")
+        self.assertIsInstance(response, HttpResponse)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(content), json.loads(expected))
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_orjson_streaming(self):
+        options = {"length": "-1"}
+        _, expected = self.get_response(options, json_encoder="orjson")
+        _, content = self.get_response(
+            options, json_encoder="orjson", stream_all_rows=True, stream_chunk_size=2
+        )
+        self.assertEqual(content, expected)
+
+    def test_callable_encoder(self):
+        response, content = self.get_response(
+            json_encoder=lambda data: json.dumps({"rows": len(data["data"])})
+        )
+        self.assertEqual(json.loads(content), {"rows": 5})
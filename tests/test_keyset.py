@@ -0,0 +1,111 @@
+from django.db import connection
+from django.db.models import Case, F, IntegerField, When
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django_datatable_serverside_mixin.cache import CursorCache
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+
+from .fixtures import ClearCacheMixin, create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["first_name", "last_name", "building__name"]
+
+
+class KeysetPaginationTestCase(ClearCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # last_name has many duplicates so the pk tiebreaker matters
+        create_people(47, ("Smith", "Jones", "Brown"), ("North", "South"), "First{:02}")
+
+    def get_page(
+        self, start: int, options: dict = {}, cursor_cache=True, nullable=False
+    ):
+        params = {"start": str(start), "length": "10", **options}
+        page_columns = columns
+        queryset = Person.objects.all()
+        if nullable:
+            # NULL for a third of the rows
+            page_columns = [*columns, "rank"]
+            queryset = queryset.annotate(
+                rank=Case(
+                    When(internal_id__gte=16, then=F("internal_id") % 7),
+                    output_field=IntegerField(),
+                )
+            )
+        request = RequestFactory().get("/", get_request_params(page_columns, params))
+        datatable = DataTablesServer(
+            request,
+            page_columns,
+            queryset,
+            cursor_cache=CursorCache() if cursor_cache else None,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            data = datatable.get_output_result()["data"]
+        return data, queries[-1]["sql"]
+
+    def assertPagesMatchOffset(self, options: dict, nullable=False):
+        for start in range(0, 50, 10):
+            keyset_page, sql = self.get_page(start, options, nullable=nullable)
+            offset_page, _ = self.get_page(
+                start, options, cursor_cache=False, nullable=nullable
+            )
+            self.assertEqual(keyset_page, offset_page, msg=f"start={start}")
+            if start:
+                self.assertNotIn("OFFSET", sql)
+
+    def test_sequential_pages_seek(self):
+        self.assertPagesMatchOffset({"order[0][column]": "1"})
+
+    def test_sequential_pages_seek_descending(self):
+        self.assertPagesMatchOffset({"order[0][column]": "1", "order[0][dir]": "desc"})
+
+    def test_sequential_pages_seek_mixed_directions(self):
+        self.assertPagesMatchOffset(
+            {
+                "order[0][column]": "2",
+                "order[0][dir]": "desc",
+                "order[1][column]": "1",
+                "order[1][dir]": "asc",
+            }
+        )
+
+    def test_sequential_pages_seek_with_filter(self):
+        self.assertPagesMatchOffset({"order[0][column]": "1", "search[value]": "o"})
+
+    def test_nullable_ordering(self):
+        self.assertPagesMatchOffset({"order[0][column]": "3"}, nullable=True)
+
+    def test_nullable_ordering_descending(self):
+        self.assertPagesMatchOffset(
+            {"order[0][column]": "3", "order[0][dir]": "desc"}, nullable=True
+        )
+
+    def test_nullable_ordering_with_next_field(self):
+        self.assertPagesMatchOffset(
+            {
+                "order[0][column]": "3",
+                "order[0][dir]": "desc",
+                "order[1][column]": "1",
+                "order[1][dir]": "desc",
+            },
+            nullable=True,
+        )
+
+    def test_random_jump_uses_offset(self):
+        data, sql = self.get_page(30)
+        self.assertIn("OFFSET 30", sql)
+        self.assertEqual(len(data), 10)
+
+    def test_cursor_fields_are_not_returned(self):
+        data, sql = self.get_page(0)
+        self.assertEqual(list(data[0].keys()), columns)
+        self.assertIn('"testapp_person"."id" ASC', sql)
+
+    def test_pk_tiebreaker_not_duplicated(self):
+        cursor_cache = CursorCache()
+        request = RequestFactory().get("/", get_request_params(["pk", *columns]))
+        datatable = DataTablesServer(
+            request, ["pk", *columns], Person.objects.all(), cursor_cache=cursor_cache
+        )
+        datatable.order_queryset()
+        self.assertEqual(datatable.order_fields, ["pk"])
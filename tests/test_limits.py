@@ -0,0 +1,197 @@
+import json
+import math
+from unittest.mock import patch
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase
+from django_datatable_serverside_mixin import limits
+from django_datatable_serverside_mixin.exceptions import DataTablesError
+from django_datatable_serverside_mixin.limits import (
+    check_search,
+    get_regex_complexity,
+    query_timeout,
+)
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Person
+from .testapp.views import AsyncPersonView
+
+columns = ["id", "first_name", "last_name"]
+
+# Takes seconds in SQLite without a timeout
+SLOW_QUERY = """
+    WITH RECURSIVE numbers(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM numbers)
+    SELECT COUNT(*) FROM (SELECT n FROM numbers LIMIT 100000000)
+"""
+
+
+class PersonView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+
+
+class CheckSearchTestCase(SimpleTestCase):
+    def test_no_limits(self):
+        check_search("x" * 1000, regex=True)
+
+    def test_max_length(self):
+        check_search("abc", max_length=3)
+        with self.assertRaisesMessage(DataTablesError, "limited to 3 characters"):
+            check_search("abcd", max_length=3)
+
+    def test_max_regex_length_only_applies_to_regex(self):
+        check_search("abcd", max_regex_length=3)
+        with self.assertRaisesMessage(DataTablesError, "limited to 3 characters"):
+            check_search("abcd", regex=True, max_regex_length=3)
+
+    def test_max_regex_complexity(self):
+        check_search("^a.*b$", regex=True, max_regex_complexity=1)
+        with self.assertRaisesMessage(DataTablesError, "too complex"):
+            check_search("a*|b*", regex=True, max_regex_complexity=2)
+
+    def test_max_regex_complexity_ignores_plain_searches(self):
+        check_search("(a+)+", max_regex_complexity=10)
+
+    def test_invalid_regex(self):
+        with self.assertRaisesMessage(DataTablesError, "Invalid regular expression"):
+            check_search("(ab", regex=True, max_regex_complexity=10)
+
+    def test_regex_complexity(self):
+        self.assertEqual(get_regex_complexity("abc"), 0)
+        self.assertEqual(get_regex_complexity("^a.*b$"), 1)
+        self.assertEqual(get_regex_complexity("ab|cd|ef"), 2)
+        self.assertEqual(get_regex_complexity("(ab){2}c+"), 3)
+        self.assertEqual(get_regex_complexity("(a{1,3})+"), 3)
+
+    def test_nested_unbounded_quantifiers(self):
+        self.assertEqual(get_regex_complexity("(a+)+"), math.inf)
+        self.assertEqual(get_regex_complexity("(x|(ab*)c)*"), math.inf)
+
+
+class QueryTimeoutTestCase(TestCase):
+    def test_interrupts_slow_query(self):
+        with self.assertRaisesMessage(DataTablesError, limits.TIMEOUT_MESSAGE):
+            with query_timeout("default", 0.05):
+                with connection.cursor() as cursor:
+                    cursor.execute(SLOW_QUERY)
+
+    def test_fast_query(self):
+        with query_timeout("default", 10):
+            self.assertEqual(Person.objects.count(), 0)
+
+    def test_removes_progress_handler(self):
+        with query_timeout("default", 0):
+            pass
+        with patch.object(limits, "SQLITE_PROGRESS_STEPS", 1):
+            self.assertEqual(Person.objects.count(), 0)
+
+    def test_no_timeout(self):
+        with patch.object(limits, "TIMEOUT_LIMITS", {}) as timeout_limits:
+            with query_timeout("default", None):
+                pass
+        self.assertEqual(timeout_limits, {})
+
+    def test_other_errors_are_raised(self):
+        with self.assertRaises(Exception) as context:
+            with query_timeout("default", 10):
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT * FROM missing_table")
+        self.assertNotIsInstance(context.exception, DataTablesError)
+
+
+class LimitsViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(10)
+
+    def get_data(self, options: dict = {}, **attributes) -> dict:
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        view = PersonView(**attributes)
+        view.setup(request)
+        return json.loads(view.get(request).content)
+
+    def test_search_too_long(self):
+        data = self.get_data({"search[value]": "Smithers"}, max_search_length=5)
+        self.assertEqual(data["error"], "Searches are limited to 5 characters.")
+        self.assertEqual(data["data"], [])
+
+    def test_column_search_too_long(self):
+        data = self.get_data(
+            {"columns[2][search][value]": "Smithers"}, max_search_length=5
+        )
+        self.assertIn("error", data)
+
+    def test_search_within_limits(self):
+        data = self.get_data(
+            {"search[value]": "^Sm.th$", "search[regex]": "true"},
+            max_search_length=10,
+            max_regex_length=10,
+            max_regex_complexity=5,
+        )
+        self.assertNotIn("error", data)
+        self.assertEqual(data["recordsFiltered"], 5)
+
+    def test_regex_too_complex(self):
+        with self.assertNumQueries(1):
+            data = self.get_data(
+                {"search[value]": "(S+)+h", "search[regex]": "true"},
+                max_regex_complexity=10,
+            )
+        self.assertEqual(data["error"], "The regular expression is too complex.")
+
+    def test_statement_timeout(self):
+        with patch.object(limits, "SQLITE_PROGRESS_STEPS", 1):
+            data = self.get_data(statement_timeout=0)
+        self.assertEqual(data["error"], limits.TIMEOUT_MESSAGE)
+
+    def test_statement_timeout_not_reached(self):
+        data = self.get_data(statement_timeout=10)
+        self.assertNotIn("error", data)
+        self.assertEqual(len(data["data"]), 10)
+
+    def get_streaming_response(self, **attributes):
+        request = RequestFactory().get(
+            "/", get_request_params(columns, {"length": "-1"})
+        )
+        view = PersonView(stream_all_rows=True, **attributes)
+        view.setup(request)
+        return view, view.get(request)
+
+    def test_streamed_rows_are_limited(self):
+        wrappers = []
+
+        def data_callback(data):
+            wrappers.append(len(connection.execute_wrappers))
+            return data
+
+        view, response = self.get_streaming_response(statement_timeout=10)
+        view.data_callback = data_callback
+        content = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(content["data"]), 10)
+        self.assertEqual(wrappers, [1])
+        self.assertEqual(connection.execute_wrappers, [])
+
+    def test_streamed_rows_timeout(self):
+        view, response = self.get_streaming_response(statement_timeout=10)
+        # Applies to the rows, which are read once the response is iterated
+        view.statement_timeout = 0
+        with patch.object(limits, "SQLITE_PROGRESS_STEPS", 1):
+            with self.assertRaisesMessage(DataTablesError, limits.TIMEOUT_MESSAGE):
+                b"".join(response.streaming_content)
+
+    def test_parallel_queries_receive_timeout(self):
+        view = PersonView(parallel_queries=True, statement_timeout=2)
+        self.assertEqual(view.get_datatables_server_kwargs()["statement_timeout"], 2)
+        self.assertNotIn(
+            "statement_timeout", PersonView().get_datatables_server_kwargs()
+        )
+
+
+class AsyncLimitsTestCase(TestCase):
+    async def test_statement_timeout_is_not_supported(self):
+        view = AsyncPersonView(statement_timeout=1)
+        request = AsyncRequestFactory().get("/")
+        view.setup(request)
+        with self.assertRaises(ImproperlyConfigured):
+            await view.get(request)
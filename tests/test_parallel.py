@@ -0,0 +1,167 @@
+import json
+import threading
+from unittest.mock import patch
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from django_datatable_serverside_mixin import datatable
+from django_datatable_serverside_mixin.cache import CursorCache
+from django_datatable_serverside_mixin.datatable import (
+    DataTablesServer,
+    ParallelDataTablesServer,
+)
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name", "building__name"]
+
+
+class ParallelView(ServerSideDataTablesMixin):
+    queryset = Person.objects.using("parallel")
+    columns = columns
+    parallel_queries = True
+
+
+class ParallelTestCase(TransactionTestCase):
+    databases = {"parallel"}
+
+    def setUp(self):
+        create_people(
+            30, buildings=("North", "South"), first_name="First{:02}", using="parallel"
+        )
+
+    def get_result(self, server_class, options: dict = {}, **kwargs):
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        datatable = server_class(
+            request, columns, Person.objects.using("parallel"), **kwargs
+        )
+        return datatable.get_output_result()
+
+    def assertSameAsSequential(self, options: dict = {}, **kwargs):
+        result = self.get_result(ParallelDataTablesServer, options, **kwargs)
+        self.assertEqual(result, self.get_result(DataTablesServer, options, **kwargs))
+        return result
+
+    def test_same_result(self):
+        result = self.assertSameAsSequential({"start": "10", "order[0][column]": "3"})
+        self.assertEqual(result["recordsTotal"], 30)
+        self.assertEqual(result["recordsFiltered"], 30)
+
+    def test_search(self):
+        result = self.assertSameAsSequential(
+            {"search[value]": "South", "columns[1][search][value]": "First1"}
+        )
+        self.assertEqual(result["recordsFiltered"], 5)
+
+    def test_deferred_join_and_array_rows(self):
+        options = {f"columns[{i}][data]": str(i) for i in range(len(columns))}
+        self.assertSameAsSequential(
+            {**options, "order[0][column]": "2", "start": "5"},
+            deferred_join=True,
+            array_rows=True,
+        )
+
+    def test_keyset_pagination(self):
+        cursor_cache = CursorCache()
+        options = {"order[0][column]": "2", "length": "5"}
+        self.get_result(ParallelDataTablesServer, options, cursor_cache=cursor_cache)
+        self.assertSameAsSequential(
+            {**options, "start": "5"}, cursor_cache=cursor_cache
+        )
+
+    def test_queries_run_in_worker_threads(self):
+        threads = []
+        count_queryset = ParallelDataTablesServer.count_queryset
+        fetch_db_data = ParallelDataTablesServer.fetch_db_data
+
+        def record_thread(function):
+            def wrapper(*args):
+                threads.append(threading.current_thread().name)
+                return function(*args)
+
+            return wrapper
+
+        with patch.multiple(
+            ParallelDataTablesServer,
+            count_queryset=record_thread(count_queryset),
+            fetch_db_data=record_thread(fetch_db_data),
+        ):
+            self.get_result(ParallelDataTablesServer, {"search[value]": "Smith"})
+        self.assertEqual(len(threads), 3)
+        self.assertTrue(all(name.startswith("datatables") for name in threads))
+
+    def test_query_aliases(self):
+        # The default database has no rows, every query goes to "parallel"
+        request = RequestFactory().get(
+            "/", get_request_params(columns, {"search[value]": "Smith"})
+        )
+        datatable = ParallelDataTablesServer(
+            request, columns, Person.objects.all(), query_aliases=["parallel"]
+        )
+        result = datatable.get_output_result()
+        self.assertEqual(result["recordsTotal"], 30)
+        self.assertEqual(result["recordsFiltered"], 15)
+        self.assertEqual(len(result["data"]), 10)
+
+    def test_view(self):
+        request = RequestFactory().get(
+            "/", get_request_params(columns, {"search[value]": "Smith"})
+        )
+        view = ParallelView()
+        view.setup(request)
+        result = json.loads(view.get(request).content)
+        self.assertEqual(result["recordsTotal"], 30)
+        self.assertEqual(result["recordsFiltered"], 15)
+        self.assertEqual(len(result["data"]), 10)
+
+    def test_streamed_view(self):
+        request = RequestFactory().get(
+            "/", get_request_params(columns, {"length": "-1", "search[value]": "Smith"})
+        )
+        view = ParallelView(stream_all_rows=True)
+        view.setup(request)
+        result = json.loads(b"".join(view.get(request).streaming_content))
+        self.assertEqual(result["recordsTotal"], 30)
+        self.assertEqual(result["recordsFiltered"], 15)
+        self.assertEqual(len(result["data"]), 15)
+
+    def test_conditional_view(self):
+        request = RequestFactory().get(
+            "/", get_request_params(columns, {"search[value]": "Smith"})
+        )
+        view = ParallelView(last_modified_field="updated")
+        view.setup(request)
+        response = view.get(request)
+        self.assertIn("ETag", response)
+        self.assertEqual(json.loads(response.content)["recordsFiltered"], 15)
+
+    def test_profile(self):
+        request = RequestFactory().get(
+            "/", get_request_params(columns, {"search[value]": "Smith"})
+        )
+        view = ParallelView(profile_in_response=True)
+        view.setup(request)
+        profile = json.loads(view.get(request).content)["profile"]
+        self.assertEqual(profile["queries"], 3)
+        for phase in ("count_total", "count_filtered", "page"):
+            self.assertEqual(profile["phases"][phase]["queries"], 1)
+
+
+class ExecutorTestCase(SimpleTestCase):
+    def test_concurrent_calls_share_one_pool(self):
+        barrier = threading.Barrier(8)
+        executors = []
+
+        def get_executor():
+            barrier.wait()
+            executors.append(datatable.get_executor())
+
+        with patch.object(datatable, "_executor", None):
+            threads = [threading.Thread(target=get_executor) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            executor = datatable._executor
+        executor.shutdown()
+        self.assertEqual({id(executor) for executor in executors}, {id(executor)})
@@ -0,0 +1,174 @@
+import json
+from django.core.exceptions import ImproperlyConfigured
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase
+from django_datatable_serverside_mixin.profiling import Profile, request_profiled
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Person
+from .testapp.views import AsyncPersonView
+
+columns = ["id", "first_name", "last_name"]
+
+
+class PersonView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+
+
+class ProfileTestCase(SimpleTestCase):
+    def test_nested_phases(self):
+        profile = Profile()
+        with profile.phase("outer"):
+            with profile.phase("inner"):
+                pass
+        with profile.phase("inner"):
+            pass
+        self.assertEqual(list(profile.phases), ["outer", "inner"])
+        self.assertGreaterEqual(profile.phases["outer"][0], 0)
+        self.assertEqual(profile.active_phases, [])
+
+    def test_as_dict(self):
+        profile = Profile()
+        profile.phases = {"page": [0.0012345, 1]}
+        profile.query_count = 1
+        self.assertEqual(
+            profile.as_dict(),
+            {"queries": 1, "phases": {"page": {"duration": 1.234, "queries": 1}}},
+        )
+
+    def test_server_timing(self):
+        profile = Profile()
+        profile.phases = {"parse": [0.0001, 0], "page": [0.002, 1]}
+        self.assertEqual(
+            profile.get_server_timing(),
+            'parse;dur=0.100;desc="0 queries", page;dur=2.000;desc="1 queries"',
+        )
+
+
+class ProfileQueriesTestCase(TestCase):
+    def test_counts_queries_of_active_phases(self):
+        profile = Profile()
+        with profile.count_queries():
+            with profile.phase("outer"):
+                Person.objects.count()
+                with profile.phase("inner"):
+                    Person.objects.count()
+            Person.objects.count()
+        self.assertEqual(profile.query_count, 3)
+        self.assertEqual(profile.phases["outer"][1], 2)
+        self.assertEqual(profile.phases["inner"][1], 1)
+
+    def test_stops_counting(self):
+        profile = Profile()
+        with profile.count_queries("default"):
+            Person.objects.count()
+        Person.objects.count()
+        self.assertEqual(profile.query_count, 1)
+
+
+class ProfiledViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(10)
+
+    def get_response(self, options: dict = {}, **attributes):
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        view = PersonView(**attributes)
+        view.setup(request)
+        return view.get(request)
+
+    def test_disabled_by_default(self):
+        response = self.get_response()
+        self.assertNotIn("Server-Timing", response)
+        self.assertNotIn("profile", json.loads(response.content))
+        self.assertIsNone(PersonView().get_datatables_server_kwargs()["profile"])
+
+    def test_server_timing_header(self):
+        response = self.get_response(
+            {"search[value]": "Smith"}, server_timing_header=True
+        )
+        phases = [item.split(";")[0] for item in response["Server-Timing"].split(", ")]
+        self.assertEqual(
+            phases,
+            [
+                "total",
+                "count_total",
+                "parse",
+                "validator",
+                "filter",
+                "count_filtered",
+                "page",
+                "callback",
+                "encode",
+            ],
+        )
+
+    def test_profile_in_response(self):
+        data = json.loads(self.get_response(profile_in_response=True).content)
+        profile = data["profile"]
+        self.assertEqual(profile["queries"], 2)
+        self.assertEqual(profile["phases"]["count_total"]["queries"], 1)
+        self.assertEqual(profile["phases"]["page"]["queries"], 1)
+        self.assertEqual(profile["phases"]["total"]["queries"], 2)
+        self.assertNotIn("encode", profile["phases"])
+        self.assertEqual(len(data["data"]), 10)
+
+    def test_profile_in_response_is_not_cached(self):
+        self.get_response(profile_in_response=True, cache_responses=True)
+        with self.assertNumQueries(2):
+            self.get_response(profile_in_response=True, cache_responses=True)
+
+    def test_signal(self):
+        received = []
+
+        def receiver(sender, view, request, response, profile, **kwargs):
+            received.append((sender, profile))
+
+        request_profiled.connect(receiver)
+        try:
+            self.get_response(profile_requests=True)
+            self.get_response()
+        finally:
+            request_profiled.disconnect(receiver)
+        self.assertEqual(len(received), 1)
+        sender, profile = received[0]
+        self.assertIs(sender, PersonView)
+        self.assertEqual(profile.query_count, 2)
+
+    def test_report_profile_hook(self):
+        reported = []
+
+        class ReportingView(PersonView):
+            profile_requests = True
+
+            def report_profile(self, request, response, profile):
+                reported.append(profile.as_dict())
+
+        request = RequestFactory().get("/", get_request_params(columns))
+        view = ReportingView()
+        view.setup(request)
+        response = view.get(request)
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(reported[0]["queries"], 2)
+
+    def test_validator_phase(self):
+        response = self.get_response(
+            server_timing_header=True, last_modified_field="updated"
+        )
+        self.assertIn("validator;", response["Server-Timing"])
+
+    def test_error_response(self):
+        response = self.get_response(
+            {"search[value]": "Smithers"}, max_search_length=5, profile_requests=True
+        )
+        self.assertIn("error", json.loads(response.content))
+
+
+class AsyncProfileTestCase(TestCase):
+    async def test_profiling_is_not_supported(self):
+        view = AsyncPersonView(server_timing_header=True)
+        request = AsyncRequestFactory().get("/")
+        view.setup(request)
+        with self.assertRaises(ImproperlyConfigured):
+            await view.get(request)
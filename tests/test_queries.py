@@ -0,0 +1,424 @@
+import json
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django_datatable_serverside_mixin.columns import Column
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import ClearCacheMixin, create_people, get_request_params
+from .testapp.models import Building, OrderedPerson, Person
+
+columns = ["id", "first_name", "last_name", "internal_id", "building__name"]
+
+
+class DataTablesServerQueryTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(
+            30,
+            ("Smith", "Jones", "Jones"),
+            ("North", "South"),
+            internal_ids=range(1000, 1030),
+        )
+
+    def get_server(self, options: dict = {}) -> DataTablesServer:
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        return DataTablesServer(request, columns, Person.objects.all())
+
+    def get_unordered_request_server(self, queryset) -> DataTablesServer:
+        # The client sends no usable ordering
+        options = {"columns[0][orderable]": "false"}
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        return DataTablesServer(request, columns, queryset)
+
+    def test_tiebreaker_follows_queryset_ordering(self):
+        datatable = self.get_unordered_request_server(
+            Person.objects.order_by("-last_name")
+        )
+        datatable.prepare_queryset()
+        self.assertEqual(datatable.queryset.query.order_by, ("-last_name", "pk"))
+        self.assertEqual(datatable.order_fields, ["-last_name", "pk"])
+
+    def test_tiebreaker_follows_meta_ordering(self):
+        datatable = self.get_unordered_request_server(OrderedPerson.objects.all())
+        data = datatable.get_db_data()
+        self.assertEqual(datatable.queryset.query.order_by, ("last_name", "pk"))
+        ids = [row["id"] for row in data]
+        expected = list(
+            Person.objects.order_by("last_name", "pk").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected[:10])
+
+    def test_unique_queryset_ordering_is_kept(self):
+        datatable = self.get_unordered_request_server(Person.objects.order_by("-pk"))
+        datatable.prepare_queryset()
+        self.assertEqual(datatable.queryset.query.order_by, ("-pk",))
+
+    def test_total_uses_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            datatable = self.get_server()
+        self.assertEqual(datatable.total_records, 30)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("COUNT(*)", queries[0]["sql"])
+
+    def test_unfiltered_request_counts_once(self):
+        datatable = self.get_server()
+        with CaptureQueriesContext(connection) as queries:
+            result = datatable.get_output_result()
+        # Only the page query, the total count is reused as the filtered count
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT(", queries[0]["sql"])
+        self.assertIn("LIMIT 10", queries[0]["sql"])
+        self.assertEqual(result["recordsTotal"], 30)
+        self.assertEqual(result["recordsFiltered"], 30)
+        self.assertEqual(len(result["data"]), 10)
+
+    def test_filtered_request_counts_filter_once(self):
+        datatable = self.get_server({"search[value]": "Smith"})
+        with CaptureQueriesContext(connection) as queries:
+            result = datatable.get_output_result()
+        self.assertEqual(len(queries), 2)
+        self.assertIn("COUNT(*)", queries[0]["sql"])
+        self.assertIn("LIKE", queries[0]["sql"])
+        self.assertNotIn("COUNT(", queries[1]["sql"])
+        self.assertIn("LIMIT 10", queries[1]["sql"])
+        self.assertEqual(result["recordsTotal"], 30)
+        self.assertEqual(result["recordsFiltered"], 10)
+
+    def test_request_query_count(self):
+        with self.assertNumQueries(3):
+            self.get_server({"search[value]": "Smith"}).get_output_result()
+
+    def test_unordered_queryset_uses_tiebreaker(self):
+        datatable = self.get_server({"columns[0][orderable]": "false"})
+        with CaptureQueriesContext(connection) as queries:
+            datatable.get_output_result()
+        self.assertIn('ORDER BY "testapp_person"."id" ASC', queries[0]["sql"])
+
+    def test_ordering_uses_tiebreaker(self):
+        datatable = self.get_server({"order[0][column]": "2"})
+        with CaptureQueriesContext(connection) as queries:
+            datatable.get_output_result()
+        self.assertIn(
+            'ORDER BY "testapp_person"."last_name" ASC, "testapp_person"."id" ASC',
+            queries[0]["sql"],
+        )
+
+
+class TypeAwareSearchQueryTestCase(TestCase):
+    columns = [
+        "id",
+        "first_name",
+        "last_name",
+        "internal_id",
+        "uuid",
+        "active",
+        "created",
+        "building__floor_count",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        building = Building.objects.create(name="North", floor_count=12)
+        Person.objects.create(
+            first_name="John", last_name="Smith", internal_id=12, building=building
+        )
+        Person.objects.create(
+            first_name="Jane", last_name="Jones", internal_id=34, building=building
+        )
+
+    def get_filter_sql(self, value: str) -> str:
+        request = RequestFactory().get(
+            "/", get_request_params(self.columns, {"search[value]": value})
+        )
+        datatable = DataTablesServer(request, self.columns, Person.objects.all())
+        with CaptureQueriesContext(connection) as queries:
+            result = datatable.get_output_result()
+        self.result = result
+        # The filtered count query
+        return queries[0]["sql"]
+
+    def test_text_search_prunes_other_types(self):
+        sql = self.get_filter_sql("Smith")
+        self.assertEqual(sql.count("LIKE"), 2)
+        self.assertNotIn("JOIN", sql)
+        self.assertEqual(self.result["recordsFiltered"], 1)
+
+    def test_numeric_search_keeps_numeric_columns(self):
+        sql = self.get_filter_sql("12")
+        # id, first_name, last_name, internal_id, uuid, created, floor_count
+        self.assertEqual(sql.count("LIKE"), 7)
+        self.assertIn("JOIN", sql)
+        self.assertEqual(self.result["recordsFiltered"], 2)
+
+
+class JoinEliminationTestCase(TestCase):
+    columns = ["id", "first_name", "building__name"]
+
+    @classmethod
+    def setUpTestData(cls):
+        create_people(12, ("Smith",), ("North", "South"))
+
+    def run_request(
+        self, requested_columns: list[str], options: dict = {}, queryset=None
+    ):
+        request = RequestFactory().get(
+            "/", get_request_params(requested_columns, options)
+        )
+        queryset = Person.objects.all() if queryset is None else queryset
+        with CaptureQueriesContext(connection) as queries:
+            datatable = DataTablesServer(
+                request, self.columns, queryset, declared_columns_only=True
+            )
+            result = datatable.get_output_result()
+        return result, [query["sql"] for query in queries]
+
+    def test_unrequested_relation_column_is_not_joined(self):
+        result, queries = self.run_request(["id", "first_name"])
+        self.assertEqual(
+            queries,
+            [
+                'SELECT COUNT(*) AS "__count" FROM "testapp_person"',
+                'SELECT "testapp_person"."id", "testapp_person"."first_name" '
+                'FROM "testapp_person" '
+                'ORDER BY "testapp_person"."id" ASC LIMIT 10',
+            ],
+        )
+        self.assertEqual(list(result["data"][0]), ["id", "first_name"])
+
+    def test_requested_relation_column_is_joined(self):
+        result, queries = self.run_request(self.columns)
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("JOIN", queries[0])
+        self.assertEqual(queries[1].count("JOIN"), 1)
+        self.assertEqual(result["data"][0]["building__name"], "North")
+
+    def test_search_joins_only_filtered_queries(self):
+        result, queries = self.run_request(
+            ["id", "first_name"],
+            {"columns[1][search][value]": "First1"},
+        )
+        self.assertEqual(len(queries), 3)
+        self.assertTrue(all("JOIN" not in sql for sql in queries))
+        self.assertEqual(result["recordsFiltered"], 3)
+
+    def test_global_search_on_relation(self):
+        result, queries = self.run_request(self.columns, {"search[value]": "North"})
+        total, filtered, page = queries
+        self.assertNotIn("JOIN", total)
+        self.assertEqual(filtered.count("JOIN"), 1)
+        self.assertEqual(page.count("JOIN"), 1)
+        self.assertEqual(result["recordsFiltered"], 6)
+
+    def test_select_related_is_not_joined_for_counts(self):
+        result, queries = self.run_request(
+            ["id", "first_name"],
+            {"search[value]": "First1"},
+            queryset=Person.objects.select_related("building"),
+        )
+        self.assertTrue(all("JOIN" not in sql for sql in queries))
+        self.assertEqual(result["recordsFiltered"], 3)
+
+    def test_undeclared_columns_are_selected_by_default(self):
+        request = RequestFactory().get("/", get_request_params(["first_name"]))
+        datatable = DataTablesServer(request, self.columns, Person.objects.all())
+        result = datatable.get_output_result()
+        self.assertEqual(list(result["data"][0]), self.columns)
+
+    def test_endpoint_without_columns_selects_every_column(self):
+        request = RequestFactory().get("/")
+        datatable = DataTablesServer(
+            request, self.columns, Person.objects.all(), declared_columns_only=True
+        )
+        self.assertEqual(datatable.selected_column_names, self.columns)
+
+
+class RequestedColumnsTestCase(TestCase):
+    columns = [
+        Column("id", always_send=True),
+        "first_name",
+        "last_name",
+        "building__name",
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        create_people(5, ("Smith",))
+
+    def get_result(self, requested_columns: list[str], **kwargs):
+        request = RequestFactory().get("/", get_request_params(requested_columns))
+        datatable = DataTablesServer(
+            request,
+            self.columns,
+            Person.objects.all(),
+            declared_columns_only=True,
+            **kwargs,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            result = datatable.get_output_result()
+        return result, queries[-1]["sql"]
+
+    def test_only_requested_columns_are_selected(self):
+        result, sql = self.get_result(["last_name"])
+        self.assertEqual(
+            sql,
+            'SELECT "testapp_person"."id", "testapp_person"."last_name" '
+            'FROM "testapp_person" '
+            'ORDER BY "testapp_person"."last_name" ASC, "testapp_person"."id" ASC '
+            "LIMIT 10",
+        )
+        self.assertEqual(list(result["data"][0]), ["id", "last_name"])
+
+    def test_array_rows_keep_positions(self):
+        result, _ = self.get_result(["2"], array_rows=True)
+        person = Person.objects.order_by("last_name", "pk").first()
+        self.assertEqual(result["data"][0], [person.pk, None, "Smith", None])
+
+
+class RowCountRecorder(object):
+    """
+    Execute wrapper recording every query, then re-running it to count the
+    rows it returns.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def get_row_counts(self) -> list[int]:
+        row_counts = []
+        with connection.cursor() as cursor:
+            for sql, params in self.queries:
+                cursor.execute(sql, params)
+                row_counts.append(len(cursor.fetchall()))
+        return row_counts
+
+
+class QueryBudgetView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+
+
+class ViewQueryBudgetTestCase(ClearCacheMixin, TestCase):
+    """
+    Serves requests with ServerSideDataTablesMixin and checks the number of
+    queries and that no query reads more rows than the page.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_people(
+            100,
+            ("Smith", "Jones", "Jones"),
+            ("North", "South"),
+            internal_ids=range(1000, 1100),
+        )
+
+    def serve(self, options: dict = {}, **attributes) -> dict:
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        view = QueryBudgetView(**attributes)
+        view.setup(request)
+        return json.loads(view.get(request).content)
+
+    def assertQueryBudget(self, queries: int, options: dict = {}, **attributes):
+        """
+        Asserts the request runs exactly queries queries, each returning at
+        most the requested length of rows. Returns the response data.
+        """
+        recorder = RowCountRecorder()
+        with connection.execute_wrapper(recorder):
+            data = self.serve(options, **attributes)
+        self.assertNotIn("error", data)
+        self.assertEqual(
+            len(recorder.queries),
+            queries,
+            "\n".join(sql for sql, params in recorder.queries),
+        )
+        length = int(options.get("length", 10))
+        if length != -1:
+            self.assertLessEqual(max(recorder.get_row_counts(), default=0), length)
+        return data
+
+    def test_first_page(self):
+        data = self.assertQueryBudget(2)
+        self.assertEqual(len(data["data"]), 10)
+
+    def test_deep_page(self):
+        data = self.assertQueryBudget(2, {"start": "95"})
+        self.assertEqual(len(data["data"]), 5)
+
+    def test_global_search(self):
+        data = self.assertQueryBudget(3, {"search[value]": "Smith"})
+        self.assertEqual(data["recordsFiltered"], 34)
+
+    def test_column_search(self):
+        data = self.assertQueryBudget(3, {"columns[4][search][value]": "North"})
+        self.assertEqual(data["recordsFiltered"], 50)
+
+    def test_regex_search(self):
+        data = self.assertQueryBudget(
+            3, {"search[value]": "^First1[0-9]$", "search[regex]": "true"}
+        )
+        self.assertEqual(data["recordsFiltered"], 10)
+
+    def test_multi_column_ordering(self):
+        self.assertQueryBudget(
+            2,
+            {
+                "order[0][column]": "2",
+                "order[1][column]": "3",
+                "order[1][dir]": "desc",
+            },
+        )
+
+    def test_every_row(self):
+        recorder = RowCountRecorder()
+        with connection.execute_wrapper(recorder):
+            data = self.serve({"length": "-1"})
+        self.assertEqual(len(recorder.queries), 2)
+        # The count and every row once
+        self.assertEqual(recorder.get_row_counts(), [1, 100])
+        self.assertEqual(len(data["data"]), 100)
+
+    def test_streamed_rows(self):
+        request = RequestFactory().get(
+            "/", get_request_params(columns, {"length": "-1"})
+        )
+        view = QueryBudgetView(stream_all_rows=True)
+        view.setup(request)
+        with self.assertNumQueries(2):
+            content = b"".join(view.get(request).streaming_content)
+        self.assertEqual(len(json.loads(content)["data"]), 100)
+
+    def test_deferred_join(self):
+        self.assertQueryBudget(3, {"start": "50"}, deferred_join=True)
+
+    def test_array_rows(self):
+        options = {f"columns[{i}][data]": str(i) for i in range(len(columns))}
+        data = self.assertQueryBudget(2, options, array_rows=True)
+        self.assertEqual(len(data["data"][0]), len(columns))
+
+    def test_keyset_pagination(self):
+        self.serve({"start": "0"}, keyset_pagination=True)
+        self.assertQueryBudget(2, {"start": "10"}, keyset_pagination=True)
+
+    def test_cached_counts(self):
+        self.serve({"search[value]": "Smith"}, cache_counts=True)
+        self.assertQueryBudget(1, {"search[value]": "Smith"}, cache_counts=True)
+
+    def test_cached_response(self):
+        self.serve(cache_responses=True)
+        self.assertQueryBudget(0, cache_responses=True)
+
+    def test_conditional_request(self):
+        # The total count, one aggregate for the filtered count and the page
+        self.assertQueryBudget(
+            3, {"search[value]": "Smith"}, last_modified_field="updated"
+        )
+
+    def test_callbacks_do_not_query(self):
+        self.assertQueryBudget(2, data_callback_batch_size=3)
@@ -0,0 +1,99 @@
+import unittest
+from django.http import QueryDict
+from django.utils.http import urlencode
+from django_datatable_serverside_mixin.exceptions import DataTablesError
+from django_datatable_serverside_mixin.request import DataTablesRequest
+
+from .fixtures import get_request_params
+
+
+class DataTablesRequestTestCase(unittest.TestCase):
+    def parse(self, params: dict) -> DataTablesRequest:
+        return DataTablesRequest.from_query(QueryDict(urlencode(params)))
+
+    def test_defaults(self):
+        datatables_request = self.parse({})
+        self.assertIsNone(datatables_request.draw)
+        self.assertEqual(datatables_request.start, 0)
+        self.assertEqual(datatables_request.length, 10)
+        self.assertEqual(datatables_request.search_value, "")
+        self.assertFalse(datatables_request.search_regex)
+        self.assertEqual(datatables_request.columns, {})
+        self.assertEqual(datatables_request.order, [])
+
+    def test_parse(self):
+        datatables_request = self.parse(
+            get_request_params(
+                ["id", "first_name"],
+                {
+                    "draw": "7",
+                    "start": "20",
+                    "length": "-1",
+                    "search[value]": "smith",
+                    "search[regex]": "true",
+                    "columns[1][name]": "first",
+                    "columns[1][searchable]": "false",
+                    "columns[1][orderable]": "false",
+                    "columns[1][search][value]": "^J",
+                    "columns[1][search][regex]": "true",
+                    "order[0][column]": "1",
+                    "order[0][dir]": "desc",
+                    "order[1][column]": "0",
+                    "order[1][dir]": "asc",
+                },
+            )
+        )
+        self.assertEqual(datatables_request.draw, "7")
+        self.assertEqual(datatables_request.start, 20)
+        self.assertEqual(datatables_request.length, -1)
+        self.assertEqual(datatables_request.search_value, "smith")
+        self.assertTrue(datatables_request.search_regex)
+
+        first_column, second_column = datatables_request.columns.values()
+        self.assertEqual(first_column.index, 0)
+        self.assertEqual(first_column.data, "id")
+        self.assertTrue(first_column.searchable)
+        self.assertTrue(first_column.orderable)
+        self.assertEqual(first_column.search_value, "")
+        self.assertFalse(first_column.search_regex)
+        self.assertEqual(second_column.index, 1)
+        self.assertEqual(second_column.data, "first_name")
+        self.assertEqual(second_column.name, "first")
+        self.assertFalse(second_column.searchable)
+        self.assertFalse(second_column.orderable)
+        self.assertEqual(second_column.search_value, "^J")
+        self.assertTrue(second_column.search_regex)
+
+        self.assertEqual(
+            [(order.column, order.descending) for order in datatables_request.order],
+            [(1, True), (0, False)],
+        )
+
+    def test_order_sorted_by_index(self):
+        datatables_request = self.parse(
+            {
+                "order[10][column]": "3",
+                "order[2][column]": "1",
+                "order[2][dir]": "desc",
+            }
+        )
+        self.assertEqual(
+            [(order.column, order.descending) for order in datatables_request.order],
+            [(1, True), (3, False)],
+        )
+
+    def test_column_data_defaults_to_index(self):
+        datatables_request = self.parse({"columns[3][searchable]": "true"})
+        self.assertEqual(datatables_request.columns[3].data, 3)
+
+    def test_ignores_unknown_parameters(self):
+        datatables_request = self.parse({"_": "1663000000000", "columns[x][data]": "a"})
+        self.assertEqual(datatables_request.columns, {})
+
+    def test_invalid_integer(self):
+        with self.assertRaises(DataTablesError):
+            self.parse({"start": "abc"})
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            DataTablesRequest().unknown = True
@@ -0,0 +1,134 @@
+import json
+from types import SimpleNamespace
+from unittest import skipUnless
+from django.test import RequestFactory, TestCase
+from django_datatable_serverside_mixin.cache import ResponseCache
+from django_datatable_serverside_mixin.encoders import orjson
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import ClearCacheMixin, create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name"]
+
+
+class CachedView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+    cache_responses = True
+
+
+class ResponseCacheTestCase(ClearCacheMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(10)
+
+    def get_response(self, options: dict = {}, user=None, headers={}, **attributes):
+        request = RequestFactory().get(
+            "/", get_request_params(columns, options), **headers
+        )
+        if user is not None:
+            request.user = user
+        view = CachedView(**attributes)
+        view.setup(request)
+        return view.get(request)
+
+    def test_hit_patches_draw(self):
+        first = self.get_response({"draw": "1", "_": "1000"})
+        with self.assertNumQueries(0):
+            second = self.get_response({"draw": "2", "_": "1001"})
+        self.assertEqual(json.loads(second.content)["draw"], "2")
+        self.assertEqual(
+            second.content, first.content.replace(b'"draw": "1"', b'"draw": "2"')
+        )
+        self.assertEqual(second["Content-Type"], "application/json")
+
+    def test_different_requests_are_cached_separately(self):
+        self.get_response()
+        with self.assertNumQueries(3):
+            response = self.get_response({"search[value]": "Smith"})
+        self.assertEqual(json.loads(response.content)["recordsFiltered"], 5)
+
+    def test_invalidated_on_save(self):
+        self.get_response()
+        Person.objects.filter(first_name="First0").first().save()
+        with self.assertNumQueries(2):
+            self.get_response()
+
+    def test_vary_on_user(self):
+        self.get_response(user=SimpleNamespace(pk=1, is_authenticated=True))
+        with self.assertNumQueries(2):
+            self.get_response(user=SimpleNamespace(pk=2, is_authenticated=True))
+        with self.assertNumQueries(0):
+            self.get_response(user=SimpleNamespace(pk=1, is_authenticated=True))
+
+    def test_max_size(self):
+        self.get_response(response_cache_max_size=10)
+        with self.assertNumQueries(2):
+            self.get_response(response_cache_max_size=10)
+
+    def test_errors_are_not_cached(self):
+        options = {"order[0][column]": "1"}
+        attributes = {"indexed_orderings": [], "unindexed_ordering": "reject"}
+        self.get_response(options, **attributes)
+        with self.assertNumQueries(1):
+            response = self.get_response(options, **attributes)
+        self.assertIn("error", json.loads(response.content))
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_orjson(self):
+        self.get_response({"draw": "1"}, json_encoder="orjson")
+        with self.assertNumQueries(0):
+            response = self.get_response({"draw": "7"}, json_encoder="orjson")
+        self.assertTrue(response.content.startswith(b'{"draw":"7",'))
+
+    def test_hit_sends_validators(self):
+        first = self.get_response(last_modified_field="updated")
+        with self.assertNumQueries(0):
+            second = self.get_response(last_modified_field="updated")
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second["Last-Modified"], first["Last-Modified"])
+        self.assertIn("no-cache", second["Cache-Control"])
+
+    def test_hit_is_revalidated(self):
+        etag = self.get_response(last_modified_field="updated")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.get_response(
+                last_modified_field="updated", headers={"HTTP_IF_NONE_MATCH": etag}
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        with self.assertNumQueries(0):
+            response = self.get_response(
+                last_modified_field="updated", headers={"HTTP_IF_NONE_MATCH": '"x"'}
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_disabled_by_default(self):
+        self.get_response(cache_responses=False)
+        with self.assertNumQueries(2):
+            self.get_response(cache_responses=False)
+
+
+class ResponseCacheKeyTestCase(TestCase):
+    def test_ignores_draw_and_cache_buster(self):
+        response_cache = ResponseCache(invalidate=False)
+        factory = RequestFactory()
+        key = response_cache.get_key(
+            factory.get("/", {"draw": "1", "_": "1", "length": "10"}).GET,
+            Person.objects.all(),
+        )
+        self.assertEqual(
+            key,
+            response_cache.get_key(
+                factory.get("/", {"length": "10", "draw": "5", "_": "2"}).GET,
+                Person.objects.all(),
+            ),
+        )
+        self.assertNotEqual(
+            key,
+            response_cache.get_key(
+                factory.get("/", {"length": "10"}).GET,
+                Person.objects.filter(active=True),
+            ),
+        )
@@ -0,0 +1,214 @@
+import unittest
+from django.db import connection
+from django.db.models import Q
+from django.test import RequestFactory, TestCase
+from django_datatable_serverside_mixin.columns import Column, compile_columns
+from django_datatable_serverside_mixin.datatable import DataTablesServer
+from django_datatable_serverside_mixin.search import (
+    PostgresFullTextSearch,
+    SearchBackend,
+    SQLiteFTS5Search,
+)
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Building, Person
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+columns = ["id", "first_name", "last_name"]
+
+
+class SearchBackendTestCase(unittest.TestCase):
+    def test_default(self):
+        q_filter = SearchBackend().get_filter(compile_columns(columns), "smith")
+        self.assertEqual(
+            q_filter,
+            Q(id__icontains="smith")
+            | Q(first_name__icontains="smith")
+            | Q(last_name__icontains="smith"),
+        )
+
+    def test_default_regex(self):
+        q_filter = SearchBackend().get_filter(compile_columns(columns), "^s", True)
+        self.assertEqual(
+            q_filter,
+            Q(id__iregex="^s") | Q(first_name__iregex="^s") | Q(last_name__iregex="^s"),
+        )
+
+    def test_no_value(self):
+        self.assertIsNone(SearchBackend().get_filter(compile_columns(columns), ""))
+
+    def test_no_columns(self):
+        self.assertIsNone(SearchBackend().get_filter([], "smith"))
+
+    @unittest.skipIf(psycopg2 is None, "psycopg2 is not installed")
+    def test_postgres(self):
+        from django.contrib.postgres.search import SearchQuery
+
+        q_filter = PostgresFullTextSearch(config="english").get_filter(
+            compile_columns(columns), "john smith"
+        )
+        self.assertEqual(
+            q_filter,
+            Q(
+                search_vector=SearchQuery(
+                    "john smith", config="english", search_type="websearch"
+                )
+            ),
+        )
+
+    def test_postgres_regex_falls_back(self):
+        q_filter = PostgresFullTextSearch().get_filter(
+            compile_columns(["first_name"]), "^j", True
+        )
+        self.assertEqual(q_filter, Q(first_name__iregex="^j"))
+
+    def test_fts5_match_query(self):
+        self.assertEqual(
+            SQLiteFTS5Search.get_match_query('john "smith OR'),
+            '"john"* """smith"* "OR"*',
+        )
+
+    def test_fts5_blank(self):
+        self.assertIsNone(
+            SQLiteFTS5Search("person_fts").get_filter(compile_columns(columns), "  ")
+        )
+
+
+class SQLiteFTS5SearchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        building = Building.objects.create(name="North")
+        Person.objects.bulk_create(
+            [
+                Person(
+                    first_name="John",
+                    last_name="Smith",
+                    internal_id=1,
+                    building=building,
+                ),
+                Person(
+                    first_name="Jane",
+                    last_name="Smithers",
+                    internal_id=2,
+                    building=building,
+                ),
+                Person(
+                    first_name="Alice",
+                    last_name="Jones",
+                    internal_id=3,
+                    building=building,
+                ),
+            ]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE person_fts USING fts5(first_name, last_name)"
+            )
+            for person in Person.objects.all():
+                cursor.execute(
+                    "INSERT INTO person_fts (rowid, first_name, last_name) VALUES (%s, %s, %s)",
+                    [person.pk, person.first_name, person.last_name],
+                )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS person_fts")
+
+    def search(self, value: str, regex: bool = False) -> list[str]:
+        params = {"search[value]": value, "search[regex]": "true" if regex else "false"}
+        request = RequestFactory().get("/", get_request_params(columns, params))
+        datatable = DataTablesServer(
+            request,
+            columns,
+            Person.objects.all(),
+            search_backend=SQLiteFTS5Search("person_fts"),
+        )
+        return [row["last_name"] for row in datatable.get_output_result()["data"]]
+
+    def test_search(self):
+        self.assertEqual(self.search("smith"), ["Smith", "Smithers"])
+
+    def test_search_all_terms(self):
+        self.assertEqual(self.search("jo smith"), ["Smith"])
+
+    def test_search_syntax_is_escaped(self):
+        self.assertEqual(self.search("smith OR jones"), [])
+
+    def test_regex_uses_lookups(self):
+        self.assertEqual(self.search("^jo", regex=True), ["Smith", "Jones"])
+
+
+class ColumnLookupTestCase(TestCase):
+    columns = [
+        Column("id", lookup="exact", coerce=int),
+        "first_name",
+        Column("last_name", lookup="istartswith"),
+        Column("internal_id", lookup="range", coerce=int),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        create_people(20)
+
+    def get_server(self, options: dict) -> DataTablesServer:
+        names = ["id", "first_name", "last_name", "internal_id"]
+        request = RequestFactory().get("/", get_request_params(names, options))
+        return DataTablesServer(request, self.columns, Person.objects.all())
+
+    def test_global_search_skips_columns_that_cannot_match(self):
+        datatable = self.get_server({"search[value]": "smi"})
+        self.assertEqual(
+            datatable.get_filter(),
+            Q(first_name__icontains="smi") | Q(last_name__istartswith="smi"),
+        )
+        self.assertEqual(datatable.get_output_result()["recordsFiltered"], 10)
+
+    def test_global_search_numeric(self):
+        datatable = self.get_server({"search[value]": "5"})
+        self.assertEqual(
+            datatable.get_filter(),
+            Q(id__exact=5)
+            | Q(first_name__icontains="5")
+            | Q(last_name__istartswith="5")
+            | Q(internal_id__gte=5, internal_id__lte=5),
+        )
+
+    def test_column_search_range(self):
+        result = self.get_server(
+            {"columns[3][search][value]": "5,9", "length": "-1"}
+        ).get_output_result()
+        self.assertEqual(
+            [row["internal_id"] for row in result["data"]], [5, 6, 7, 8, 9]
+        )
+
+    def test_column_search_that_cannot_match(self):
+        datatable = self.get_server({"columns[0][search][value]": "abc"})
+        with self.assertNumQueries(0):
+            datatable.filter_queryset()
+            self.assertEqual(datatable.queryset.count(), 0)
+
+    def test_global_search_that_cannot_match_any_column(self):
+        datatable = DataTablesServer(
+            RequestFactory().get(
+                "/", get_request_params(["id"], {"search[value]": "abc"})
+            ),
+            [Column("id", lookup="exact", coerce=int)],
+            Person.objects.all(),
+        )
+        self.assertEqual(datatable.get_output_result()["recordsFiltered"], 0)
+
+    def test_column_not_searchable(self):
+        datatable = DataTablesServer(
+            RequestFactory().get(
+                "/", get_request_params(["first_name"], {"search[value]": "First1"})
+            ),
+            [Column("first_name", searchable=False)],
+            Person.objects.all(),
+        )
+        self.assertIsNone(datatable.get_filter())
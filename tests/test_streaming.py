@@ -0,0 +1,78 @@
+import json
+from django.http import JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
+
+from .fixtures import create_people, get_request_params
+from .testapp.models import Person
+
+columns = ["id", "first_name", "last_name"]
+
+
+class StreamingView(ServerSideDataTablesMixin):
+    model = Person
+    columns = columns
+    stream_all_rows = True
+    stream_chunk_size = 4
+
+    def data_callback(self, data):
+        self.chunk_sizes.append(len(data))
+        for row in data:
+            row["name"] = f"{row['first_name']} {row['last_name']}"
+        return data
+
+
+class StreamingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_people(10)
+
+    def get_response(self, options: dict = {}, **attributes):
+        request = RequestFactory().get("/", get_request_params(columns, options))
+        view = StreamingView(**attributes)
+        view.chunk_sizes = []
+        view.setup(request)
+        return view, view.get(request)
+
+    def test_streams_all_rows(self):
+        view, response = self.get_response({"length": "-1", "draw": "4"})
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "application/json")
+        result = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(result["draw"], "4")
+        self.assertEqual(result["recordsTotal"], 10)
+        self.assertEqual(result["recordsFiltered"], 10)
+        self.assertEqual(len(result["data"]), 10)
+        self.assertEqual(result["data"][0]["name"], "First0 Jones")
+        self.assertEqual(view.chunk_sizes, [4, 4, 2])
+
+    def test_same_body_as_json_response(self):
+        options = {"length": "-1", "search[value]": "Smith"}
+        _, streamed = self.get_response(options)
+        _, response = self.get_response(options, stream_all_rows=False)
+        self.assertIsInstance(response, JsonResponse)
+        self.assertEqual(b"".join(streamed.streaming_content), response.content)
+
+    def test_keyset_pagination(self):
+        options = {"length": "-1"}
+        attributes = {"keyset_pagination": True}
+        _, streamed = self.get_response(options, **attributes)
+        _, response = self.get_response(options, stream_all_rows=False, **attributes)
+        content = b"".join(streamed.streaming_content)
+        self.assertEqual(content, response.content)
+        self.assertNotIn("pk", json.loads(content)["data"][0])
+
+    def test_no_rows(self):
+        _, response = self.get_response({"length": "-1", "search[value]": "Nobody"})
+        result = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(result["data"], [])
+        self.assertEqual(result["recordsFiltered"], 0)
+
+    def test_paginated_requests_are_not_streamed(self):
+        _, response = self.get_response({"length": "5"})
+        self.assertIsInstance(response, JsonResponse)
+
+    def test_rows_are_read_lazily(self):
+        _, response = self.get_response({"length": "-1"})
+        with self.assertNumQueries(1):
+            b"".join(response.streaming_content)
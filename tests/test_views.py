@@ -7,7 +7,10 @@ from django.db.models import Model, QuerySet
 from django.http import JsonResponse
 from django.http.request import HttpRequest
 from django.views import View
-from django_datatable_serverside_mixin.datatable import DataTablesServer
+from django_datatable_serverside_mixin.datatable import (
+    DataTablesError,
+    DataTablesServer,
+)
 from django_datatable_serverside_mixin.views import ServerSideDataTablesMixin
 
 from .fixtures import *
@@ -47,7 +50,8 @@ class ModelView(ServerSideDataTablesMixin):
 class ServerSideDatatableMixinTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        settings.configure()
+        if not settings.configured:
+            settings.configure()
         # Set up mocks
         cls.mock_request = get_mock_request()
         cls.mock_DataTablesServer = MagicMock(
@@ -85,6 +89,7 @@ class ServerSideDatatableMixinTestCase(unittest.TestCase):
             self.mock_request,
             view.columns,
             view.get_queryset(),
+            **view.get_datatables_server_kwargs(),
         )
 
         self.mock_DataTablesServer.get_output_result.assert_called()
@@ -110,6 +115,23 @@ class ServerSideDatatableMixinTestCase(unittest.TestCase):
             b'{"draw": 1, "recordsTotal": 2, "recordsFiltered": 2, "data": [{"id": "1", "data": "data", "extra_field": "some_url/1/"}, {"id": "2", "data": "data", "extra_field": "some_url/2/"}]}',
         )
 
+    @patch("django_datatable_serverside_mixin.views.datatable.DataTablesServer")
+    def test_get_error(self, mock_DataTablesServer_class):
+        """
+        A DataTablesError is returned in the error field of the response.
+        """
+        mock_DataTablesServer_class.return_value.get_output_result.side_effect = (
+            DataTablesError("Ordering by data is not supported.")
+        )
+        mock_request = get_mock_request({"GET": {"draw": "3"}})
+        view = ModelView()
+        response = view.get(mock_request)
+        self.assertIsInstance(response, JsonResponse)
+        self.assertEqual(
+            response.content,
+            b'{"draw": "3", "recordsTotal": 0, "recordsFiltered": 0, "data": [], "error": "Ordering by data is not supported."}',
+        )
+
     def test_data_callback(self):
         """
         Test the default implementation of data_callback
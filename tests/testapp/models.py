@@ -0,0 +1,28 @@
+import uuid
+
+from django.db import models
+
+
+class Building(models.Model):
+    name = models.CharField(max_length=100)
+    floor_count = models.IntegerField(default=1)
+
+
+class Person(models.Model):
+    first_name = models.CharField(max_length=100)
+    last_name = models.CharField(max_length=100)
+    internal_id = models.IntegerField()
+    uuid = models.UUIDField(default=uuid.uuid4)
+    active = models.BooleanField(default=True)
+    salary = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+    building = models.ForeignKey(
+        Building, on_delete=models.CASCADE, related_name="people"
+    )
+
+
+class OrderedPerson(Person):
+    class Meta:
+        proxy = True
+        ordering = ["last_name"]
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("people/", views.AsyncPersonView.as_view()),
+    path("people/callback/", views.AsyncCallbackPersonView.as_view()),
+    path("people/conditional/", views.AsyncConditionalPersonView.as_view()),
+    path(
+        "people/array/",
+        views.AsyncPersonView.as_view(array_rows=True, deferred_join=True),
+    ),
+]
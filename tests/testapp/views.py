@@ -0,0 +1,28 @@
+import asyncio
+
+from django_datatable_serverside_mixin.views import AsyncServerSideDataTablesMixin
+
+from .models import Person
+
+
+class AsyncPersonView(AsyncServerSideDataTablesMixin):
+    model = Person
+    columns = ["id", "first_name", "last_name", "building__name"]
+
+
+class AsyncCallbackPersonView(AsyncPersonView):
+    data_callback_batch_size = 3
+
+    async def data_callback(self, data):
+        await asyncio.sleep(0)
+        for row in data:
+            row["name"] = f"{row['first_name']} {row['last_name']}"
+        return data
+
+    def row_callback(self, row):
+        row["upper"] = row["first_name"].upper()
+        return row
+
+
+class AsyncConditionalPersonView(AsyncPersonView):
+    last_modified_field = "updated"